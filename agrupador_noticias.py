@@ -0,0 +1,217 @@
+"""
+agrupador_noticias.py
+---------------------
+Agrupa notícias quase duplicadas vindas de feeds diferentes (o mesmo fato
+publicado por G1, Estadão e Folha com manchetes distintas) e mantém um
+representante por grupo.
+
+Como funciona:
+  • cada notícia vira o conjunto das palavras significativas de título +
+    início do resumo (sem HTML, acentos e stopwords)
+  • MinHash com NUM_PERMUTACOES funções de hash (multiply-shift, vetorizado
+    em NumPy) resume o conjunto numa assinatura de tamanho fixo
+  • LSH: a assinatura é cortada em BANDAS; notícias que coincidem em alguma
+    banda caem no mesmo balde (uma ordenação só, para todas as bandas) e
+    viram candidatas — pares sem nada em comum nunca são comparados
+  • candidatas com Jaccard estimado >= LIMIAR_SIMILARIDADE são unidas
+    (union-find); o representante é o primeiro membro na ordem dos feeds
+
+Benchmark com corpus derivado do videos_gerados.json:
+  python agrupador_noticias.py --benchmark
+"""
+
+import re
+import zlib
+import time
+
+import numpy as np
+
+from indice_assets import normalizar
+from noticias_vistas import STOPWORDS
+
+NUM_PERMUTACOES = 128
+BANDAS = 32                      # 32 bandas x 4 linhas
+LIMIAR_SIMILARIDADE = 0.35
+MAX_CHARS_RESUMO = 300
+
+_rng = np.random.default_rng(55)
+_A = _rng.integers(1, 2**63, NUM_PERMUTACOES, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2**63, NUM_PERMUTACOES, dtype=np.uint64)
+_VAZIO = np.full(NUM_PERMUTACOES, np.iinfo(np.uint32).max, dtype=np.uint32)
+_MULT_BANDA = _rng.integers(1, 2**63, NUM_PERMUTACOES // BANDAS, dtype=np.uint64) | np.uint64(1)
+_SAL_BANDA = _rng.integers(0, 2**63, BANDAS, dtype=np.uint64)
+
+
+def palavras_noticia(noticia: dict) -> set[str]:
+    """Palavras significativas de título + começo do resumo."""
+    resumo = re.sub(r'<[^>]+>', ' ', noticia.get('resumo', '') or '')
+    texto = f"{noticia.get('titulo', '')} {resumo[:MAX_CHARS_RESUMO]}"
+    return {
+        p for p in normalizar(texto).split()
+        if len(p) > 3 and p not in STOPWORDS
+    }
+
+
+def assinaturas_minhash(conjuntos: list[set[str]]) -> np.ndarray:
+    """Assinaturas MinHash uint32 (len(conjuntos), NUM_PERMUTACOES), num lote só."""
+    tamanhos = np.array([len(c) for c in conjuntos])
+    saida = np.tile(_VAZIO, (len(conjuntos), 1))
+    if not tamanhos.any():
+        return saida
+    x = np.fromiter((zlib.crc32(p.encode('utf-8')) for c in conjuntos for p in c),
+                    dtype=np.uint64, count=int(tamanhos.sum()))
+    # h(x) = (a*x + b) mod 2^64 >> 32 — família universal multiply-shift
+    h = ((x[:, None] * _A[None, :] + _B[None, :]) >> np.uint64(32)).astype(np.uint32)
+    cheios = tamanhos > 0
+    inicios = np.concatenate([[0], np.cumsum(tamanhos)[:-1]])[cheios]
+    saida[cheios] = np.minimum.reduceat(h, inicios, axis=0)
+    return saida
+
+
+def _raiz(pais: list, i: int) -> int:
+    while pais[i] != i:
+        pais[i] = pais[pais[i]]
+        i = pais[i]
+    return i
+
+
+def agrupar(noticias: list[dict], limiar: float = LIMIAR_SIMILARIDADE) -> list[list[int]]:
+    """
+    Agrupa índices de notícias quase duplicadas.
+    Retorna a lista de grupos (cada um em ordem de entrada), na ordem do
+    primeiro membro.
+    """
+    n = len(noticias)
+    if n == 0:
+        return []
+
+    conjuntos = [palavras_noticia(nt) for nt in noticias]
+    assinaturas = assinaturas_minhash(conjuntos)
+    linhas = NUM_PERMUTACOES // BANDAS
+
+    # Notícia sem palavras significativas (só stopwords/palavras curtas) tem
+    # a assinatura _VAZIO: ficaria no mesmo balde de todas as outras vazias,
+    # com similaridade 1.0. Fica fora do LSH e vira um grupo próprio
+    cheias = np.flatnonzero([len(c) > 0 for c in conjuntos])
+    pais = list(range(n))
+    pares = np.empty((0, 2), dtype=np.int64)
+
+    if len(cheias) > 1:
+        # Uma chave uint64 por (notícia, banda); o índice da banda entra na
+        # chave para que bandas diferentes nunca caiam no mesmo balde
+        bandas = assinaturas[cheias].reshape(len(cheias), BANDAS, linhas).astype(np.uint64)
+        chaves = (bandas * _MULT_BANDA).sum(axis=2) + _SAL_BANDA
+        chaves = chaves.ravel()
+        donos = np.repeat(cheias, BANDAS)
+
+        ordem = np.argsort(chaves, kind='stable')
+        chaves, donos = chaves[ordem], donos[ordem]
+        inicio_balde = np.r_[True, chaves[1:] != chaves[:-1]]
+        primeiro = donos[np.maximum.accumulate(np.where(inicio_balde, np.arange(len(donos)), 0))]
+
+        # Candidatas: cada membro de balde contra o primeiro do mesmo balde
+        mascara = ~inicio_balde & (donos != primeiro)
+        pares = np.unique(np.stack([primeiro[mascara], donos[mascara]], axis=1), axis=0)
+
+    if len(pares):
+        similaridade = (assinaturas[pares[:, 0]] == assinaturas[pares[:, 1]]).mean(axis=1)
+        for i, j in pares[similaridade >= limiar].tolist():
+            ri, rj = _raiz(pais, i), _raiz(pais, j)
+            if ri != rj:
+                pais[max(ri, rj)] = min(ri, rj)
+
+    grupos = {}
+    for i in range(n):
+        grupos.setdefault(_raiz(pais, i), []).append(i)
+    return list(grupos.values())
+
+
+def deduplicar(noticias: list[dict], limiar: float = LIMIAR_SIMILARIDADE) -> list[dict]:
+    """Um representante por grupo de quase duplicatas (o primeiro, na ordem dos feeds)."""
+    grupos = agrupar(noticias, limiar)
+    repetidas = len(noticias) - len(grupos)
+    if repetidas:
+        print(f"   🔗 {repetidas} notícias agrupadas como o mesmo fato "
+              f"({len(grupos)} grupos)")
+    return [noticias[g[0]] for g in grupos]
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ════════════════════════════════════════════════════════════════════════════
+
+def _corpus_benchmark(log_file: str = 'videos_gerados.json', seed: int = 7):
+    """
+    Corpus sintético: cada título do log vira 1-4 "versões de portais"
+    (palavras reordenadas, uma palavra trocada, prefixo/sufixo do veículo).
+    Retorna (noticias, rotulo_do_fato).
+    """
+    import json
+    import random
+
+    rnd = random.Random(seed)
+    with open(log_file, 'r', encoding='utf-8') as f:
+        titulos = list(dict.fromkeys(e['tema'] for e in json.load(f) if e.get('tema')))
+
+    veiculos = ['G1', 'Estadão', 'Folha', 'CNN Brasil', 'Poder360']
+    extras = ['nesta terça', 'segundo fontes', 'em Brasília', 'após reunião', 'ao vivo']
+    noticias, rotulos = [], []
+    for fato, titulo in enumerate(titulos):
+        for _ in range(rnd.randint(1, 4)):
+            palavras = titulo.split()
+            if len(palavras) > 4:
+                i = rnd.randrange(len(palavras))
+                palavras[i] = rnd.choice(extras)
+                k = rnd.randrange(len(palavras))
+                palavras = palavras[k:] + palavras[:k]
+            noticias.append({
+                'titulo': f"{' '.join(palavras)} | {rnd.choice(veiculos)}",
+                'resumo': f"<p>{titulo}. {rnd.choice(extras)}.</p>",
+                'link': ''
+            })
+            rotulos.append(fato)
+    ordem = list(range(len(noticias)))
+    rnd.shuffle(ordem)
+    return [noticias[i] for i in ordem], [rotulos[i] for i in ordem]
+
+
+def _agrupar_forca_bruta(noticias: list[dict], limiar: float) -> int:
+    """Referência O(n²) com Jaccard exato. Retorna nº de grupos."""
+    conjuntos = [palavras_noticia(nt) for nt in noticias]
+    n = len(conjuntos)
+    pais = list(range(n))
+    for i in range(n):
+        for j in range(i + 1, n):
+            a, b = conjuntos[i], conjuntos[j]
+            if a and b and len(a & b) / len(a | b) >= limiar:
+                ri, rj = _raiz(pais, i), _raiz(pais, j)
+                if ri != rj:
+                    pais[max(ri, rj)] = min(ri, rj)
+    return len({_raiz(pais, i) for i in range(n)})
+
+
+def benchmark():
+    noticias, rotulos = _corpus_benchmark()
+    fatos = len(set(rotulos))
+    print(f"📊 Corpus: {len(noticias)} notícias de {fatos} fatos")
+
+    agrupar(noticias[:10])  # aquece
+    inicio = time.perf_counter()
+    grupos = agrupar(noticias)
+    t_lsh = time.perf_counter() - inicio
+
+    puros = sum(1 for g in grupos if len({rotulos[i] for i in g}) == 1)
+    print(f"   MinHash+LSH: {len(grupos)} grupos em {t_lsh * 1000:.1f}ms "
+          f"({puros}/{len(grupos)} grupos puros)")
+
+    inicio = time.perf_counter()
+    n_bruta = _agrupar_forca_bruta(noticias, LIMIAR_SIMILARIDADE)
+    t_bruta = time.perf_counter() - inicio
+    print(f"   Força bruta O(n²) Jaccard exato: {n_bruta} grupos em {t_bruta * 1000:.1f}ms")
+
+
+if __name__ == '__main__':
+    import sys
+
+    if '--benchmark' in sys.argv:
+        benchmark()
@@ -0,0 +1,267 @@
+"""
+cache_imagens.py
+----------------
+Cache em disco de imagens "prontas para render" do banco de assets.
+
+Cada imagem de assets/politicos, assets/instituicoes e assets/genericas
+é aberta, redimensionada e cortada uma única vez por resolução:
+  • cover      → crop centralizado que preenche o quadro (shorts e longos)
+  • pillarbox  → imagem inteira sobre fundo desfocado (vídeo semanal)
+
+Os frames ficam em .cache/imagens/<hash>_<variante>_<LxA>.npy (uint8 cru,
+carregado via memmap em milissegundos). A chave é o SHA-1 do conteúdo do
+arquivo, então trocar uma foto invalida o cache automaticamente; um índice
+(caminho, mtime, tamanho) → hash evita reler o arquivo a cada execução.
+O índice é gravado uma vez só: no fim de pre_aquecer/podar_cache ou na
+saída do processo.
+
+Variáveis de ambiente:
+  CACHE_DIR             → raiz dos caches (padrão: .cache)
+  CACHE_IMAGENS_MAX_MB  → limite do cache; as menos usadas saem primeiro (padrão: 2048)
+"""
+
+import os
+import json
+import atexit
+import hashlib
+import threading
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+CACHE_DIR = os.environ.get('CACHE_DIR', '.cache')
+CACHE_IMAGENS_DIR = os.path.join(CACHE_DIR, 'imagens')
+CACHE_IMAGENS_MAX_MB = int(os.environ.get('CACHE_IMAGENS_MAX_MB', '2048'))
+INDICE_FILE = os.path.join(CACHE_IMAGENS_DIR, 'indice.json')
+
+_indice = None
+_indice_sujo = False               # hashes novos ainda não gravados em INDICE_FILE
+_trava_indice = threading.Lock()    # hash_conteudo também roda nas threads de download do curador
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# AJUSTE DE IMAGEM
+# ════════════════════════════════════════════════════════════════════════════
+
+def _ajustar_cover(img: Image.Image, largura: int, altura: int) -> Image.Image:
+    """Redimensiona e corta no centro para preencher largura x altura."""
+    iw, ih = img.size
+    escala = max(largura / iw, altura / ih)
+    nw, nh = max(largura, round(iw * escala)), max(altura, round(ih * escala))
+    img = img.resize((nw, nh), Image.LANCZOS)
+    left = (nw - largura) // 2
+    top = (nh - altura) // 2
+    return img.crop((left, top, left + largura, top + altura))
+
+
+def _ajustar_pillarbox(img: Image.Image, largura: int, altura: int) -> Image.Image:
+    """
+    Imagem inteira centralizada sobre um fundo desfocado — o mesmo frame do
+    pillarbox original do vídeo semanal: o fundo é a imagem encaixada no
+    quadro e o crop além das bordas completa o resto com preto.
+    """
+    iw, ih = img.size
+    if iw / ih > largura / altura:
+        bg = img.resize((largura, int(largura * ih / iw)), Image.LANCZOS)
+    else:
+        bg = img.resize((int(altura * iw / ih), altura), Image.LANCZOS)
+    bw, bh = bg.size
+    left = max(0, (bw - largura) // 2)
+    top = max(0, (bh - altura) // 2)
+    bg = bg.crop((left, top, left + largura, top + altura))
+    if bg.size != (largura, altura):
+        bg = bg.resize((largura, altura), Image.LANCZOS)
+    bg = bg.filter(ImageFilter.GaussianBlur(radius=25))
+
+    escala = min(largura / iw, altura / ih)
+    fw, fh = int(iw * escala), int(ih * escala)
+    front = img.resize((fw, fh), Image.LANCZOS)
+    bg.paste(front, ((largura - fw) // 2, (altura - fh) // 2))
+    return bg
+
+
+_VARIANTES = {
+    'cover': _ajustar_cover,
+    'pillarbox': _ajustar_pillarbox,
+}
+# Revisão no nome do .npy quando o ajuste de uma variante muda: frames antigos
+# do cache restaurado deixam de casar e saem na poda LRU
+_REVISOES = {
+    'pillarbox': 2,
+}
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# ÍNDICE (caminho → hash do conteúdo)
+# ════════════════════════════════════════════════════════════════════════════
+
+def _carregar_indice() -> dict:
+    """Índice em memória; quem chama segura _trava_indice."""
+    global _indice
+    if _indice is None:
+        try:
+            with open(INDICE_FILE, 'r', encoding='utf-8') as f:
+                _indice = json.load(f)
+        except Exception:
+            _indice = {}
+    return _indice
+
+
+def _salvar_indice():
+    """Grava o índice se houver hashes novos; quem chama segura _trava_indice."""
+    global _indice_sujo
+    if not _indice_sujo:
+        return
+    try:
+        os.makedirs(CACHE_IMAGENS_DIR, exist_ok=True)
+        tmp = f'{INDICE_FILE}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(_indice, f, ensure_ascii=False)
+        os.replace(tmp, INDICE_FILE)
+        _indice_sujo = False
+    except Exception as e:
+        print(f"  ⚠️ Cache de imagens: índice não salvo ({e})")
+
+
+def salvar_indice():
+    """Grava os hashes novos (fim de pre_aquecer/podar_cache e saída do processo)."""
+    with _trava_indice:
+        _salvar_indice()
+
+
+atexit.register(salvar_indice)
+
+
+def hash_conteudo(caminho: str) -> str:
+    """SHA-1 do arquivo, reaproveitado enquanto mtime e tamanho não mudarem."""
+    global _indice_sujo
+    st = os.stat(caminho)
+    chave = os.path.abspath(caminho)
+    with _trava_indice:
+        entrada = _carregar_indice().get(chave)
+    if entrada and entrada['mtime'] == st.st_mtime and entrada['tamanho'] == st.st_size:
+        return entrada['hash']
+
+    # Leitura do arquivo fora da trava: downloads paralelos não esperam um ao outro
+    h = hashlib.sha1()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    entrada = {'mtime': st.st_mtime, 'tamanho': st.st_size, 'hash': h.hexdigest()}
+    with _trava_indice:
+        _carregar_indice()[chave] = entrada
+        _indice_sujo = True
+    return entrada['hash']
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# API
+# ════════════════════════════════════════════════════════════════════════════
+
+def obter_imagem(caminho: str, largura: int, altura: int,
+                 variante: str = 'cover') -> np.ndarray:
+    """
+    Array uint8 (altura, largura, 3) da imagem ajustada.
+    Lê do cache quando possível; senão processa, grava e devolve.
+    """
+    ajustar = _VARIANTES[variante]
+    try:
+        destino = os.path.join(
+            CACHE_IMAGENS_DIR,
+            f'{hash_conteudo(caminho)}_{variante}{_REVISOES.get(variante, "")}'
+            f'_{largura}x{altura}.npy'
+        )
+    except OSError:
+        destino = None
+
+    if destino and os.path.exists(destino):
+        try:
+            arr = np.load(destino, mmap_mode='r')
+            if arr.shape == (altura, largura, 3):
+                os.utime(destino)  # marca como usado recentemente (poda LRU)
+                return arr
+        except Exception:
+            pass
+
+    img = Image.open(caminho).convert('RGB')
+    arr = np.asarray(ajustar(img, largura, altura), dtype=np.uint8)
+
+    if destino:
+        try:
+            os.makedirs(CACHE_IMAGENS_DIR, exist_ok=True)
+            tmp = f'{destino}.{os.getpid()}.tmp.npy'
+            np.save(tmp, arr)
+            os.replace(tmp, destino)
+        except Exception as e:
+            print(f"  ⚠️ Cache de imagens: falha ao gravar ({e})")
+    return arr
+
+
+def obter_cover(caminho: str, largura: int, altura: int) -> np.ndarray:
+    return obter_imagem(caminho, largura, altura, 'cover')
+
+
+def obter_pillarbox(caminho: str, largura: int, altura: int) -> np.ndarray:
+    return obter_imagem(caminho, largura, altura, 'pillarbox')
+
+
+def podar_cache(max_mb: int = CACHE_IMAGENS_MAX_MB) -> int:
+    """Remove os frames menos usados até o cache caber em max_mb. Retorna nº removido."""
+    salvar_indice()
+    if not os.path.isdir(CACHE_IMAGENS_DIR):
+        return 0
+    arquivos = []
+    for nome in os.listdir(CACHE_IMAGENS_DIR):
+        if nome.endswith('.npy'):
+            caminho = os.path.join(CACHE_IMAGENS_DIR, nome)
+            st = os.stat(caminho)
+            arquivos.append((st.st_mtime, st.st_size, caminho))
+
+    total = sum(a[1] for a in arquivos)
+    limite = max_mb * 1024 * 1024
+    removidos = 0
+    for _, tamanho, caminho in sorted(arquivos):
+        if total <= limite:
+            break
+        try:
+            os.remove(caminho)
+            total -= tamanho
+            removidos += 1
+        except OSError:
+            pass
+    if removidos:
+        print(f"  🧹 Cache de imagens: {removidos} frames antigos removidos")
+    return removidos
+
+
+def pre_aquecer(largura: int, altura: int, variante: str = 'cover',
+                assets_dir: str = 'assets') -> int:
+    """Processa todo o banco de assets para uma resolução. Retorna nº de imagens."""
+    total = 0
+    for raiz, _, arquivos in os.walk(assets_dir):
+        for nome in arquivos:
+            if nome.lower().endswith(('.jpg', '.jpeg', '.png')):
+                try:
+                    obter_imagem(os.path.join(raiz, nome), largura, altura, variante)
+                    total += 1
+                except Exception as e:
+                    print(f"  ⚠️ {nome}: {e}")
+    salvar_indice()
+    return total
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    # python cache_imagens.py [short|long|semanal]
+    alvo = sys.argv[1] if len(sys.argv) > 1 else 'short'
+    largura, altura, variante = {
+        'short': (1080, 1920, 'cover'),
+        'long': (1920, 1080, 'cover'),
+        'semanal': (1920, 1080, 'pillarbox'),
+    }[alvo]
+    inicio = time.time()
+    n = pre_aquecer(largura, altura, variante)
+    print(f"✅ {n} imagens prontas ({variante} {largura}x{altura}) em {time.time() - inicio:.1f}s")
+    podar_cache()
@@ -0,0 +1,141 @@
+"""
+cache_llm.py
+------------
+Cache em disco das respostas do Gemini (roteiros, títulos e metadados).
+
+Quando um workflow é reexecutado depois de falhar no upload ou no render,
+a mesma notícia gera exatamente o mesmo prompt — a resposta sai do cache
+em vez de ser paga e esperada de novo.
+
+O cache vale só dentro de uma execução do workflow (GITHUB_RUN_ID, que se
+mantém nas reexecuções). Execuções agendadas diferentes nunca compartilham
+respostas: sem notícias, o tema sorteado gera sempre o mesmo prompt, e um
+acerto de cache publicaria um vídeo repetido. Para a reexecução acertar:
+os workflows salvam o .cache mesmo quando o job falha (actions/cache/save
+com if: always()) e a notícia/tema é sorteada com semente EXECUCAO, então
+a nova tentativa monta os mesmos prompts.
+
+  • chave   → SHA-256 de (execução, nome do modelo, prompt, parâmetros de geração)
+  • arquivo → .cache/llm/<chave>.json  {'modelo', 'criado_em', 'texto'}
+  • TTL     → respostas mais velhas que LLM_CACHE_TTL_HORAS são ignoradas
+  • limite  → acima de LLM_CACHE_MAX_MB, as menos usadas saem primeiro
+              (cada acerto atualiza o mtime do arquivo)
+
+Usado por cliente_llm.gerar_texto; quem recebe uma resposta inutilizável
+(JSON inválido, por exemplo) chama invalidar() para não repeti-la.
+
+Variáveis de ambiente:
+  CACHE_DIR            → raiz dos caches (padrão: .cache)
+  GITHUB_RUN_ID        → execução do workflow; fora do Actions, um id por processo
+  LLM_CACHE            → 0 ignora o cache e sempre chama o modelo (padrão: 1)
+  LLM_CACHE_TTL_HORAS  → validade de uma resposta (padrão: 24)
+  LLM_CACHE_MAX_MB     → tamanho máximo do cache (padrão: 50)
+"""
+
+import os
+import json
+import time
+import hashlib
+
+CACHE_DIR = os.environ.get('CACHE_DIR', '.cache')
+CACHE_LLM_DIR = os.path.join(CACHE_DIR, 'llm')
+LLM_CACHE = os.environ.get('LLM_CACHE', '1') != '0'
+LLM_CACHE_TTL_HORAS = float(os.environ.get('LLM_CACHE_TTL_HORAS', '24'))
+LLM_CACHE_MAX_MB = int(os.environ.get('LLM_CACHE_MAX_MB', '50'))
+# Reexecuções (GITHUB_RUN_ATTEMPT > 1) mantêm o run_id; execuções agendadas não
+EXECUCAO = os.environ.get('GITHUB_RUN_ID') or f'local-{os.getpid()}-{time.time():.0f}'
+
+
+def nome_modelo(modelo) -> str:
+    """Nome estável do modelo (GenerativeModel.model_name ou nome da classe)."""
+    return getattr(modelo, 'model_name', None) or type(modelo).__name__
+
+
+def chave(modelo, prompt: str, parametros: dict | None = None) -> str:
+    conteudo = json.dumps(
+        [EXECUCAO, nome_modelo(modelo), prompt, parametros or {}],
+        ensure_ascii=False, sort_keys=True, default=str
+    )
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+def _caminho(k: str) -> str:
+    return os.path.join(CACHE_LLM_DIR, f'{k}.json')
+
+
+def obter(k: str, ttl_horas: float = LLM_CACHE_TTL_HORAS) -> str | None:
+    """Texto em cache para a chave, ou None se ausente/expirado/desativado."""
+    if not LLM_CACHE:
+        return None
+    caminho = _caminho(k)
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+    except Exception:
+        return None
+    if time.time() - dados.get('criado_em', 0) > ttl_horas * 3600:
+        return None
+    try:
+        os.utime(caminho)  # marca como usado recentemente (poda LRU)
+    except OSError:
+        pass
+    return dados.get('texto')
+
+
+def salvar(k: str, modelo, texto: str):
+    if not LLM_CACHE:
+        return
+    try:
+        os.makedirs(CACHE_LLM_DIR, exist_ok=True)
+        tmp = f'{_caminho(k)}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'modelo': nome_modelo(modelo), 'criado_em': time.time(),
+                       'texto': texto}, f, ensure_ascii=False)
+        os.replace(tmp, _caminho(k))
+    except Exception as e:
+        print(f"   ⚠️ Cache LLM: resposta não salva ({e})")
+
+
+def invalidar(modelo, prompt: str, parametros: dict | None = None):
+    """Remove a resposta de um prompt (ex.: o JSON devolvido não era válido)."""
+    try:
+        os.remove(_caminho(chave(modelo, prompt, parametros)))
+    except OSError:
+        pass
+
+
+def podar_cache(max_mb: int = LLM_CACHE_MAX_MB,
+                ttl_horas: float = LLM_CACHE_TTL_HORAS) -> int:
+    """Apaga respostas expiradas e, se preciso, as menos usadas. Retorna nº removido."""
+    if not os.path.isdir(CACHE_LLM_DIR):
+        return 0
+    agora = time.time()
+    arquivos = []
+    removidos = 0
+    for nome in os.listdir(CACHE_LLM_DIR):
+        if not nome.endswith('.json'):
+            continue
+        caminho = os.path.join(CACHE_LLM_DIR, nome)
+        st = os.stat(caminho)
+        # sem uso há mais que o TTL → a resposta também já expirou
+        if agora - st.st_mtime > ttl_horas * 3600:
+            try:
+                os.remove(caminho)
+                removidos += 1
+            except OSError:
+                pass
+            continue
+        arquivos.append((st.st_mtime, st.st_size, caminho))
+
+    total = sum(a[1] for a in arquivos)
+    limite = max_mb * 1024 * 1024
+    for _, tamanho, caminho in sorted(arquivos):
+        if total <= limite:
+            break
+        try:
+            os.remove(caminho)
+            total -= tamanho
+            removidos += 1
+        except OSError:
+            pass
+    return removidos
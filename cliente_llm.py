@@ -0,0 +1,113 @@
+"""
+cliente_llm.py
+--------------
+Chamadas ao Gemini com retentativa e execução concorrente.
+
+  • gerar_texto           → uma chamada, com até LLM_TENTATIVAS tentativas e
+                            backoff exponencial com jitter
+  • gerar_textos_paralelo → dispara vários prompts de uma vez num pool
+                            limitado a LLM_CONCORRENCIA e devolve as respostas
+                            na MESMA ordem dos prompts
+
+Limite de taxa (429 / ResourceExhausted): a thread que recebe o erro abre uma
+pausa global, e nenhuma outra thread chama a API antes dela acabar — evita
+que o pool inteiro estoure a cota ao mesmo tempo.
+
+Respostas passam pelo cache_llm: reexecutar um workflow com os mesmos
+prompts não chama o modelo de novo.
+
+Qualquer objeto com generate_content(prompt) → objeto com .text serve como
+modelo, o que permite testar com um stub local.
+
+Variáveis de ambiente:
+  LLM_CONCORRENCIA  → chamadas simultâneas (padrão: 3)
+  LLM_TENTATIVAS    → tentativas por chamada (padrão: 3)
+"""
+
+import os
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cache_llm
+
+LLM_CONCORRENCIA = int(os.environ.get('LLM_CONCORRENCIA', '3'))
+LLM_TENTATIVAS = int(os.environ.get('LLM_TENTATIVAS', '3'))
+ESPERA_BASE = 2.0          # segundos; dobra a cada tentativa
+ESPERA_LIMITE_TAXA = 15.0  # pausa global após um 429
+
+_trava = threading.Lock()
+_pausado_ate = 0.0
+
+
+def _e_limite_de_taxa(erro: Exception) -> bool:
+    texto = f"{type(erro).__name__} {erro}".lower()
+    return '429' in texto or 'resourceexhausted' in texto or 'quota' in texto
+
+
+def _aguardar_pausa():
+    while True:
+        with _trava:
+            restante = _pausado_ate - time.monotonic()
+        if restante <= 0:
+            return
+        time.sleep(restante)
+
+
+def _pausar(segundos: float):
+    global _pausado_ate
+    with _trava:
+        _pausado_ate = max(_pausado_ate, time.monotonic() + segundos)
+
+
+def gerar_texto(modelo, prompt: str, tentativas: int = LLM_TENTATIVAS,
+                usar_cache: bool = True) -> str:
+    """
+    Texto da resposta do modelo. Levanta a última exceção se todas as tentativas falharem.
+    Com usar_cache, um prompt já respondido (cache_llm) não chega ao modelo.
+    """
+    k = cache_llm.chave(modelo, prompt)
+    if usar_cache:
+        texto = cache_llm.obter(k)
+        if texto is not None:
+            print("   ♻️ Resposta do Gemini reaproveitada do cache")
+            return texto
+
+    for tentativa in range(tentativas):
+        _aguardar_pausa()
+        try:
+            texto = modelo.generate_content(prompt).text
+            if usar_cache:
+                cache_llm.salvar(k, modelo, texto)
+            return texto
+        except Exception as e:
+            if tentativa == tentativas - 1:
+                raise
+            espera = ESPERA_BASE * (2 ** tentativa) * random.uniform(0.8, 1.2)
+            if _e_limite_de_taxa(e):
+                _pausar(ESPERA_LIMITE_TAXA)
+                print(f"   ⏳ Limite de taxa do Gemini, pausando {ESPERA_LIMITE_TAXA:.0f}s...")
+            else:
+                print(f"   ⚠️ Gemini falhou ({e}), nova tentativa em {espera:.1f}s...")
+            time.sleep(espera)
+
+
+def gerar_textos_paralelo(modelo, prompts: list[str],
+                          max_concorrencia: int = LLM_CONCORRENCIA) -> list[str | None]:
+    """
+    Respostas de todos os prompts, na ordem dos prompts.
+    Prompt que falhou em todas as tentativas vira None.
+    """
+    if not prompts:
+        return []
+
+    def _chamar(prompt):
+        try:
+            return gerar_texto(modelo, prompt)
+        except Exception as e:
+            print(f"   ❌ Erro: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concorrencia, len(prompts)))) as pool:
+        return list(pool.map(_chamar, prompts))
@@ -0,0 +1,203 @@
+"""
+clips_video.py
+--------------
+Pré-processamento dos vídeos enviados pelo curador no Telegram.
+
+Um vídeo de celular (4K, 60 fps, HEVC) era aberto inteiro pelo VideoFileClip,
+cortado com subclip e redimensionado quadro a quadro em Python — mesmo quando
+só 3 segundos entravam no vídeo. Aqui cada clip passa uma única vez pelo ffmpeg:
+  1. sondar()          → duração, resolução, fps e rotação (ffprobe, ou o
+                          cabeçalho lido por `ffmpeg -i` quando não há ffprobe)
+  2. normalizar_clip() → busca com -ss/-t ANTES do -i (o decoder nem toca no
+                          resto do arquivo), scale + crop "cover" e fps final
+                          num só filtro, H.264 leve sem áudio
+
+O intermediário fica em .cache/clips/<chave>.mp4, onde a chave combina o SHA-1
+do conteúdo do original (cache_imagens.hash_conteudo) com trecho, resolução e
+fps — reenviar o mesmo vídeo ou renderizar de novo não recodifica nada.
+
+Variáveis de ambiente:
+  CACHE_DIR           → raiz dos caches (padrão: .cache)
+  CACHE_CLIPS_MAX_MB  → limite do cache; os clips menos usados saem primeiro (padrão: 1024)
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import subprocess
+
+from cache_imagens import hash_conteudo
+from renderizador import ffmpeg_exe
+
+CACHE_DIR = os.environ.get('CACHE_DIR', '.cache')
+CACHE_CLIPS_DIR = os.path.join(CACHE_DIR, 'clips')
+CACHE_CLIPS_MAX_MB = int(os.environ.get('CACHE_CLIPS_MAX_MB', '1024'))
+
+CRF_INTERMEDIARIO = 18       # visualmente sem perdas; o encode final recomprime
+PRESET_INTERMEDIARIO = 'veryfast'
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# SONDAGEM
+# ════════════════════════════════════════════════════════════════════════════
+
+def _sondar_ffprobe(ffprobe: str, caminho: str) -> dict | None:
+    proc = subprocess.run(
+        [ffprobe, '-v', 'error', '-select_streams', 'v:0', '-print_format', 'json',
+         '-show_entries', 'format=duration:stream=width,height,r_frame_rate,codec_name'
+                          ':stream_tags=rotate:stream_side_data=rotation',
+         caminho],
+        capture_output=True, text=True, timeout=30
+    )
+    if proc.returncode != 0:
+        return None
+    dados = json.loads(proc.stdout or '{}')
+    streams = dados.get('streams') or []
+    if not streams:
+        return None
+    stream = streams[0]
+    num, _, den = (stream.get('r_frame_rate') or '0/1').partition('/')
+    rotacao = stream.get('tags', {}).get('rotate')
+    for lado in stream.get('side_data_list', []):
+        rotacao = lado.get('rotation', rotacao)
+    return {
+        'duracao': float(dados.get('format', {}).get('duration') or 0),
+        'largura': int(stream['width']),
+        'altura': int(stream['height']),
+        'fps': float(num) / float(den or 1),
+        'codec': stream.get('codec_name'),
+        'rotacao': int(float(rotacao or 0)),
+    }
+
+
+def _sondar_ffmpeg(caminho: str) -> dict | None:
+    proc = subprocess.run([ffmpeg_exe(), '-hide_banner', '-i', caminho],
+                          capture_output=True, text=True, timeout=30)
+    video = re.search(r'Stream #\S+.*?Video: (\w+).*?(\d{2,5})x(\d{2,5})', proc.stderr)
+    if not video:
+        return None
+    duracao = re.search(r'Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)', proc.stderr)
+    fps = re.search(r'([\d.]+) fps', proc.stderr)
+    rotacao = (re.search(r'rotate\s*:\s*(-?\d+)', proc.stderr) or
+               re.search(r'rotation of (-?[\d.]+) degrees', proc.stderr))
+    h, m, s = duracao.groups() if duracao else (0, 0, 0)
+    return {
+        'duracao': int(h) * 3600 + int(m) * 60 + float(s),
+        'largura': int(video.group(2)),
+        'altura': int(video.group(3)),
+        'fps': float(fps.group(1)) if fps else 0.0,
+        'codec': video.group(1),
+        'rotacao': int(float(rotacao.group(1))) if rotacao else 0,
+    }
+
+
+def sondar(caminho: str) -> dict | None:
+    """
+    Metadados do primeiro stream de vídeo, sem decodificar o arquivo:
+      {'duracao', 'largura', 'altura', 'fps', 'codec', 'rotacao'}
+    largura/altura já consideram a rotação (como o vídeo é exibido).
+    None se o arquivo não tiver vídeo legível.
+    """
+    try:
+        ffprobe = shutil.which('ffprobe')
+        info = _sondar_ffprobe(ffprobe, caminho) if ffprobe else None
+        info = info or _sondar_ffmpeg(caminho)
+    except Exception:
+        return None
+    if info and abs(info['rotacao']) % 180 == 90:
+        info['largura'], info['altura'] = info['altura'], info['largura']
+    return info
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# NORMALIZAÇÃO
+# ════════════════════════════════════════════════════════════════════════════
+
+def chave_clip(caminho: str, inicio: float, duracao: float,
+               largura: int, altura: int, fps: int) -> str:
+    conteudo = json.dumps([hash_conteudo(caminho), round(inicio, 3), round(duracao, 3),
+                           largura, altura, fps, CRF_INTERMEDIARIO])
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+
+def normalizar_clip(caminho: str, duracao: float, largura: int, altura: int,
+                    fps: int, inicio: float = 0.0) -> str | None:
+    """
+    Caminho de um MP4 com o trecho [inicio, inicio + duracao) do clip já em
+    largura x altura (crop centralizado), fps constante e sem áudio.
+    Reaproveita o cache quando possível; None se o ffmpeg falhar.
+    """
+    try:
+        destino = os.path.join(CACHE_CLIPS_DIR,
+                               f'{chave_clip(caminho, inicio, duracao, largura, altura, fps)}.mp4')
+    except OSError as e:
+        print(f"  ⚠️ Clip ilegível: {e}")
+        return None
+
+    if os.path.exists(destino):
+        os.utime(destino)  # marca como usado recentemente (poda LRU)
+        print("  ♻️ Clip normalizado reaproveitado do cache")
+        return destino
+
+    info = sondar(caminho)
+    if not info:
+        print(f"  ❌ Sem stream de vídeo: {os.path.basename(caminho)}")
+        return None
+    print(f"  🔎 {info['largura']}x{info['altura']} {info['codec']} "
+          f"{info['fps']:.0f}fps, {info['duracao']:.1f}s")
+
+    filtro = (f'scale={largura}:{altura}:force_original_aspect_ratio=increase,'
+              f'crop={largura}:{altura},setsar=1,fps={fps}')
+    os.makedirs(CACHE_CLIPS_DIR, exist_ok=True)
+    tmp = f'{destino}.{os.getpid()}.tmp.mp4'
+    cmd = [
+        ffmpeg_exe(), '-y', '-loglevel', 'error',
+        '-ss', f'{inicio:.3f}', '-t', f'{duracao:.3f}', '-i', caminho,
+        '-an', '-vf', filtro,
+        '-c:v', 'libx264', '-preset', PRESET_INTERMEDIARIO, '-crf', str(CRF_INTERMEDIARIO),
+        '-g', str(fps), '-pix_fmt', 'yuv420p', '-movflags', '+faststart',
+        tmp
+    ]
+
+    inicio_proc = time.time()
+    proc = subprocess.run(cmd, capture_output=True)
+    if proc.returncode != 0:
+        print(f"  ❌ ffmpeg (clip): {proc.stderr.decode(errors='ignore')[-300:]}")
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return None
+    os.replace(tmp, destino)
+    print(f"  ✂️ Clip normalizado para {largura}x{altura}@{fps} "
+          f"em {time.time() - inicio_proc:.1f}s")
+    return destino
+
+
+def podar_cache(max_mb: int = CACHE_CLIPS_MAX_MB) -> int:
+    """Remove os clips menos usados até o cache caber em max_mb. Retorna nº removido."""
+    if not os.path.isdir(CACHE_CLIPS_DIR):
+        return 0
+    arquivos = []
+    for nome in os.listdir(CACHE_CLIPS_DIR):
+        if nome.endswith('.mp4'):
+            caminho = os.path.join(CACHE_CLIPS_DIR, nome)
+            st = os.stat(caminho)
+            arquivos.append((st.st_mtime, st.st_size, caminho))
+
+    total = sum(a[1] for a in arquivos)
+    limite = max_mb * 1024 * 1024
+    removidos = 0
+    for _, tamanho, caminho in sorted(arquivos):
+        if total <= limite:
+            break
+        try:
+            os.remove(caminho)
+            total -= tamanho
+            removidos += 1
+        except OSError:
+            pass
+    if removidos:
+        print(f"  🧹 Cache de clips: {removidos} clips antigos removidos")
+    return removidos
@@ -0,0 +1,141 @@
+"""
+coletor_feeds.py
+----------------
+Coleta concorrente dos feeds RSS configurados em config.json.
+
+  • Todos os feeds são baixados ao mesmo tempo (thread pool), cada um com
+    timeout próprio — o tempo total é o do feed mais lento, não a soma
+  • ETag / Last-Modified ficam salvos em .cache/feeds.json; feed sem
+    mudanças responde 304 e reaproveita as entradas já processadas
+  • Só as entradas novas (por id/link) são convertidas; as conhecidas vêm
+    do cache
+
+Usado por generate_video.buscar_noticias e compilar_shorts.buscar_noticias_semana.
+
+Variáveis de ambiente:
+  CACHE_DIR     → raiz dos caches (padrão: .cache)
+  TIMEOUT_FEED  → timeout de leitura por feed, em segundos (padrão: 10)
+"""
+
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import feedparser
+
+CACHE_DIR = os.environ.get('CACHE_DIR', '.cache')
+FEEDS_CACHE_FILE = os.path.join(CACHE_DIR, 'feeds.json')
+TIMEOUT_FEED = float(os.environ.get('TIMEOUT_FEED', '10'))
+MAX_ENTRADAS_CACHE = 50
+USER_AGENT = 'Mozilla/5.0 (compatible; Canal55Bot/1.0; +https://github.com/Sgt-cod/youtube-automation-news)'
+
+
+def _carregar_cache() -> dict:
+    try:
+        with open(FEEDS_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _salvar_cache(cache: dict):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f'{FEEDS_CACHE_FILE}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp, FEEDS_CACHE_FILE)
+    except Exception as e:
+        print(f"   ⚠️ Cache de feeds não salvo: {e}")
+
+
+def _id_entrada(entry) -> str:
+    return entry.get('id') or entry.get('link') or entry.get('title', '')
+
+
+def _baixar_feed(url: str, anterior: dict, timeout: float) -> tuple[str, dict, str]:
+    """
+    Baixa um feed com GET condicional.
+    Retorna (url, nova_entrada_de_cache, status) — status: 'novo', '304', 'erro'.
+    """
+    headers = {'User-Agent': USER_AGENT}
+    if anterior.get('etag'):
+        headers['If-None-Match'] = anterior['etag']
+    if anterior.get('modified'):
+        headers['If-Modified-Since'] = anterior['modified']
+
+    try:
+        resp = requests.get(url, headers=headers, timeout=(5, timeout))
+        if resp.status_code == 304:
+            return url, anterior, '304'
+        resp.raise_for_status()
+    except Exception as e:
+        print(f"   ❌ {url[:50]}: {e}")
+        return url, anterior, 'erro'
+
+    feed = feedparser.parse(resp.content)
+    conhecidas = {e['id']: e for e in anterior.get('entradas', [])}
+
+    entradas = []
+    novas = 0
+    for entry in feed.entries[:MAX_ENTRADAS_CACHE]:
+        eid = _id_entrada(entry)
+        if eid in conhecidas:
+            entradas.append(conhecidas[eid])
+            continue
+        titulo = entry.get('title', '').strip()
+        if not titulo:
+            continue
+        entradas.append({
+            'id': eid,
+            'titulo': titulo,
+            'resumo': entry.get('summary', titulo),
+            'link': entry.get('link', '')
+        })
+        novas += 1
+
+    return url, {
+        'etag': resp.headers.get('ETag'),
+        'modified': resp.headers.get('Last-Modified'),
+        'atualizado_em': time.time(),
+        'novas': novas,
+        'entradas': entradas
+    }, 'novo'
+
+
+def buscar_feeds(urls: list, timeout: float = TIMEOUT_FEED) -> dict[str, list[dict]]:
+    """
+    Baixa todos os feeds em paralelo.
+    Retorna {url: [{'titulo', 'resumo', 'link'}, ...]} na ordem original de cada feed.
+    Em caso de erro, usa as últimas entradas conhecidas do feed (se houver).
+    """
+    if not urls:
+        return {}
+
+    cache = _carregar_cache()
+    inicio = time.time()
+
+    with ThreadPoolExecutor(max_workers=min(16, len(urls))) as pool:
+        resultados = list(pool.map(
+            lambda u: _baixar_feed(u, cache.get(u, {}), timeout), urls
+        ))
+
+    saida = {}
+    for url, entrada, status in resultados:
+        if entrada:
+            cache[url] = entrada
+        entradas = entrada.get('entradas', []) if entrada else []
+        if status == '304':
+            print(f"   📡 {url[:50]}... 304 (sem mudanças, {len(entradas)} em cache)")
+        elif status == 'novo':
+            print(f"   📡 {url[:50]}... {len(entradas)} entradas ({entrada['novas']} novas)")
+        saida[url] = [
+            {'titulo': e['titulo'], 'resumo': e['resumo'], 'link': e['link']}
+            for e in entradas
+        ]
+
+    _salvar_cache(cache)
+    print(f"   ⏱️ {len(urls)} feeds em {time.time() - inicio:.1f}s")
+    return saida
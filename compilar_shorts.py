@@ -6,17 +6,22 @@ notícias diretamente dos feeds RSS (igual aos shorts).
 Não depende do videos_gerados.json.
 """
 
-import os, json, random, time, glob, re, asyncio
+import os, json, random, time, glob, re
 from datetime import datetime
 from pathlib import Path
 
 import requests
-import feedparser
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 from google import generativeai as genai
 
+from coletor_feeds import buscar_feeds
+from agrupador_noticias import deduplicar
+from cliente_llm import gerar_texto
+from cache_llm import invalidar as invalidar_cache_llm, podar_cache as podar_cache_llm, EXECUCAO
+from narracao import podar_cache as podar_cache_tts
+
 # ── Secrets ───────────────────────────────────────────────────────────────
 GEMINI_API_KEY       = os.environ.get('GEMINI_API_KEY', '')
 YOUTUBE_CREDENTIALS  = os.environ.get('YOUTUBE_CREDENTIALS', '')
@@ -31,6 +36,10 @@ VIDEOS_DIR  = 'videos'
 ASSETS_DIR  = 'assets'
 LOG_FILE    = 'videos_gerados.json'
 
+# Semeado pela execução: a reexecução de um workflow que falhou sorteia as
+# mesmas notícias, monta os mesmos prompts e acerta o cache_llm
+sorteio = random.Random(EXECUCAO)
+
 # Lê config.json para pegar os feeds RSS
 def _carregar_config():
     for nome in ['config.json', 'config_noticias.json']:
@@ -63,23 +72,15 @@ def buscar_noticias_semana(quantidade=7) -> list[dict]:
     vistos = set()
     print(f"🔍 Buscando notícias de {len(feeds)} feeds...")
 
-    for feed_url in feeds[:3]:
-        try:
-            feed = feedparser.parse(feed_url)
-            for entry in feed.entries[:10]:
-                titulo = entry.title.strip()
-                chave = titulo.lower().strip('.,!?;: ')
-                if chave not in vistos:
-                    todas.append({
-                        'titulo': titulo,
-                        'resumo': entry.get('summary', titulo),
-                        'link': entry.link
-                    })
-                    vistos.add(chave)
-        except Exception as e:
-            print(f"  ❌ Erro feed: {e}")
+    for entradas in buscar_feeds(feeds).values():
+        for entrada in entradas[:10]:
+            chave = entrada['titulo'].lower().strip('.,!?;: ')
+            if chave not in vistos:
+                todas.append(entrada)
+                vistos.add(chave)
 
-    random.shuffle(todas)
+    todas = deduplicar(todas)
+    sorteio.shuffle(todas)
     selecionadas = todas[:quantidade]
     print(f"  ✅ {len(selecionadas)} notícias selecionadas")
     for n in selecionadas:
@@ -123,8 +124,8 @@ Retorne APENAS JSON válido (sem markdown):
 }}"""
 
     try:
-        response = model.generate_content(prompt)
-        texto = response.text.strip().replace('```json','').replace('```','').strip()
+        texto = gerar_texto(model, prompt)
+        texto = texto.strip().replace('```json','').replace('```','').strip()
         inicio = texto.find('{')
         fim = texto.rfind('}') + 1
         dados = json.loads(texto[inicio:fim])
@@ -133,6 +134,7 @@ Retorne APENAS JSON válido (sem markdown):
         return dados
     except Exception as e:
         print(f"  ⚠️ Gemini falhou: {e} — usando fallback")
+        invalidar_cache_llm(model, prompt)
         titulos = '. '.join(n['titulo'] for n in noticias[:3])
         semana = datetime.now().strftime('%d/%m')
         return {
@@ -149,16 +151,12 @@ Retorne APENAS JSON válido (sem markdown):
 
 def criar_audio(roteiro: str, output_path: str) -> bool:
     print("\n🎙️ Gerando áudio...")
-    import edge_tts
+    from narracao import sintetizar_roteiro
 
     voz = config.get('voz', 'pt-BR-AntonioNeural')
 
-    async def _gerar():
-        communicate = edge_tts.Communicate(roteiro, voz, rate="+0%")
-        await communicate.save(output_path)
-
     try:
-        asyncio.run(_gerar())
+        sintetizar_roteiro(roteiro, output_path, voz, rate="+0%")
         tamanho = os.path.getsize(output_path) / 1024
         print(f"  ✅ Áudio: {tamanho:.0f} KB")
         return True
@@ -177,7 +175,7 @@ def montar_video(audio_path: str, output_path: str) -> bool:
     print("\n🎬 Montando vídeo longo...")
     try:
         from moviepy import AudioFileClip, ImageClip, CompositeVideoClip
-        from PIL import Image, ImageFilter
+        from cache_imagens import obter_pillarbox, podar_cache
         import numpy as np
         import itertools
 
@@ -208,41 +206,12 @@ def montar_video(audio_path: str, output_path: str) -> bool:
             clips  = []
             tempo  = 0.0
 
-            def pillarbox_array(img_path: str) -> np.ndarray:
-                """Retorna array numpy 1920x1080 com pillarbox+blur."""
-                img = Image.open(img_path).convert('RGB')
-                iw, ih = img.size
-
-                # Fundo desfocado 1920x1080
-                ratio = W / H
-                if iw / ih > ratio:
-                    bg = img.resize((W, int(W * ih / iw)), Image.LANCZOS)
-                else:
-                    bg = img.resize((int(H * iw / ih), H), Image.LANCZOS)
-                bw, bh = bg.size
-                left = max(0, (bw - W) // 2)
-                top  = max(0, (bh - H) // 2)
-                bg   = bg.crop((left, top, left + W, top + H))
-                if bg.size != (W, H):
-                    bg = bg.resize((W, H), Image.LANCZOS)
-                bg = bg.filter(ImageFilter.GaussianBlur(radius=25))
-
-                # Frente centralizada
-                scale = min(W / iw, H / ih)
-                fw = int(iw * scale)
-                fh = int(ih * scale)
-                front = img.resize((fw, fh), Image.LANCZOS)
-                x = (W - fw) // 2
-                y = (H - fh) // 2
-                bg.paste(front, (x, y))
-                return np.array(bg)
-
             for img_path in itertools.cycle(imagens):
                 if tempo >= duracao:
                     break
                 dur = min(duracao_por_img, duracao - tempo)
                 try:
-                    frame = pillarbox_array(img_path)
+                    frame = obter_pillarbox(img_path, W, H)
                     clip  = ImageClip(frame, duration=dur).with_start(tempo)
                     clips.append(clip)
                     tempo += dur
@@ -272,6 +241,9 @@ def montar_video(audio_path: str, output_path: str) -> bool:
         )
         tamanho_mb = os.path.getsize(output_path) / (1024 * 1024)
         print(f"  ✅ Vídeo: {output_path} ({tamanho_mb:.1f} MB)")
+        podar_cache()
+        podar_cache_llm()
+        podar_cache_tts()
         return True
 
     except Exception as e:
@@ -7,8 +7,6 @@ import time
 import sys
 from datetime import datetime
 import requests
-import feedparser
-import edge_tts
 import numpy as np
 from moviepy.editor import *
 from google import generativeai as genai
@@ -16,6 +14,17 @@ from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 from PIL import Image
+from cache_imagens import obter_cover, podar_cache
+from coletor_feeds import buscar_feeds
+from noticias_vistas import abrir as abrir_noticias_vistas
+from agrupador_noticias import deduplicar
+from cliente_llm import gerar_texto, gerar_textos_paralelo, LLM_CONCORRENCIA
+from cache_llm import invalidar as invalidar_cache_llm, podar_cache as podar_cache_llm, EXECUCAO
+from mixer_audio import pre_mixar, envelope_ducking
+from narracao import sintetizar_roteiro_async, duracao_audio as medir_duracao_audio, podar_cache as podar_cache_tts
+from clips_video import sondar, normalizar_clip, podar_cache as podar_cache_clips
+from render_especulativo import podar_cache as podar_cache_trechos
+from perfis_encoder import escolher_perfil, perfil_de_render, argumentos_ffmpeg, parametros_moviepy
 
 # Importar curadoria
 try:
@@ -29,6 +38,11 @@ CONFIG_FILE = 'config.json'
 VIDEOS_DIR = 'videos'
 ASSETS_DIR = 'assets'
 VIDEO_TYPE = os.environ.get('VIDEO_TYPE', 'short')
+RENDER_BACKEND = os.environ.get('RENDER_BACKEND', 'moviepy').lower()  # 'moviepy', 'numpy', 'paralelo' ou 'ffmpeg'
+RENDER_PROCESSOS = int(os.environ.get('RENDER_PROCESSOS', '0')) or None  # 0 = os.cpu_count()
+RENDER_VFR = os.environ.get('RENDER_VFR', 'false').lower() == 'true'  # só gera frames que mudam a imagem
+# Renderiza os trechos em segundo plano durante a curadoria (render_especulativo)
+RENDER_ESPECULATIVO = os.environ.get('RENDER_ESPECULATIVO', 'true').lower() == 'true'
 
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
 PEXELS_API_KEY = os.environ.get('PEXELS_API_KEY')
@@ -38,6 +52,10 @@ YOUTUBE_CREDENTIALS = os.environ.get('YOUTUBE_CREDENTIALS')
 USAR_CURACAO = os.environ.get('USAR_CURACAO', 'false').lower() == 'true' and CURACAO_DISPONIVEL
 CURACAO_TIMEOUT = int(os.environ.get('CURACAO_TIMEOUT', '3600'))
 
+# Sorteio da notícia/tema semeado pela execução: a reexecução de um workflow
+# que falhou escolhe o mesmo assunto, monta o mesmo prompt e acerta o cache_llm
+sorteio = random.Random(EXECUCAO)
+
 genai.configure(api_key=GEMINI_API_KEY)
 model = genai.GenerativeModel('gemini-2.5-flash-lite')
 
@@ -57,32 +75,33 @@ def buscar_noticias(quantidade=1):
     
     print(f"🔍 Buscando notícias de {len(feeds)} feeds RSS...")
     
-    for feed_url in feeds[:3]:
-        try:
-            print(f"   📡 Feed: {feed_url[:50]}...")
-            feed = feedparser.parse(feed_url)
-            
-            noticias_feed = 0
-            for entry in feed.entries[:noticias_por_feed]:
-                titulo = entry.title.strip()
-                titulo_normalizado = titulo.lower().strip('.,!?;: ')
-                
-                if titulo_normalizado not in titulos_vistos:
-                    todas_noticias.append({
-                        'titulo': titulo,
-                        'resumo': entry.get('summary', titulo),
-                        'link': entry.link
-                    })
-                    titulos_vistos.add(titulo_normalizado)
-                    noticias_feed += 1
-                else:
-                    print(f"   ⚠️ Notícia duplicada ignorada: {titulo[:50]}...")
-            
-            print(f"   ✅ {noticias_feed} notícias únicas deste feed")
+    vistas = abrir_noticias_vistas()
+    ja_publicadas = 0
+    
+    for feed_url, entradas in buscar_feeds(feeds).items():
+        noticias_feed = 0
+        for entrada in entradas:
+            if noticias_feed >= noticias_por_feed:
+                break
+            titulo = entrada['titulo']
+            titulo_normalizado = titulo.lower().strip('.,!?;: ')
             
-        except Exception as e:
-            print(f"   ❌ Erro ao buscar feed: {e}")
-            continue
+            if vistas and vistas.ja_vista(entrada):
+                ja_publicadas += 1
+            elif titulo_normalizado not in titulos_vistos:
+                todas_noticias.append(entrada)
+                titulos_vistos.add(titulo_normalizado)
+                noticias_feed += 1
+            else:
+                print(f"   ⚠️ Notícia duplicada ignorada: {titulo[:50]}...")
+        
+        if entradas:
+            print(f"   ✅ {noticias_feed} notícias únicas de {feed_url[:50]}")
+    
+    if ja_publicadas:
+        print(f"   ⏭️ {ja_publicadas} notícias já publicadas ignoradas")
+    
+    todas_noticias = deduplicar(todas_noticias)
     
     if not todas_noticias:
         print("   ⚠️ Nenhuma notícia encontrada!")
@@ -91,9 +110,9 @@ def buscar_noticias(quantidade=1):
     print(f"\n✅ Total: {len(todas_noticias)} notícias únicas encontradas")
     
     if quantidade == 1:
-        return random.choice(todas_noticias)
+        return sorteio.choice(todas_noticias)
     
-    random.shuffle(todas_noticias)
+    sorteio.shuffle(todas_noticias)
     noticias_selecionadas = todas_noticias[:min(quantidade, len(todas_noticias))]
     
     print(f"📰 Selecionadas {len(noticias_selecionadas)} notícias para o vídeo:")
@@ -108,22 +127,29 @@ def gerar_titulo_especifico(tema):
 
 Retorne APENAS JSON: {{"titulo": "título aqui", "keywords": ["palavra1", "palavra2", "palavra3", "palavra4", "palavra5"]}}"""
     
-    response = model.generate_content(prompt)
-    texto = response.text.strip().replace('```json', '').replace('```', '').strip()
+    texto = gerar_texto(model, prompt)
+    texto = texto.strip().replace('```json', '').replace('```', '').strip()
     
     inicio = texto.find('{')
     fim = texto.rfind('}') + 1
     
     if inicio == -1 or fim == 0:
+        invalidar_cache_llm(model, prompt)
         return {"titulo": tema, "keywords": ["politics", "news", "brazil", "government", "congress"]}
     
     try:
         return json.loads(texto[inicio:fim])
     except:
+        invalidar_cache_llm(model, prompt)
         return {"titulo": tema, "keywords": ["politics", "news", "brazil", "government", "congress"]}
 
-def gerar_roteiro_segmentado(noticias, duracao_por_noticia=120):
-    """Gera roteiro segmentado para vídeo longo com múltiplas notícias"""
+def gerar_roteiro_segmentado(noticias, duracao_por_noticia=120, modelo=None):
+    """Gera roteiro segmentado para vídeo longo com múltiplas notícias.
+    
+    Os segmentos são pedidos ao Gemini em paralelo (cliente_llm) e remontados
+    na ordem das notícias, então inicio/fim continuam sequenciais.
+    """
+    modelo = modelo or model
     print(f"\n✍️ Gerando roteiros segmentados...")
     print(f"   {len(noticias)} notícias aprovadas")
     print(f"   ~{duracao_por_noticia}s por notícia")
@@ -131,13 +157,9 @@ def gerar_roteiro_segmentado(noticias, duracao_por_noticia=120):
     palavras_por_segundo = 2.5
     palavras_por_noticia = int(duracao_por_noticia * palavras_por_segundo)
     
-    roteiros_individuais = []
-    tempo_atual = 0
-    
+    prompts = []
     for i, noticia in enumerate(noticias):
-        print(f"\n   📝 Gerando roteiro {i+1}/{len(noticias)}: {noticia['titulo'][:50]}...")
-        
-        prompt = f"""Crie um script JORNALÍSTICO sobre esta notícia:
+        prompts.append(f"""Crie um script JORNALÍSTICO sobre esta notícia:
 
 TÍTULO: {noticia['titulo']}
 RESUMO: {noticia['resumo']}
@@ -153,35 +175,40 @@ REGRAS IMPORTANTES:
 - SEM formatação, asteriscos, marcadores ou emojis
 - TERMINE o segmento de forma conclusiva para esta notícia específica
 
-Escreva APENAS o roteiro deste segmento."""
-
-        try:
-            response = model.generate_content(prompt)
-            roteiro = response.text
-            
-            roteiro = re.sub(r'\*+', '', roteiro)
-            roteiro = re.sub(r'#+\s', '', roteiro)
-            roteiro = re.sub(r'^-\s', '', roteiro, flags=re.MULTILINE)
-            roteiro = roteiro.replace('*', '').replace('#', '').replace('_', '').strip()
-            
-            palavras = len(roteiro.split())
-            duracao_estimada = palavras / palavras_por_segundo
-            
-            roteiros_individuais.append({
-                'noticia': noticia,
-                'roteiro': roteiro,
-                'palavras': palavras,
-                'duracao_estimada': duracao_estimada,
-                'inicio': tempo_atual,
-                'fim': tempo_atual + duracao_estimada
-            })
-            
-            tempo_atual += duracao_estimada
-            print(f"   ✅ {palavras} palavras (~{duracao_estimada:.1f}s)")
-            
-        except Exception as e:
-            print(f"   ❌ Erro: {e}")
+Escreva APENAS o roteiro deste segmento.""")
+    
+    print(f"   🚀 {len(prompts)} segmentos em paralelo (até {LLM_CONCORRENCIA} por vez)...")
+    inicio_geracao = time.time()
+    respostas = gerar_textos_paralelo(modelo, prompts)
+    print(f"   ⏱️ Segmentos gerados em {time.time() - inicio_geracao:.1f}s")
+    
+    roteiros_individuais = []
+    tempo_atual = 0
+    
+    for i, (noticia, roteiro) in enumerate(zip(noticias, respostas)):
+        if roteiro is None:
+            print(f"   ❌ Segmento {i+1} ignorado: {noticia['titulo'][:50]}...")
             continue
+        
+        roteiro = re.sub(r'\*+', '', roteiro)
+        roteiro = re.sub(r'#+\s', '', roteiro)
+        roteiro = re.sub(r'^-\s', '', roteiro, flags=re.MULTILINE)
+        roteiro = roteiro.replace('*', '').replace('#', '').replace('_', '').strip()
+        
+        palavras = len(roteiro.split())
+        duracao_estimada = palavras / palavras_por_segundo
+        
+        roteiros_individuais.append({
+            'noticia': noticia,
+            'roteiro': roteiro,
+            'palavras': palavras,
+            'duracao_estimada': duracao_estimada,
+            'inicio': tempo_atual,
+            'fim': tempo_atual + duracao_estimada
+        })
+        
+        tempo_atual += duracao_estimada
+        print(f"   ✅ {i+1}/{len(noticias)}: {palavras} palavras (~{duracao_estimada:.1f}s)")
     
     roteiro_completo = "\n\n".join([r['roteiro'] for r in roteiros_individuais])
     
@@ -233,8 +260,7 @@ REGRAS:
 
 Escreva APENAS o roteiro."""
     
-    response = model.generate_content(prompt)
-    texto = response.text
+    texto = gerar_texto(model, prompt)
     
     texto = re.sub(r'\*+', '', texto)
     texto = re.sub(r'#+\s', '', texto)
@@ -244,39 +270,24 @@ Escreva APENAS o roteiro."""
     return texto
 
 async def criar_audio_async(texto, output_file):
-    """Cria áudio com Edge TTS (async)"""
+    """Cria áudio com Edge TTS (async), frase a frase em paralelo.
+    Retorna {'duracao', 'frases': [{'texto', 'inicio', 'duracao', 'inicio_fala'}], 'palavras'}."""
     voz = config.get('voz', 'pt-BR-ThalitaMultilingualNeural')
-    
-    for tentativa in range(3):
-        try:
-            communicate = edge_tts.Communicate(texto, voz, rate="+0%", pitch="+0Hz")
-            await asyncio.wait_for(communicate.save(output_file), timeout=120)
-            print(f"✅ Edge TTS")
-            return
-        except asyncio.TimeoutError:
-            print(f"⏱️ Timeout {tentativa + 1}")
-            if tentativa < 2:
-                await asyncio.sleep(10)
-        except Exception as e:
-            print(f"⚠️ Erro {tentativa + 1}: {e}")
-            if tentativa < 2:
-                await asyncio.sleep(10)
-    
-    raise Exception("Edge TTS falhou")
+    return await sintetizar_roteiro_async(texto, output_file, voz, rate="+0%", pitch="+0Hz")
 
 def criar_audio(texto, output_file):
-    """Cria áudio"""
+    """Cria áudio. Retorna duração e tempos medidos por frase (None no fallback gTTS)."""
     print("🎙️ Criando narração...")
     
     try:
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        loop.run_until_complete(criar_audio_async(texto, output_file))
+        info_audio = loop.run_until_complete(criar_audio_async(texto, output_file))
         loop.close()
         
         if os.path.exists(output_file) and os.path.getsize(output_file) > 0:
             print(f"✅ Áudio criado")
-            return output_file
+            return info_audio
     except Exception as e:
         print(f"❌ Edge TTS: {e}")
         from gtts import gTTS
@@ -284,7 +295,7 @@ def criar_audio(texto, output_file):
         tts.save(output_file)
         print("⚠️ gTTS usado")
     
-    return output_file
+    return None
 
 def extrair_keywords_do_texto(texto: str) -> list:
     """
@@ -363,97 +374,33 @@ def buscar_imagens_local(segmento_texto: str, assets_dir: str = 'assets') -> tup
       - Políticos vs instituições: quem aparecer primeiro no texto vence
       - Genéricas só como último recurso
     """
-    import os
-    import re
     import random
-    import unicodedata
+    from indice_assets import obter_indice, normalizar
 
-    def normalizar(texto: str) -> str:
-        texto = texto.lower().strip()
-        texto = unicodedata.normalize('NFD', texto)
-        texto = ''.join(c for c in texto if unicodedata.category(c) != 'Mn')
-        texto = re.sub(r'[^\w\s]', ' ', texto)
-        return texto.strip()
-
-    def imagens_da_pasta(pasta: str) -> list:
-        if not os.path.isdir(pasta):
-            return []
-        return [
-            os.path.join(pasta, f)
-            for f in os.listdir(pasta)
-            if f.lower().endswith(('.jpg', '.jpeg', '.png'))
-        ]
-
-    def carregar_subpastas(base_dir: str) -> dict:
-        """Retorna {nome_normalizado: caminho_completo}."""
-        if not os.path.isdir(base_dir):
-            return {}
-        return {
-            normalizar(nome): os.path.join(base_dir, nome)
-            for nome in os.listdir(base_dir)
-            if os.path.isdir(os.path.join(base_dir, nome))
-        }
-
-    def encontrar_match(palavras: list, subpastas: dict):
-        """
-        Varre todas as combinações do maior termo para o menor.
-        Retorna (posição_no_texto, caminho_imagem) do melhor match.
-        Usa TODAS as palavras incluindo curtas (ex: 'de') para termos compostos.
-        Exige que ao menos uma palavra do termo tenha >2 chars.
-        """
-        n = len(palavras)
-        melhor = None  # (posicao, imagem, tamanho_termo)
-
-        for tamanho in range(min(n, 5), 0, -1):
-            for inicio in range(n - tamanho + 1):
-                trecho = palavras[inicio:inicio + tamanho]
-                # Pelo menos uma palavra significativa no trecho
-                if not any(len(p) > 2 for p in trecho):
-                    continue
-                termo = '_'.join(trecho)
-                if termo in subpastas:
-                    imagens = imagens_da_pasta(subpastas[termo])
-                    if imagens:
-                        pos = inicio
-                        if (melhor is None
-                                or pos < melhor[0]
-                                or (pos == melhor[0] and tamanho > melhor[2])):
-                            melhor = (pos, random.choice(imagens), tamanho)
-
-        return (melhor[0], melhor[1]) if melhor else None
+    indice = obter_indice(assets_dir)
 
     # ── Normalizar texto completo (mantém todas as palavras para termos compostos) ──
     palavras = normalizar(segmento_texto).split()
 
+    genericas = indice.genericas
+
     if not palavras:
-        genericas = imagens_da_pasta(os.path.join(assets_dir, 'genericas'))
         return (random.choice(genericas), 'imagem_local') if genericas else None
 
-    # ── Carregar subpastas ────────────────────────────────────────────────────
-    subpastas_pol  = carregar_subpastas(os.path.join(assets_dir, 'politicos'))
-    subpastas_inst = carregar_subpastas(os.path.join(assets_dir, 'instituicoes'))
-
-    # ── Buscar matches ────────────────────────────────────────────────────────
-    match_pol  = encontrar_match(palavras, subpastas_pol)
-    match_inst = encontrar_match(palavras, subpastas_inst)
+    # ── Buscar menções (autômato: uma passada, quem aparece primeiro vence,
+    #    políticos desempatam, termo mais longo vence dentro da categoria) ────
+    match = indice.casador.melhor(palavras)
 
-    # ── Quem aparece primeiro no texto vence (políticos desempatam) ───────────
-    if match_pol and match_inst:
-        if match_pol[0] <= match_inst[0]:
-            print(f"    🎯 Político (pos {match_pol[0]}): {match_pol[1]}")
-            return (match_pol[1], 'imagem_local')
+    if match:
+        pos, categoria, termo = match
+        imagem = random.choice(indice.imagens(categoria, termo))
+        if categoria == 'politicos':
+            print(f"    🎯 Político (pos {pos}): {imagem}")
         else:
-            print(f"    🏛️ Instituição (pos {match_inst[0]}): {match_inst[1]}")
-            return (match_inst[1], 'imagem_local')
-    elif match_pol:
-        print(f"    🎯 Político: {match_pol[1]}")
-        return (match_pol[1], 'imagem_local')
-    elif match_inst:
-        print(f"    🏛️ Instituição: {match_inst[1]}")
-        return (match_inst[1], 'imagem_local')
+            print(f"    🏛️ Instituição (pos {pos}): {imagem}")
+        return (imagem, 'imagem_local')
 
     # ── Fallback: genéricas ───────────────────────────────────────────────────
-    genericas = imagens_da_pasta(os.path.join(assets_dir, 'genericas'))
     if genericas:
         sem_match = [p for p in palavras if len(p) > 3][:5]
         print(f"    📁 Genérica (sem match: {' '.join(sem_match)})")
@@ -487,12 +434,21 @@ def buscar_midias_final(keywords, quantidade=1):
     
     return midias
 
-def analisar_roteiro_e_buscar_midias(roteiro, duracao_audio):
-    """Analisa roteiro e busca mídias sincronizadas COM CURADORIA"""
+def analisar_roteiro_e_buscar_midias(roteiro, duracao_audio, tempos_frases=None):
+    """Analisa roteiro e busca mídias sincronizadas COM CURADORIA.
+    
+    tempos_frases: tempos medidos pelo TTS (narracao.sintetizar_roteiro), um
+    por frase do split abaixo. Sem eles, os tempos são estimados pela
+    proporção de palavras.
+    """
     print("📋 Analisando roteiro...")
     
-    segmentos = re.split(r'[.!?]\s+', roteiro)
-    segmentos = [s.strip() for s in segmentos if len(s.strip()) > 20]
+    frases = re.split(r'[.!?]\s+', roteiro)
+    if tempos_frases and len(tempos_frases) != len(frases):
+        print("   ⚠️ Tempos do TTS não batem com as frases — estimando por palavras")
+        tempos_frases = None
+    indices = [i for i, s in enumerate(frases) if len(s.strip()) > 20]
+    segmentos = [frases[i].strip() for i in indices]
     print(f"   {len(segmentos)} segmentos identificados")
     
     palavras_total = len(roteiro.split())
@@ -502,8 +458,17 @@ def analisar_roteiro_e_buscar_midias(roteiro, duracao_audio):
     tempo_atual = 0
     
     for i, segmento in enumerate(segmentos):
-        palavras_segmento = len(segmento.split())
-        duracao_segmento = palavras_segmento / palavras_por_segundo
+        if tempos_frases:
+            # Cada segmento começa na primeira palavra falada da sua frase
+            # (WordBoundary) e vai até a do próximo; frases curtas no meio
+            # ficam com o segmento anterior
+            tempo_atual = 0 if i == 0 else tempos_frases[indices[i]]['inicio_fala']
+            fim = (tempos_frases[indices[i + 1]]['inicio_fala']
+                   if i + 1 < len(indices) else duracao_audio)
+            duracao_segmento = fim - tempo_atual
+        else:
+            palavras_segmento = len(segmento.split())
+            duracao_segmento = palavras_segmento / palavras_por_segundo
         keywords = extrair_keywords_do_texto(segmento)
         
         segmentos_com_tempo.append({
@@ -540,7 +505,11 @@ def analisar_roteiro_e_buscar_midias(roteiro, duracao_audio):
 
         try:
             curator = TelegramCuratorNoticias()
+            especulativo = _iniciar_render_especulativo(midias_sincronizadas, duracao_audio)
             curator.solicitar_curacao(midias_sincronizadas)
+            if especulativo and curator.curacao:
+                curator.curacao.ouvintes.append(_acompanhar_curacao(especulativo))
+            curator.preparar_midia = _preparar_midia_curador(duracao_audio)
             midias_aprovadas = curator.aguardar_aprovacao(timeout=CURACAO_TIMEOUT)
 
             if midias_aprovadas:
@@ -589,14 +558,11 @@ def analisar_roteiro_e_buscar_midias(roteiro, duracao_audio):
 
 def obter_duracao_video(video_path):
     """Obtém duração de um arquivo de vídeo em segundos"""
-    try:
-        clip = VideoFileClip(video_path)
-        duracao = clip.duration
-        clip.close()
-        return duracao
-    except Exception as e:
-        print(f"  ⚠️ Não foi possível obter duração do vídeo: {e}")
+    info = sondar(video_path)
+    if not info:
+        print(f"  ⚠️ Não foi possível obter duração do vídeo: {video_path}")
         return None
+    return info['duracao']
 
 def preparar_clip_video(video_path, duracao_alvo, orientacao='short'):
     """
@@ -610,6 +576,15 @@ def preparar_clip_video(video_path, duracao_alvo, orientacao='short'):
     Returns:
         VideoFileClip preparado e dimensionado, ou None em caso de erro
     """
+    # Caminho rápido: trecho já cortado, escalado e sem áudio pelo ffmpeg
+    largura, altura, fps = (1080, 1920, 30) if orientacao == 'short' else (1920, 1080, 24)
+    normalizado = normalizar_clip(video_path, duracao_alvo, largura, altura, fps)
+    if normalizado:
+        try:
+            return VideoFileClip(normalizado, audio=False)
+        except Exception as e:
+            print(f"  ⚠️ Clip normalizado ilegível ({e}), processando o original...")
+
     try:
         clip = VideoFileClip(video_path)
         duracao_original = clip.duration
@@ -649,55 +624,259 @@ def preparar_clip_video(video_path, duracao_alvo, orientacao='short'):
         print(f"  ❌ Erro ao preparar clip de vídeo: {e}")
         return None
 
-def _mixar_musica_fundo(audio_narracao, duracao_total: float,
+def _escolher_musica_fundo(musicas_dir: str = 'assets/musicas') -> str | None:
+    """Sorteia uma música de assets/musicas/ (mp3, wav ou ogg). None se a pasta estiver vazia."""
+    import glob
+    import random
+
+    musicas = (glob.glob(f'{musicas_dir}/*.mp3') +
+               glob.glob(f'{musicas_dir}/*.wav') +
+               glob.glob(f'{musicas_dir}/*.ogg'))
+
+    if not musicas:
+        print("  ⚠️ Nenhuma música encontrada em assets/musicas/ — sem fundo")
+        return None
+
+    return random.choice(musicas)
+
+def _arquivo_de_render(output_file, perfil):
+    """Onde o render escreve: o arquivo final ou, em perfis de dois passos, um intermediário."""
+    if perfil.get('dois_passos'):
+        return os.path.splitext(output_file)[0] + '_intermediario.mp4'
+    return output_file
+
+
+def _concluir_encode(renderizado, output_file, perfil, duracao_total):
+    """
+    Recodifica o intermediário no bitrate do tamanho alvo (dois passos) e o apaga.
+    Se a recodificação falhar, o próprio intermediário vira o vídeo final:
+    o render já está pronto e não precisa ser refeito pelo MoviePy.
+    """
+    if not renderizado or renderizado == output_file:
+        return renderizado
+    from renderizador import codificar_tamanho_alvo
+    try:
+        resultado = codificar_tamanho_alvo(
+            renderizado, output_file, duracao_total, perfil['bitrate'],
+            preset=perfil['preset'], tune=perfil.get('tune'),
+            tempo_maximo=perfil.get('tempo_maximo_s'), threads=4
+        )
+    except Exception as e:
+        print(f"⚠️ Encode no tamanho alvo falhou: {e}")
+        resultado = None
+
+    if resultado:
+        try:
+            os.remove(renderizado)
+        except OSError:
+            pass
+        return resultado
+
+    print("⚠️ Usando o render intermediário como vídeo final")
+    try:
+        os.replace(renderizado, output_file)
+    except OSError as e:
+        print(f"❌ Intermediário não aproveitado: {e}")
+        return None
+    return output_file
+
+
+def _parametros_render(duracao_total, orientacao='short', perfil=None):
+    """(largura, altura, fps, zoom, perfil, parametros_video) de um render sem MoviePy."""
+    if orientacao == 'short':
+        largura, altura, fps, zoom = 1080, 1920, 30, 0.04
+    else:
+        largura, altura, fps, zoom = 1920, 1080, 24, 0.03
+
+    perfil = perfil or escolher_perfil(duracao_total, orientacao, config)
+    fps = perfil.get('fps') or fps
+    return largura, altura, fps, zoom, perfil, argumentos_ffmpeg(perfil_de_render(perfil))
+
+
+_render_especulativo = None
+
+
+def _iniciar_render_especulativo(midias_sincronizadas, duracao_total):
+    """
+    Começa a renderizar os trechos com as mídias automáticas enquanto a
+    curadoria roda. Só para os backends do renderizador.py; None se desligado.
+    """
+    global _render_especulativo
+    if not RENDER_ESPECULATIVO or RENDER_BACKEND not in ('numpy', 'paralelo', 'ffmpeg'):
+        return None
+    from render_especulativo import RenderEspeculativo
+
+    orientacao = 'short' if VIDEO_TYPE == 'short' else 'long'
+    largura, altura, fps, zoom, _, parametros_video = _parametros_render(duracao_total, orientacao)
+    try:
+        print("🧩 Renderizando trechos em segundo plano durante a curadoria...")
+        _render_especulativo = RenderEspeculativo(
+            duracao_total, largura, altura, fps, zoom,
+            parametros_video=parametros_video, vfr=RENDER_VFR, processos=RENDER_PROCESSOS
+        )
+        _render_especulativo.atualizar(midias_sincronizadas)
+    except Exception as e:
+        print(f"⚠️ Render especulativo indisponível: {e}")
+        _render_especulativo = None
+    return _render_especulativo
+
+
+def _acompanhar_curacao(especulativo):
+    """Ouvinte da SessaoCuracao: cada mídia trocada re-agenda só os trechos afetados."""
+    def ouvinte(evento, dados):
+        if evento['e'] == 'enviada' and dados['segmentos'][evento['n']].get('baixando'):
+            return  # o arquivo ainda não chegou: reagenda no evento 'baixada'
+        if evento['e'] in ('substituir', 'enviada', 'baixada', 'falha_download'):
+            try:
+                especulativo.atualizar(dados['segmentos'])
+            except Exception as e:
+                print(f"⚠️ Render especulativo: {e}")
+    return ouvinte
+
+
+def _preparar_midia_curador(duracao_total):
+    """
+    Para o curador chamar assim que uma mídia termina de baixar: vídeos são
+    normalizados (clips_video) já na resolução e fps do render, então ao fim
+    da curadoria o clip está pronto no cache.
+    """
+    orientacao = 'short' if VIDEO_TYPE == 'short' else 'long'
+    if RENDER_BACKEND in ('numpy', 'paralelo', 'ffmpeg'):
+        largura, altura, fps, *_ = _parametros_render(duracao_total, orientacao)
+    else:
+        # Mesmos valores do preparar_clip_video (caminho MoviePy)
+        largura, altura, fps = (1080, 1920, 30) if orientacao == 'short' else (1920, 1080, 24)
+
+    def preparar(caminho, segmento):
+        if segmento['midia'][1] == 'video_local':
+            normalizar_clip(caminho, segmento['duracao'], largura, altura, fps)
+    return preparar
+
+
+def _concluir_especulativo(midias_sincronizadas, destino, audio_path, musica):
+    """Junta os trechos do render especulativo, se houver um. None = renderizar do zero."""
+    global _render_especulativo
+    especulativo, _render_especulativo = _render_especulativo, None
+    if especulativo is None:
+        return None
+    print("🧩 Usando os trechos renderizados durante a curadoria")
+    resultado = especulativo.concluir(midias_sincronizadas, destino, audio_path, musica,
+                                      volume_musica=0.06)
+    if not resultado:
+        especulativo.cancelar()
+    return resultado
+
+
+def _cancelar_especulativo():
+    """Encerra o render especulativo que ainda estiver de pé e apaga seus trechos."""
+    global _render_especulativo
+    especulativo, _render_especulativo = _render_especulativo, None
+    if especulativo is not None:
+        especulativo.cancelar()
+
+
+def _renderizar_sem_moviepy(audio_path, midias_sincronizadas, output_file, duracao_total,
+                            orientacao='short', perfil=None):
+    """
+    Backends do renderizador.py:
+      numpy    → frames gerados em arrays e enviados direto ao ffmpeg
+      paralelo → o mesmo, em trechos num pool de processos unidos pelo concat demuxer
+      ffmpeg   → timeline compilada num filtergraph, sem trabalho por frame em
+                 Python; timelines com vídeo caem no backend numpy
+    perfil vem de perfis_encoder.escolher_perfil (escolhido aqui se None).
+    Retorna output_file ou None para cair no MoviePy.
+    """
+    from renderizador import (montar_timeline, renderizar_timeline,
+                              renderizar_timeline_paralelo, renderizar_filtergraph)
+
+    paralelo = RENDER_BACKEND == 'paralelo'
+    print(f"⚡ Backend {RENDER_BACKEND} ({orientacao})")
+    segmentos = montar_timeline(midias_sincronizadas, duracao_total)
+    if not segmentos:
+        print("❌ Nenhum segmento renderizável!")
+        return None
+
+    # Trilha pré-mixada (mixer_audio) e só copiada no encode; se a
+    # pré-mixagem falhar, a música entra pelo amix do próprio ffmpeg
+    musica = None
+    audio_mix = _mixar_musica_fundo(audio_path, duracao_total, volume=0.10)
+    if audio_mix:
+        audio_path = audio_mix
+    else:
+        musica = _escolher_musica_fundo()
+
+    largura, altura, fps, zoom, perfil, parametros_video = _parametros_render(
+        duracao_total, orientacao, perfil)
+    destino = _arquivo_de_render(output_file, perfil)
+
+    # Trechos já renderizados durante a curadoria: só o que mudou é refeito
+    resultado = _concluir_especulativo(midias_sincronizadas, destino, audio_path, musica)
+
+    # Vídeos do curador entram já cortados e na resolução final (clips_video)
+    if not resultado:
+        for seg in segmentos:
+            if seg['tipo'] == 'video':
+                seg['caminho'] = normalizar_clip(seg['caminho'], seg['duracao'],
+                                                 largura, altura, fps) or seg['caminho']
+
+    if not resultado and RENDER_BACKEND == 'ffmpeg':
+        resultado = renderizar_filtergraph(
+            segmentos, destino, duracao_total,
+            largura=largura, altura=altura, fps=fps, zoom=zoom,
+            audio_path=audio_path, musica_path=musica, volume_musica=0.06,
+            threads=4, parametros_video=parametros_video, vfr=RENDER_VFR
+        )
+
+    if not resultado and paralelo:
+        resultado = renderizar_timeline_paralelo(
+            segmentos, destino, duracao_total,
+            largura=largura, altura=altura, fps=fps, zoom=zoom,
+            audio_path=audio_path, musica_path=musica, volume_musica=0.06,
+            processos=RENDER_PROCESSOS, parametros_video=parametros_video, vfr=RENDER_VFR
+        )
+    elif not resultado:
+        resultado = renderizar_timeline(
+            segmentos, destino, duracao_total,
+            largura=largura, altura=altura, fps=fps, zoom=zoom,
+            audio_path=audio_path, musica_path=musica, volume_musica=0.06,
+            threads=4, parametros_video=parametros_video, vfr=RENDER_VFR
+        )
+
+    return _concluir_encode(resultado, output_file, perfil, duracao_total)
+
+def _mixar_musica_fundo(audio_path, duracao_total: float,
                          volume: float = 0.09,
                          musicas_dir: str = 'assets/musicas'):
     """
-    Escolhe uma música aleatória da pasta assets/musicas/,
-    ajusta o volume e mixa com a narração.
-    Retorna o AudioClip final mixado.
-    Se não encontrar músicas, retorna a narração sem alteração.
+    Escolhe uma música aleatória da pasta assets/musicas/ e pré-mixa com a
+    narração (mixer_audio) num .m4a pronto — o encoder do vídeo só multiplexa.
+    volume é o nível da música nas pausas; sob a fala o ducking a reduz
+    (DUCKING_REDUCAO).
+    Retorna o caminho do áudio final, ou None se a mixagem falhar.
+    Se não encontrar músicas, o arquivo final contém só a narração.
     """
-    import glob
-    import random
-    from moviepy.editor import AudioFileClip, CompositeAudioClip
- 
-    try:
-        # Busca músicas disponíveis
-        musicas = (glob.glob(f'{musicas_dir}/*.mp3') +
-                   glob.glob(f'{musicas_dir}/*.wav') +
-                   glob.glob(f'{musicas_dir}/*.ogg'))
- 
-        if not musicas:
-            print("  ⚠️ Nenhuma música encontrada em assets/musicas/ — sem fundo")
-            return audio_narracao
- 
-        musica_escolhida = random.choice(musicas)
+    musica_escolhida = _escolher_musica_fundo(musicas_dir)
+    envelope = None
+    if musica_escolhida:
         print(f"  🎼 Música: {os.path.basename(musica_escolhida)} (volume {int(volume*100)}%)")
- 
-        musica = AudioFileClip(musica_escolhida)
- 
-        # Loopa se a música for mais curta que o vídeo
-        if musica.duration < duracao_total:
-            import math
-            repeticoes = math.ceil(duracao_total / musica.duration)
-            from moviepy.editor import concatenate_audioclips
-            musica = concatenate_audioclips([musica] * repeticoes)
- 
-        # Corta no tamanho exato do vídeo e ajusta volume
-        musica = musica.subclip(0, duracao_total).volumex(volume)
- 
-        # Mixa narração + música
-        audio_mixado = CompositeAudioClip([audio_narracao, musica])
-        return audio_mixado
- 
-    except Exception as e:
-        print(f"  ⚠️ Erro ao adicionar música: {e} — usando só narração")
-        return audio_narracao
+        envelope = envelope_ducking(audio_path)
+    
+    destino = os.path.splitext(audio_path)[0] + '_mix.m4a'
+    return pre_mixar(audio_path, musica_escolhida, destino, duracao_total, volume, envelope)
 
 def criar_video_short_sem_legendas(audio_path, midias_sincronizadas, output_file, duracao_total):
     """Cria SHORT SEM legendas - suporta fotos E vídeos"""
     print(f"📹 Criando short (sem legendas)...")
+    perfil = escolher_perfil(duracao_total, 'short', config)
+    
+    if RENDER_BACKEND in ('numpy', 'paralelo', 'ffmpeg'):
+        try:
+            if _renderizar_sem_moviepy(audio_path, midias_sincronizadas, output_file,
+                                       duracao_total, orientacao='short', perfil=perfil):
+                return output_file
+        except Exception as e:
+            print(f"⚠️ Backend {RENDER_BACKEND} falhou: {e}")
+        print("↩️ Voltando para o MoviePy...")
     
     clips_imagem = []
     tempo_coberto = 0
@@ -718,14 +897,7 @@ def criar_video_short_sem_legendas(audio_path, midias_sincronizadas, output_file
                 tempo_coberto = max(tempo_coberto, inicio + clip.duration)
             
             elif midia_tipo in ('foto_local', 'imagem_local') and os.path.exists(midia_info):
-                clip = ImageClip(midia_info, duration=duracao_clip)
-                clip = clip.resize(height=1920)
-                if clip.w > 1080:
-                    clip = clip.crop(x_center=clip.w/2, width=1080, height=1920)
-                elif clip.w < 1080:
-                    clip = clip.resize(width=1080)
-                if clip.size != (1080, 1920):
-                    clip = clip.resize((1080, 1920))
+                clip = ImageClip(obter_cover(midia_info, 1080, 1920), duration=duracao_clip)
                 
                 # ── Zoom Ken Burns (aplicado APÓS resize final) ──────────────
                 clip = clip.resize(lambda t: 1 + 0.04 * (t / duracao_clip))
@@ -754,14 +926,7 @@ def criar_video_short_sem_legendas(audio_path, midias_sincronizadas, output_file
                                    duracao_total - tempo_coberto)
                 try:
                     if midia_tipo in ('foto_local', 'imagem_local') and os.path.exists(midia_info):
-                        clip = ImageClip(midia_info, duration=duracao_clip)
-                        clip = clip.resize(height=1920)
-                        if clip.w > 1080:
-                            clip = clip.crop(x_center=clip.w/2, width=1080, height=1920)
-                        elif clip.w < 1080:
-                            clip = clip.resize(width=1080)
-                        if clip.size != (1080, 1920):
-                            clip = clip.resize((1080, 1920))
+                        clip = ImageClip(obter_cover(midia_info, 1080, 1920), duration=duracao_clip)
                         clip = clip.resize(lambda t: 1 + 0.04 * (t / duracao_clip))
                         clip = clip.set_start(tempo_coberto)
                         clips_imagem.append(clip)
@@ -779,35 +944,50 @@ def criar_video_short_sem_legendas(audio_path, midias_sincronizadas, output_file
     video_base = video_base.set_duration(duracao_total)
     
     print("🎵 Adicionando áudio...")
-    audio_narr = AudioFileClip(audio_path)
-    
-    # ── Música de fundo ───────────────────────────────────────────────────────
-    audio_final = _mixar_musica_fundo(audio_narr, duracao_total, volume=0.06)
-    video_final = video_base.set_audio(audio_final)
+    # ── Narração + música pré-mixadas; o write_videofile só multiplexa ────────
+    audio_mix = _mixar_musica_fundo(audio_path, duracao_total, volume=0.10)
+    audio_narr = None
+    if audio_mix:
+        video_final = video_base
+    else:
+        audio_narr = AudioFileClip(audio_path)
+        video_final = video_base.set_audio(audio_narr)
     
     print("💾 Renderizando...")
+    renderizado = _arquivo_de_render(output_file, perfil)
     video_final.write_videofile(
-        output_file,
-        fps=30,
+        renderizado,
+        fps=perfil.get('fps') or 30,
         codec='libx264',
+        audio=audio_mix or True,
         audio_codec='aac',
-        preset='medium',
-        bitrate='8000k',
-        threads=4
+        threads=4,
+        **parametros_moviepy(perfil_de_render(perfil))
     )
     
     print("🧹 Limpando memória...")
     video_final.close()
-    audio_narr.close()
+    if audio_narr:
+        audio_narr.close()
     for clip in clips_imagem:
         clip.close()
     
-    return output_file
+    return _concluir_encode(renderizado, output_file, perfil, duracao_total)
  
  
 def criar_video_long_sem_legendas(audio_path, midias_sincronizadas, output_file, duracao_total):
     """Cria vídeo longo SEM legendas - suporta fotos E vídeos"""
     print(f"📹 Criando vídeo longo...")
+    perfil = escolher_perfil(duracao_total, 'long', config)
+    
+    if RENDER_BACKEND in ('numpy', 'paralelo', 'ffmpeg'):
+        try:
+            if _renderizar_sem_moviepy(audio_path, midias_sincronizadas, output_file,
+                                       duracao_total, orientacao='long', perfil=perfil):
+                return output_file
+        except Exception as e:
+            print(f"⚠️ Backend {RENDER_BACKEND} falhou: {e}")
+        print("↩️ Voltando para o MoviePy...")
     
     clips_imagem = []
     tempo_coberto = 0
@@ -829,13 +1009,7 @@ def criar_video_long_sem_legendas(audio_path, midias_sincronizadas, output_file,
                 tempo_coberto = max(tempo_coberto, inicio + clip.duration)
             
             elif midia_tipo in ('foto_local', 'imagem_local') and os.path.exists(midia_info):
-                clip = ImageClip(midia_info, duration=duracao_clip)
-                clip = clip.resize(height=1080)
-                if clip.w < 1920:
-                    clip = clip.resize(width=1920)
-                clip = clip.crop(x_center=clip.w/2, y_center=clip.h/2, width=1920, height=1080)
-                if clip.size != (1920, 1080):
-                    clip = clip.resize((1920, 1080))
+                clip = ImageClip(obter_cover(midia_info, 1920, 1080), duration=duracao_clip)
                 
                 # ── Zoom Ken Burns (aplicado APÓS resize final) ──────────────
                 clip = clip.resize(lambda t: 1 + 0.03 * (t / duracao_clip))
@@ -864,14 +1038,7 @@ def criar_video_long_sem_legendas(audio_path, midias_sincronizadas, output_file,
                                    duracao_total - tempo_coberto)
                 try:
                     if midia_tipo in ('foto_local', 'imagem_local') and os.path.exists(midia_info):
-                        clip = ImageClip(midia_info, duration=duracao_clip)
-                        clip = clip.resize(height=1080)
-                        if clip.w < 1920:
-                            clip = clip.resize(width=1920)
-                        clip = clip.crop(x_center=clip.w/2, y_center=clip.h/2,
-                                         width=1920, height=1080)
-                        if clip.size != (1920, 1080):
-                            clip = clip.resize((1920, 1080))
+                        clip = ImageClip(obter_cover(midia_info, 1920, 1080), duration=duracao_clip)
                         clip = clip.resize(lambda t: 1 + 0.03 * (t / duracao_clip))
                         clip = clip.set_start(tempo_coberto)
                         clips_imagem.append(clip)
@@ -887,29 +1054,34 @@ def criar_video_long_sem_legendas(audio_path, midias_sincronizadas, output_file,
     video_base = video_base.set_duration(duracao_total)
     
     print("🎵 Adicionando áudio...")
-    audio_narr = AudioFileClip(audio_path)
-    
-    # ── Música de fundo ───────────────────────────────────────────────────────
-    audio_final = _mixar_musica_fundo(audio_narr, duracao_total, volume=0.06)
-    video_final = video_base.set_audio(audio_final)
+    # ── Narração + música pré-mixadas; o write_videofile só multiplexa ────────
+    audio_mix = _mixar_musica_fundo(audio_path, duracao_total, volume=0.10)
+    audio_narr = None
+    if audio_mix:
+        video_final = video_base
+    else:
+        audio_narr = AudioFileClip(audio_path)
+        video_final = video_base.set_audio(audio_narr)
     
     print("💾 Renderizando...")
+    renderizado = _arquivo_de_render(output_file, perfil)
     video_final.write_videofile(
-        output_file,
-        fps=24,
+        renderizado,
+        fps=perfil.get('fps') or 24,
         codec='libx264',
+        audio=audio_mix or True,
         audio_codec='aac',
-        preset='medium',
-        bitrate='5000k',
-        threads=4
+        threads=4,
+        **parametros_moviepy(perfil_de_render(perfil))
     )
     
     video_final.close()
-    audio_narr.close()
+    if audio_narr:
+        audio_narr.close()
     for clip in clips_imagem:
         clip.close()
     
-    return output_file
+    return _concluir_encode(renderizado, output_file, perfil, duracao_total)
     
 def fazer_upload_youtube(video_path, titulo, descricao, tags, thumbnail_path=None):
     """Faz upload para YouTube"""
@@ -973,7 +1145,7 @@ def main():
         keywords = titulo_video.split()[:5]
         print(f"📰 Notícia: {titulo_video}")
     else:
-        tema = random.choice(config.get('temas', ['política brasileira']))
+        tema = sorteio.choice(config.get('temas', ['política brasileira']))
         print(f"📝 Tema: {tema}")
         info = gerar_titulo_especifico(tema)
         titulo_video = info['titulo']
@@ -987,55 +1159,73 @@ def main():
     
     # Criar áudio
     audio_path = f'{ASSETS_DIR}/audio.mp3'
-    criar_audio(roteiro, audio_path)
+    info_audio = criar_audio(roteiro, audio_path)
     
-    audio_clip = AudioFileClip(audio_path)
-    duracao = audio_clip.duration
-    audio_clip.close()
+    if info_audio:
+        duracao = info_audio['duracao']
+        tempos_frases = info_audio['frases']
+    else:
+        duracao = medir_duracao_audio(audio_path)
+        tempos_frases = None
+        if not duracao:
+            # Áudio do gTTS ausente ou ilegível: sem duração não há timeline
+            print(f"❌ Não foi possível medir a duração da narração ({audio_path})")
+            return
     print(f"⏱️ {duracao:.1f}s")
     
-    # Buscar mídias
-    midias_sincronizadas = analisar_roteiro_e_buscar_midias(roteiro, duracao)
-    
-    # Complementar se necessário
-    if len(midias_sincronizadas) < 3:
-        print("⚠️ Complementando...")
-        extras = buscar_midias_final(['brasil'], quantidade=5)
-        tempo_restante = duracao - sum([m['duracao'] for m in midias_sincronizadas])
-        duracao_extra = tempo_restante / len(extras) if extras else 0
-        for extra in extras:
-            midias_sincronizadas.append({
-                'midia': extra,
-                'inicio': duracao - tempo_restante,
-                'duracao': duracao_extra
-            })
-            tempo_restante -= duracao_extra
+    # Da curadoria ao render: o render especulativo (se houver) nunca
+    # sobrevive a uma exceção no meio do caminho
+    try:
+        # Buscar mídias
+        midias_sincronizadas = analisar_roteiro_e_buscar_midias(roteiro, duracao, tempos_frases)
+    
+        # Complementar se necessário
+        if len(midias_sincronizadas) < 3:
+            print("⚠️ Complementando...")
+            extras = buscar_midias_final(['brasil'], quantidade=5)
+            tempo_restante = duracao - sum([m['duracao'] for m in midias_sincronizadas])
+            duracao_extra = tempo_restante / len(extras) if extras else 0
+            for extra in extras:
+                midias_sincronizadas.append({
+                    'midia': extra,
+                    'inicio': duracao - tempo_restante,
+                    'duracao': duracao_extra
+                })
+                tempo_restante -= duracao_extra
     
-    # Definir video_path
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    video_path = f'{VIDEOS_DIR}/{VIDEO_TYPE}_{timestamp}.mp4'
-    print(f"📹 Arquivo: {video_path}")
+        # Definir video_path
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        video_path = f'{VIDEOS_DIR}/{VIDEO_TYPE}_{timestamp}.mp4'
+        print(f"📹 Arquivo: {video_path}")
     
-    # Montar vídeo
-    print("🎥 Montando vídeo...")
-    try:
-        if VIDEO_TYPE == 'short':
-            resultado = criar_video_short_sem_legendas(
-                audio_path, midias_sincronizadas, video_path, duracao)
-        else:
-            resultado = criar_video_long_sem_legendas(
-                audio_path, midias_sincronizadas, video_path, duracao)
+        # Montar vídeo
+        print("🎥 Montando vídeo...")
+        try:
+            if VIDEO_TYPE == 'short':
+                resultado = criar_video_short_sem_legendas(
+                    audio_path, midias_sincronizadas, video_path, duracao)
+            else:
+                resultado = criar_video_long_sem_legendas(
+                    audio_path, midias_sincronizadas, video_path, duracao)
         
-        if not resultado:
-            print("❌ Erro ao criar vídeo")
-            return
-        print("✅ Vídeo criado!")
+            if not resultado:
+                print("❌ Erro ao criar vídeo")
+                return
+            print("✅ Vídeo criado!")
+            podar_cache()
+            podar_cache_llm()
+            podar_cache_tts()
+            podar_cache_clips()
+            podar_cache_trechos()
         
-    except Exception as e:
-        print(f"❌ Erro: {e}")
-        import traceback
-        traceback.print_exc()
-        return
+        except Exception as e:
+            print(f"❌ Erro: {e}")
+            import traceback
+            traceback.print_exc()
+            return
+    
+    finally:
+        _cancelar_especulativo()
     
     # Preparar metadados
     titulo_completo = titulo_video  # título original para thumbnail e Telegram
@@ -1099,6 +1289,11 @@ def main():
         with open(log_file, 'w', encoding='utf-8') as f:
             json.dump(logs, f, indent=2, ensure_ascii=False)
         
+        if noticia:
+            vistas = abrir_noticias_vistas()
+            if vistas:
+                vistas.registrar(noticia)
+        
         # ── 1. DISTRIBUIÇÃO MULTIPLATAFORMA ─────────────────────────────
         thumb_youtube = thumbnail_path  # customizada pelo usuário (prioridade)
         try:
@@ -0,0 +1,328 @@
+"""
+indice_assets.py
+----------------
+Índice em memória do banco de imagens locais usado por buscar_imagens_local().
+
+Estrutura indexada:
+  assets/politicos/<nome>/foto.jpg      → politicos[<nome normalizado>]    = [fotos]
+  assets/instituicoes/<nome>/foto.jpg   → instituicoes[<nome normalizado>] = [fotos]
+  assets/genericas/foto.jpg             → genericas = [fotos]
+
+O índice é montado uma vez por processo (obter_indice) e salvo em
+.cache/indice_assets.json. Nas execuções seguintes o snapshot é recarregado
+em milissegundos, desde que o mtime de nenhuma pasta tenha mudado
+(adicionar/remover foto ou pasta altera o mtime e força a reconstrução).
+Depois disso, casar um segmento é só consulta a dicionário — zero listdir.
+
+A detecção de entidades usa um autômato Aho-Corasick sobre PALAVRAS
+(CasadorEntidades), compilado a partir dos nomes das pastas
+(ex.: alexandre_de_moraes → alexandre → de → moraes). Uma única passada
+linear pelo texto encontra todas as menções de políticos e instituições.
+
+Benchmark contra o casamento por n-gramas antigo:
+  python indice_assets.py --benchmark
+"""
+
+import os
+import re
+import json
+import unicodedata
+
+CACHE_DIR = os.environ.get('CACHE_DIR', '.cache')
+SNAPSHOT_FILE = os.path.join(CACHE_DIR, 'indice_assets.json')
+EXTENSOES_IMAGEM = ('.jpg', '.jpeg', '.png')
+CATEGORIAS = ('politicos', 'instituicoes')   # ordem = prioridade no desempate
+MAX_PALAVRAS_TERMO = 5
+
+_indices = {}
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas, sem acentos e sem pontuação (underscore é preservado)."""
+    texto = texto.lower().strip()
+    texto = unicodedata.normalize('NFD', texto)
+    texto = ''.join(c for c in texto if unicodedata.category(c) != 'Mn')
+    texto = re.sub(r'[^\w\s]', ' ', texto)
+    return texto.strip()
+
+
+def _imagens_da_pasta(pasta: str) -> list:
+    return sorted(
+        os.path.join(pasta, f)
+        for f in os.listdir(pasta)
+        if f.lower().endswith(EXTENSOES_IMAGEM)
+    )
+
+
+class CasadorEntidades:
+    """
+    Autômato Aho-Corasick cujo alfabeto são palavras normalizadas.
+
+    Regras de escolha (as mesmas de buscar_imagens_local desde sempre):
+      - a menção que começa mais cedo no texto vence
+      - na mesma posição, políticos vencem instituições
+      - dentro da categoria, o termo mais longo vence
+      - termos com mais de MAX_PALAVRAS_TERMO palavras ou só com palavras
+        de até 2 letras nunca casam
+    """
+
+    def __init__(self, termos_por_categoria: dict):
+        self._goto = [{}]       # estado → {palavra: próximo estado}
+        self._falha = [0]
+        self._saidas = [[]]     # estado → [(tamanho, prioridade_categoria, categoria, termo)]
+
+        for prioridade, categoria in enumerate(CATEGORIAS):
+            for termo in termos_por_categoria.get(categoria, {}):
+                palavras = termo.split('_')
+                if len(palavras) > MAX_PALAVRAS_TERMO or not any(len(p) > 2 for p in palavras):
+                    continue
+                self._inserir(palavras, (len(palavras), prioridade, categoria, termo))
+        self._construir_falhas()
+
+    def _inserir(self, palavras: list, saida: tuple):
+        estado = 0
+        for palavra in palavras:
+            proximo = self._goto[estado].get(palavra)
+            if proximo is None:
+                proximo = len(self._goto)
+                self._goto[estado][palavra] = proximo
+                self._goto.append({})
+                self._falha.append(0)
+                self._saidas.append([])
+            estado = proximo
+        self._saidas[estado].append(saida)
+
+    def _construir_falhas(self):
+        from collections import deque
+        fila = deque(self._goto[0].values())
+        while fila:
+            estado = fila.popleft()
+            for palavra, proximo in self._goto[estado].items():
+                fila.append(proximo)
+                f = self._falha[estado]
+                while f and palavra not in self._goto[f]:
+                    f = self._falha[f]
+                destino = self._goto[f].get(palavra, 0)
+                self._falha[proximo] = destino if destino != proximo else 0
+                self._saidas[proximo].extend(self._saidas[self._falha[proximo]])
+
+    def encontrar_todas(self, palavras: list) -> list[tuple]:
+        """Todas as menções: [(posição, tamanho, categoria, termo)] em uma passada."""
+        encontradas = []
+        estado = 0
+        goto, falha, saidas = self._goto, self._falha, self._saidas
+        for i, palavra in enumerate(palavras):
+            while estado and palavra not in goto[estado]:
+                estado = falha[estado]
+            estado = goto[estado].get(palavra, 0)
+            for tamanho, _, categoria, termo in saidas[estado]:
+                encontradas.append((i - tamanho + 1, tamanho, categoria, termo))
+        return encontradas
+
+    def melhor(self, palavras: list) -> tuple | None:
+        """(posição, categoria, termo) da menção escolhida pelas regras, ou None."""
+        melhor_chave = None
+        melhor = None
+        estado = 0
+        goto, falha, saidas = self._goto, self._falha, self._saidas
+        for i, palavra in enumerate(palavras):
+            while estado and palavra not in goto[estado]:
+                estado = falha[estado]
+            estado = goto[estado].get(palavra, 0)
+            for tamanho, prioridade, categoria, termo in saidas[estado]:
+                chave = (i - tamanho + 1, prioridade, -tamanho)
+                if melhor_chave is None or chave < melhor_chave:
+                    melhor_chave = chave
+                    melhor = (chave[0], categoria, termo)
+        return melhor
+
+
+class IndiceAssets:
+    """Mapa termo normalizado → lista de imagens, por categoria."""
+
+    def __init__(self, assets_dir: str, categorias: dict, genericas: list, mtimes: dict):
+        self.assets_dir = assets_dir
+        self.categorias = categorias    # {'politicos': {termo: [imgs]}, 'instituicoes': {...}}
+        self.genericas = genericas
+        self.mtimes = mtimes            # {pasta: mtime} usado para validar o snapshot
+
+    @property
+    def politicos(self) -> dict:
+        return self.categorias.get('politicos', {})
+
+    @property
+    def instituicoes(self) -> dict:
+        return self.categorias.get('instituicoes', {})
+
+    def imagens(self, categoria: str, termo: str) -> list:
+        return self.categorias.get(categoria, {}).get(termo, [])
+
+    @property
+    def casador(self) -> CasadorEntidades:
+        """Autômato compilado sob demanda a partir dos termos do índice."""
+        if getattr(self, '_casador', None) is None:
+            self._casador = CasadorEntidades(self.categorias)
+        return self._casador
+
+    # ── Construção ──────────────────────────────────────────────────────────
+
+    @classmethod
+    def construir(cls, assets_dir: str = 'assets') -> 'IndiceAssets':
+        categorias = {}
+        mtimes = {}
+
+        for categoria in CATEGORIAS:
+            base = os.path.join(assets_dir, categoria)
+            termos = {}
+            if os.path.isdir(base):
+                mtimes[base] = os.stat(base).st_mtime
+                for nome in os.listdir(base):
+                    pasta = os.path.join(base, nome)
+                    if not os.path.isdir(pasta):
+                        continue
+                    mtimes[pasta] = os.stat(pasta).st_mtime
+                    imagens = _imagens_da_pasta(pasta)
+                    if imagens:
+                        # Pastas que normalizam igual ("Lula" e "lula") somam as fotos
+                        termos.setdefault(normalizar(nome), []).extend(imagens)
+            categorias[categoria] = termos
+
+        pasta_genericas = os.path.join(assets_dir, 'genericas')
+        genericas = []
+        if os.path.isdir(pasta_genericas):
+            mtimes[pasta_genericas] = os.stat(pasta_genericas).st_mtime
+            genericas = _imagens_da_pasta(pasta_genericas)
+
+        return cls(assets_dir, categorias, genericas, mtimes)
+
+    # ── Snapshot ────────────────────────────────────────────────────────────
+
+    def salvar(self, caminho: str = SNAPSHOT_FILE):
+        os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+        tmp = f'{caminho}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                'assets_dir': self.assets_dir,
+                'categorias': self.categorias,
+                'genericas': self.genericas,
+                'mtimes': self.mtimes,
+            }, f, ensure_ascii=False)
+        os.replace(tmp, caminho)
+
+    @classmethod
+    def carregar(cls, caminho: str = SNAPSHOT_FILE) -> 'IndiceAssets | None':
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            return cls(dados['assets_dir'], dados['categorias'],
+                       dados['genericas'], dados['mtimes'])
+        except Exception:
+            return None
+
+    def valido(self) -> bool:
+        """True se nenhuma pasta indexada mudou (nem surgiu pasta nova nas categorias)."""
+        try:
+            for pasta, mtime in self.mtimes.items():
+                if os.stat(pasta).st_mtime != mtime:
+                    return False
+            return True
+        except OSError:
+            return False
+
+
+def obter_indice(assets_dir: str = 'assets') -> IndiceAssets:
+    """Índice do processo: memória → snapshot válido → reconstrução."""
+    indice = _indices.get(assets_dir)
+    if indice is not None:
+        return indice
+
+    indice = IndiceAssets.carregar()
+    if indice is None or indice.assets_dir != assets_dir or not indice.valido():
+        indice = IndiceAssets.construir(assets_dir)
+        try:
+            indice.salvar()
+        except Exception as e:
+            print(f"  ⚠️ Snapshot do índice de assets não salvo: {e}")
+
+    _indices[assets_dir] = indice
+    return indice
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ════════════════════════════════════════════════════════════════════════════
+
+def _melhor_por_ngramas(palavras: list, categorias: dict) -> tuple | None:
+    """Algoritmo anterior ao autômato (janelas de 1 a 5 palavras), só para comparação."""
+    def encontrar_match(termos):
+        n = len(palavras)
+        melhor = None
+        for tamanho in range(min(n, MAX_PALAVRAS_TERMO), 0, -1):
+            for inicio in range(n - tamanho + 1):
+                trecho = palavras[inicio:inicio + tamanho]
+                if not any(len(p) > 2 for p in trecho):
+                    continue
+                termo = '_'.join(trecho)
+                if termo in termos:
+                    if (melhor is None or inicio < melhor[0]
+                            or (inicio == melhor[0] and tamanho > melhor[2])):
+                        melhor = (inicio, termo, tamanho)
+        return melhor
+
+    match_pol = encontrar_match(categorias.get('politicos', {}))
+    match_inst = encontrar_match(categorias.get('instituicoes', {}))
+    if match_pol and (not match_inst or match_pol[0] <= match_inst[0]):
+        return (match_pol[0], 'politicos', match_pol[1])
+    if match_inst:
+        return (match_inst[0], 'instituicoes', match_inst[1])
+    return None
+
+
+def benchmark(log_file: str = 'videos_gerados.json', repeticoes: int = 200):
+    import time
+
+    with open(log_file, 'r', encoding='utf-8') as f:
+        logs = json.load(f)
+    titulos = [item.get('tema') or item.get('titulo', '') for item in logs]
+    frases = [normalizar(t).split() for t in titulos]
+
+    indice = IndiceAssets.construir()
+    casador = indice.casador
+
+    divergencias = [
+        titulos[i] for i, palavras in enumerate(frases)
+        if casador.melhor(palavras) != _melhor_por_ngramas(palavras, indice.categorias)
+    ]
+
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for palavras in frases:
+            _melhor_por_ngramas(palavras, indice.categorias)
+    t_ngramas = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for palavras in frases:
+            casador.melhor(palavras)
+    t_automato = time.perf_counter() - inicio
+
+    total = len(frases) * repeticoes
+    com_match = sum(1 for p in frases if casador.melhor(p))
+    print(f"📊 {len(frases)} títulos × {repeticoes} repetições ({com_match} com entidade)")
+    print(f"   n-gramas : {t_ngramas * 1e6 / total:8.1f} µs/título")
+    print(f"   autômato : {t_automato * 1e6 / total:8.1f} µs/título "
+          f"({t_ngramas / max(t_automato, 1e-9):.1f}x)")
+    print(f"   divergências: {len(divergencias)}")
+    for titulo in divergencias[:10]:
+        print(f"     • {titulo}")
+
+
+if __name__ == '__main__':
+    import sys
+
+    if '--benchmark' in sys.argv:
+        benchmark()
+    else:
+        indice = obter_indice()
+        print(f"✅ Índice: {len(indice.politicos)} políticos, "
+              f"{len(indice.instituicoes)} instituições, {len(indice.genericas)} genéricas")
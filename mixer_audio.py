@@ -0,0 +1,275 @@
+"""
+mixer_audio.py
+--------------
+Pré-mixagem da trilha final (narração + música de fundo) em NumPy.
+
+Substitui o CompositeAudioClip do MoviePy, que repetia a música com
+concatenate_audioclips e avaliava a mistura em Python, pedaço por pedaço,
+durante o encode do vídeo. Aqui:
+  • a música é decodificada UMA vez para um buffer int16 (n, 2)
+  • a narração é lida em blocos de um pipe do ffmpeg (float32), sem carregar
+    o arquivo inteiro na memória
+  • a música é repetida por indexação em módulo (posição % tamanho) — nenhuma
+    cópia da faixa é materializada
+  • volume e, opcionalmente, um envelope de ganho (ducking) são aplicados
+    por bloco, e o resultado vai direto para o encoder AAC
+
+O vídeo só precisa multiplexar o .m4a pronto (MoviePy: write_videofile(audio=...);
+renderizador: -c:a copy).
+
+Ducking (envelope_ducking): a música abaixa enquanto há fala e volta a subir
+nas pausas. O envelope é todo vetorizado em NumPy:
+  • RMS da narração (mono, 16 kHz) em janelas de 20 ms com passo de 10 ms,
+    via sliding_window_view (sem cópia)
+  • dB → presença de fala em [0, 1] (rampa de DUCKING_FAIXA_DB acima do limiar)
+  • release: seguidor de pico com decaimento exponencial, calculado como
+    maximum.accumulate no domínio logarítmico
+  • attack: o mesmo seguidor aplicado de trás para frente — o áudio está todo
+    disponível, então a música começa a baixar ANTES da primeira sílaba
+Benchmark (trilha de 10 min, contra o CompositeAudioClip antigo):
+  python mixer_audio.py --benchmark
+
+Variáveis de ambiente:
+  DUCKING  → 0 desliga o ducking e usa volume fixo (padrão: 1)
+"""
+
+import os
+import time
+import subprocess
+
+import numpy as np
+
+from renderizador import ffmpeg_exe
+
+TAXA = 44100
+CANAIS = 2
+SEGUNDOS_POR_BLOCO = 5
+
+DUCKING = os.environ.get('DUCKING', '1') != '0'
+DUCKING_REDUCAO = 0.5         # ganho da música sob a fala (relativo ao volume das pausas)
+DUCKING_LIMIAR_DB = -40.0     # RMS abaixo disso é silêncio
+DUCKING_FAIXA_DB = 10.0       # rampa limiar → fala plena
+DUCKING_ATAQUE_MS = 80
+DUCKING_LIBERACAO_MS = 500
+TAXA_ENVELOPE = 100           # ganhos por segundo (passo de 10 ms)
+TAXA_ANALISE = 16000
+
+
+def decodificar_pcm(caminho: str, taxa: int = TAXA, canais: int = CANAIS) -> np.ndarray:
+    """Arquivo de áudio inteiro como int16 (amostras, canais)."""
+    proc = subprocess.run(
+        [ffmpeg_exe(), '-v', 'error', '-i', caminho,
+         '-f', 's16le', '-ac', str(canais), '-ar', str(taxa), '-'],
+        capture_output=True, check=True
+    )
+    return np.frombuffer(proc.stdout, dtype=np.int16).reshape(-1, canais)
+
+
+def _seguidor_de_pico(x: np.ndarray, constante_s: float, taxa: float) -> np.ndarray:
+    """
+    y[t] = max_k<=t x[k] * r^(t-k), r = exp(-1/(constante_s*taxa)).
+    Em log: log y[t] = t·log r + max_k<=t (log x[k] - k·log r) — um único
+    maximum.accumulate, sem laço em Python.
+    """
+    log_r = -1.0 / (constante_s * taxa)
+    t = np.arange(len(x), dtype=np.float64)
+    log_x = np.log(np.maximum(x, 1e-6))
+    return np.exp(t * log_r + np.maximum.accumulate(log_x - t * log_r))
+
+
+def envelope_de_pcm(mono: np.ndarray, taxa: int = TAXA_ANALISE,
+                    reducao: float = DUCKING_REDUCAO) -> tuple[np.ndarray, float]:
+    """Envelope de ducking (ganhos, TAXA_ENVELOPE) a partir da narração mono float32."""
+    passo = taxa // TAXA_ENVELOPE
+    janela = 2 * passo
+    if len(mono) < janela:
+        return np.ones(1, dtype=np.float32), float(TAXA_ENVELOPE)
+
+    janelas = np.lib.stride_tricks.sliding_window_view(mono, janela)[::passo]
+    rms = np.sqrt(np.einsum('ij,ij->i', janelas, janelas) / janela)
+    db = 20 * np.log10(np.maximum(rms, 1e-6))
+    fala = np.clip((db - DUCKING_LIMIAR_DB) / DUCKING_FAIXA_DB, 0.0, 1.0)
+
+    liberacao = _seguidor_de_pico(fala, DUCKING_LIBERACAO_MS / 1000, TAXA_ENVELOPE)
+    ataque = _seguidor_de_pico(fala[::-1], DUCKING_ATAQUE_MS / 1000, TAXA_ENVELOPE)[::-1]
+    presenca = np.maximum(liberacao, ataque)
+
+    ganhos = 1.0 - (1.0 - reducao) * presenca
+    return ganhos.astype(np.float32), float(TAXA_ENVELOPE)
+
+
+def envelope_ducking(narracao_path: str) -> tuple[np.ndarray, float] | None:
+    """Envelope de ducking da narração, ou None se desligado/indisponível."""
+    if not DUCKING:
+        return None
+    try:
+        mono = decodificar_pcm(narracao_path, TAXA_ANALISE, 1)[:, 0].astype(np.float32) / 32768.0
+        return envelope_de_pcm(mono)
+    except Exception as e:
+        print(f"  ⚠️ Ducking indisponível ({e}) — volume fixo")
+        return None
+
+
+def _ganho_do_envelope(envelope: tuple[np.ndarray, float] | None,
+                       inicio: int, fim: int, taxa: int) -> np.ndarray | float:
+    """Ganho por amostra de [inicio, fim) interpolado do envelope (ganhos, taxa_ganhos)."""
+    if envelope is None:
+        return 1.0
+    ganhos, taxa_ganhos = envelope
+    posicoes = np.arange(inicio, fim) * (taxa_ganhos / taxa)
+    return np.interp(posicoes, np.arange(len(ganhos)), ganhos).astype(np.float32)[:, None]
+
+
+def pre_mixar(narracao_path: str, musica_path: str | None, destino: str,
+              duracao_total: float, volume: float = 0.06,
+              envelope: tuple[np.ndarray, float] | None = None,
+              taxa: int = TAXA) -> str | None:
+    """
+    Grava em destino (.m4a, AAC 192k) a narração somada à música em loop.
+    envelope: (ganhos, taxa_ganhos) multiplicando o volume da música ao longo
+    do tempo (ex.: ducking); None mantém o volume fixo.
+    Retorna destino, ou None em caso de erro.
+    """
+    inicio_mix = time.time()
+    total = int(round(duracao_total * taxa))
+    bloco = SEGUNDOS_POR_BLOCO * taxa
+
+    musica = None
+    if musica_path:
+        try:
+            musica = decodificar_pcm(musica_path, taxa)
+            if len(musica) == 0:
+                musica = None
+        except Exception as e:
+            print(f"  ⚠️ Música não decodificada ({e}) — só narração")
+
+    leitor = subprocess.Popen(
+        [ffmpeg_exe(), '-v', 'error', '-i', narracao_path,
+         '-f', 'f32le', '-ac', str(CANAIS), '-ar', str(taxa), '-'],
+        stdout=subprocess.PIPE
+    )
+    encoder = subprocess.Popen(
+        [ffmpeg_exe(), '-y', '-v', 'error',
+         '-f', 'f32le', '-ac', str(CANAIS), '-ar', str(taxa), '-i', '-',
+         '-c:a', 'aac', '-b:a', '192k', destino],
+        stdin=subprocess.PIPE
+    )
+
+    try:
+        for inicio in range(0, total, bloco):
+            fim = min(inicio + bloco, total)
+            n = fim - inicio
+
+            dados = leitor.stdout.read(n * CANAIS * 4)
+            saida = np.zeros((n, CANAIS), dtype=np.float32)
+            lidos = np.frombuffer(dados, dtype=np.float32)
+            lidos = lidos[:len(lidos) - len(lidos) % CANAIS].reshape(-1, CANAIS)
+            saida[:len(lidos)] = lidos
+
+            if musica is not None:
+                indices = np.arange(inicio, fim) % len(musica)
+                trecho = musica[indices].astype(np.float32) * (volume / 32768.0)
+                saida += trecho * _ganho_do_envelope(envelope, inicio, fim, taxa)
+
+            np.clip(saida, -1.0, 1.0, out=saida)
+            encoder.stdin.write(saida.tobytes())
+
+        encoder.stdin.close()
+        if encoder.wait() != 0:
+            raise RuntimeError(f"encoder AAC saiu com código {encoder.returncode}")
+    except Exception as e:
+        print(f"  ❌ Pré-mixagem falhou: {e}")
+        encoder.kill()
+        if os.path.exists(destino):
+            os.remove(destino)
+        return None
+    finally:
+        leitor.stdout.close()
+        leitor.kill()
+        leitor.wait()
+
+    print(f"  🎚️ Áudio pré-mixado em {time.time() - inicio_mix:.2f}s "
+          f"({duracao_total:.0f}s de trilha)")
+    return destino
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ════════════════════════════════════════════════════════════════════════════
+
+def _gravar_fixture(caminho: str, pcm: np.ndarray, taxa: int):
+    """Grava PCM float32 (n, canais) como MP3 via ffmpeg."""
+    subprocess.run(
+        [ffmpeg_exe(), '-y', '-v', 'error', '-f', 'f32le', '-ac', str(pcm.shape[1]),
+         '-ar', str(taxa), '-i', '-', '-b:a', '64k', caminho],
+        input=pcm.astype(np.float32).tobytes(), check=True
+    )
+
+
+def benchmark(segundos: int = 600):
+    import tempfile
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as pasta:
+        # "Fala": rajadas de ruído de 2-4s separadas por pausas de 0.3-1s
+        taxa_voz = 24000
+        voz = np.zeros(segundos * taxa_voz, dtype=np.float32)
+        t = 0
+        while t < len(voz):
+            dur = int(rng.uniform(2, 4) * taxa_voz)
+            voz[t:t + dur] = rng.normal(0, 0.2, min(dur, len(voz) - t))
+            t += dur + int(rng.uniform(0.3, 1.0) * taxa_voz)
+        narracao = os.path.join(pasta, 'narracao.mp3')
+        _gravar_fixture(narracao, voz[:, None], taxa_voz)
+
+        tt = np.arange(120 * TAXA) / TAXA
+        tom = (0.3 * np.sin(2 * np.pi * 220 * tt)).astype(np.float32)
+        musica = os.path.join(pasta, 'musica.mp3')
+        _gravar_fixture(musica, np.stack([tom, tom], axis=1), TAXA)
+
+        print(f"📊 Trilha de {segundos // 60} min, música de 2 min em loop")
+
+        mono = decodificar_pcm(narracao, TAXA_ANALISE, 1)[:, 0].astype(np.float32) / 32768.0
+        inicio = time.perf_counter()
+        ganhos, _ = envelope_de_pcm(mono)
+        t_env = time.perf_counter() - inicio
+        print(f"   Envelope (RMS + attack/release): {t_env * 1000:.0f}ms "
+              f"para {len(ganhos)} janelas — ganho médio {ganhos.mean():.2f}")
+
+        inicio = time.perf_counter()
+        envelope = envelope_ducking(narracao)
+        t_env_total = time.perf_counter() - inicio
+        print(f"   Envelope incl. decodificação: {t_env_total:.2f}s")
+
+        inicio = time.perf_counter()
+        pre_mixar(narracao, musica, os.path.join(pasta, 'fixo.m4a'), segundos)
+        t_fixo = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        pre_mixar(narracao, musica, os.path.join(pasta, 'duck.m4a'), segundos, 0.10, envelope)
+        t_duck = time.perf_counter() - inicio
+        print(f"   pre_mixar volume fixo: {t_fixo:.2f}s | com ducking: {t_duck:.2f}s")
+
+        try:
+            from moviepy.editor import AudioFileClip, CompositeAudioClip, concatenate_audioclips
+        except ImportError:
+            print("   (MoviePy indisponível — comparação com CompositeAudioClip pulada)")
+            return
+        inicio = time.perf_counter()
+        narr = AudioFileClip(narracao)
+        mus = AudioFileClip(musica)
+        mus = concatenate_audioclips([mus] * int(np.ceil(segundos / mus.duration)))
+        mix = CompositeAudioClip([narr, mus.subclip(0, segundos).volumex(0.06)])
+        mix.write_audiofile(os.path.join(pasta, 'moviepy.m4a'), fps=TAXA,
+                            codec='aac', logger=None)
+        t_moviepy = time.perf_counter() - inicio
+        narr.close()
+        print(f"   CompositeAudioClip (MoviePy): {t_moviepy:.2f}s")
+        print(f"   ➜ ducking acrescenta {t_env_total + t_duck - t_fixo:.2f}s; "
+              f"pré-mix com ducking é {t_moviepy / (t_env_total + t_duck):.1f}x mais rápido que o MoviePy")
+
+
+if __name__ == '__main__':
+    import sys
+
+    if '--benchmark' in sys.argv:
+        benchmark()
@@ -0,0 +1,333 @@
+"""
+narracao.py
+-----------
+Síntese da narração com Edge TTS e cache em disco do áudio gerado.
+
+O cache é endereçado pelo conteúdo: a chave é o SHA-256 de
+(texto normalizado, voz, rate, pitch, motor), então qualquer mudança de voz
+no config.json ou de versão do edge-tts gera áudio novo. Cada entrada guarda:
+  .cache/tts/<chave>.mp3   → o áudio
+  .cache/tts/<chave>.json  → {'duracao': segundos, 'palavras', 'voz', 'motor', 'criado_em'}
+
+Num acerto, o MP3 é copiado para o destino e a duração sai do .json — sem
+chamar o Edge TTS e sem abrir o arquivo com AudioFileClip só para medi-lo.
+
+O áudio é recebido em streaming e gravado em disco à medida que chega; os
+eventos WordBoundary do mesmo stream viram uma LinhaDoTempoPalavras (início e
+duração de cada palavra falada, em arrays compactos).
+
+Roteiros inteiros são sintetizados frase a frase (sintetizar_roteiro): as
+frases são cortadas nas mesmas fronteiras de analisar_roteiro_e_buscar_midias
+(pontuação final seguida de espaço), vão ao Edge TTS em paralelo (até
+TTS_CONCORRENCIA por vez) e os MP3 são emendados com o concat do ffmpeg sem
+recodificar. Como cada frase tem duração medida, o início de cada uma no
+áudio final é exato; somando o offset da primeira palavra, sabe-se também o
+instante em que a fala da frase realmente começa (inicio_fala) — e cada
+frase entra no cache individualmente.
+
+Variáveis de ambiente:
+  CACHE_DIR         → raiz dos caches (padrão: .cache)
+  TTS_CACHE_MAX_MB  → limite do cache; os áudios menos usados saem primeiro (padrão: 500)
+  TTS_CONCORRENCIA  → frases sintetizadas ao mesmo tempo (padrão: 4)
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import asyncio
+import hashlib
+import subprocess
+from array import array
+
+import edge_tts
+
+from renderizador import ffmpeg_exe
+
+CACHE_DIR = os.environ.get('CACHE_DIR', '.cache')
+CACHE_TTS_DIR = os.path.join(CACHE_DIR, 'tts')
+TTS_CACHE_MAX_MB = int(os.environ.get('TTS_CACHE_MAX_MB', '500'))
+TTS_CONCORRENCIA = int(os.environ.get('TTS_CONCORRENCIA', '4'))
+MOTOR = f"edge-tts {getattr(edge_tts, '__version__', '')}".strip()
+TICKS_POR_SEGUNDO = 10_000_000  # offsets do Edge TTS vêm em unidades de 100ns
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# LINHA DO TEMPO DE PALAVRAS
+# ════════════════════════════════════════════════════════════════════════════
+
+class LinhaDoTempoPalavras:
+    """Início/duração (s) de cada palavra falada, em arrays de double."""
+
+    def __init__(self):
+        self.inicios = array('d')
+        self.duracoes = array('d')
+        self.textos = []
+
+    def __len__(self):
+        return len(self.textos)
+
+    def adicionar(self, inicio: float, duracao: float, texto: str):
+        self.inicios.append(inicio)
+        self.duracoes.append(duracao)
+        self.textos.append(texto)
+
+    def estender(self, outra: 'LinhaDoTempoPalavras', deslocamento: float = 0.0):
+        """Anexa as palavras de outra linha do tempo, deslocadas no tempo."""
+        self.inicios.extend(t + deslocamento for t in outra.inicios)
+        self.duracoes.extend(outra.duracoes)
+        self.textos.extend(outra.textos)
+
+    def para_lista(self) -> list:
+        return [[round(i, 4), round(d, 4), t]
+                for i, d, t in zip(self.inicios, self.duracoes, self.textos)]
+
+    @classmethod
+    def de_lista(cls, itens: list) -> 'LinhaDoTempoPalavras':
+        linha = cls()
+        for inicio, duracao, texto in itens:
+            linha.adicionar(inicio, duracao, texto)
+        return linha
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# CACHE
+# ════════════════════════════════════════════════════════════════════════════
+
+def normalizar_texto(texto: str) -> str:
+    """Espaços colapsados — quebras de linha e recuos não mudam a fala."""
+    return ' '.join(texto.split())
+
+
+def chave_audio(texto: str, voz: str, rate: str = '+0%', pitch: str = '+0Hz',
+                motor: str = MOTOR) -> str:
+    conteudo = json.dumps([normalizar_texto(texto), voz, rate, pitch, motor],
+                          ensure_ascii=False)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+def duracao_audio(caminho: str) -> float | None:
+    """Duração lida do cabeçalho pelo ffmpeg (sem decodificar o arquivo)."""
+    try:
+        proc = subprocess.run([ffmpeg_exe(), '-hide_banner', '-i', caminho],
+                              capture_output=True, text=True, timeout=30)
+        m = re.search(r'Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)', proc.stderr)
+        if not m:
+            return None
+        h, mnt, s = m.groups()
+        return int(h) * 3600 + int(mnt) * 60 + float(s)
+    except Exception:
+        return None
+
+
+def obter_do_cache(chave: str, destino: str) -> dict | None:
+    """Copia o áudio em cache para destino e devolve {'duracao', 'palavras'}, ou None."""
+    mp3 = os.path.join(CACHE_TTS_DIR, f'{chave}.mp3')
+    meta = os.path.join(CACHE_TTS_DIR, f'{chave}.json')
+    try:
+        with open(meta, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        resultado = {
+            'duracao': dados['duracao'],
+            'palavras': LinhaDoTempoPalavras.de_lista(dados['palavras'])
+        }
+        shutil.copyfile(mp3, destino)
+        os.utime(mp3)  # marca como usado recentemente (poda LRU)
+        return resultado
+    except Exception:
+        return None
+
+
+def guardar_no_cache(chave: str, origem: str, duracao: float,
+                     palavras: LinhaDoTempoPalavras, voz: str):
+    try:
+        os.makedirs(CACHE_TTS_DIR, exist_ok=True)
+        mp3 = os.path.join(CACHE_TTS_DIR, f'{chave}.mp3')
+        tmp = f'{mp3}.{os.getpid()}.tmp'
+        shutil.copyfile(origem, tmp)
+        os.replace(tmp, mp3)
+        with open(os.path.join(CACHE_TTS_DIR, f'{chave}.json'), 'w', encoding='utf-8') as f:
+            json.dump({'duracao': duracao, 'palavras': palavras.para_lista(),
+                       'voz': voz, 'motor': MOTOR, 'criado_em': time.time()},
+                      f, ensure_ascii=False)
+    except Exception as e:
+        print(f"   ⚠️ Cache TTS: áudio não salvo ({e})")
+
+
+def podar_cache(max_mb: int = TTS_CACHE_MAX_MB) -> int:
+    """Remove os áudios menos usados até o cache caber em max_mb. Retorna nº removido."""
+    if not os.path.isdir(CACHE_TTS_DIR):
+        return 0
+    arquivos = []
+    for nome in os.listdir(CACHE_TTS_DIR):
+        if nome.endswith('.mp3'):
+            caminho = os.path.join(CACHE_TTS_DIR, nome)
+            st = os.stat(caminho)
+            arquivos.append((st.st_mtime, st.st_size, caminho))
+
+    total = sum(a[1] for a in arquivos)
+    limite = max_mb * 1024 * 1024
+    removidos = 0
+    for _, tamanho, caminho in sorted(arquivos):
+        if total <= limite:
+            break
+        for arquivo in (caminho, caminho[:-4] + '.json'):
+            try:
+                os.remove(arquivo)
+            except OSError:
+                pass
+        total -= tamanho
+        removidos += 1
+    if removidos:
+        print(f"  🧹 Cache TTS: {removidos} áudios antigos removidos")
+    return removidos
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# SÍNTESE
+# ════════════════════════════════════════════════════════════════════════════
+
+async def _transmitir(communicate, destino: str) -> LinhaDoTempoPalavras:
+    """Grava os chunks de áudio em destino enquanto coleta os WordBoundary."""
+    palavras = LinhaDoTempoPalavras()
+    with open(destino, 'wb') as f:
+        async for chunk in communicate.stream():
+            if chunk['type'] == 'audio':
+                f.write(chunk['data'])
+            elif chunk['type'] == 'WordBoundary':
+                palavras.adicionar(chunk['offset'] / TICKS_POR_SEGUNDO,
+                                   chunk['duration'] / TICKS_POR_SEGUNDO,
+                                   chunk['text'])
+    return palavras
+
+
+async def sintetizar_async(texto: str, destino: str, voz: str,
+                           rate: str = '+0%', pitch: str = '+0Hz',
+                           tentativas: int = 3, timeout: float = 120) -> dict | None:
+    """
+    Gera destino (MP3) com o Edge TTS.
+    Retorna {'duracao': segundos, 'palavras': LinhaDoTempoPalavras}, ou None
+    se o ffmpeg não conseguir medir a duração.
+    Usa o cache quando possível. Levanta exceção se todas as tentativas falharem.
+    """
+    chave = chave_audio(texto, voz, rate, pitch)
+    resultado = obter_do_cache(chave, destino)
+    if resultado is not None:
+        return resultado
+
+    for tentativa in range(tentativas):
+        try:
+            communicate = edge_tts.Communicate(texto, voz, rate=rate, pitch=pitch,
+                                               boundary='WordBoundary')
+            palavras = await asyncio.wait_for(_transmitir(communicate, destino),
+                                              timeout=timeout)
+            break
+        except asyncio.TimeoutError:
+            print(f"⏱️ Timeout {tentativa + 1}")
+        except Exception as e:
+            print(f"⚠️ Erro {tentativa + 1}: {e}")
+        if tentativa < tentativas - 1:
+            await asyncio.sleep(10)
+    else:
+        raise Exception("Edge TTS falhou")
+
+    duracao = duracao_audio(destino)
+    if not duracao:
+        return None
+    guardar_no_cache(chave, destino, duracao, palavras, voz)
+    return {'duracao': duracao, 'palavras': palavras}
+
+
+def sintetizar(texto: str, destino: str, voz: str,
+               rate: str = '+0%', pitch: str = '+0Hz') -> dict | None:
+    """Versão síncrona de sintetizar_async."""
+    return asyncio.run(sintetizar_async(texto, destino, voz, rate, pitch))
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# ROTEIRO FRASE A FRASE
+# ════════════════════════════════════════════════════════════════════════════
+
+def dividir_frases(roteiro: str) -> list[str]:
+    """
+    Frases nas mesmas fronteiras de re.split(r'[.!?]\\s+', roteiro), mas
+    mantendo a pontuação (a entonação do TTS depende dela). A lista tem o
+    mesmo tamanho e a mesma ordem daquele split.
+    """
+    return re.split(r'(?<=[.!?])\s+', roteiro)
+
+
+def concatenar_mp3(partes: list[str], destino: str):
+    """Emenda MP3s de mesmo formato sem recodificar (concat demuxer, -c copy)."""
+    lista = f'{destino}.concat.txt'
+    with open(lista, 'w', encoding='utf-8') as f:
+        for parte in partes:
+            caminho = os.path.abspath(parte).replace("'", "'\\''")
+            f.write(f"file '{caminho}'\n")
+    try:
+        subprocess.run(
+            [ffmpeg_exe(), '-y', '-hide_banner', '-loglevel', 'error',
+             '-f', 'concat', '-safe', '0', '-i', lista, '-c', 'copy', destino],
+            check=True, capture_output=True
+        )
+    finally:
+        os.remove(lista)
+
+
+async def sintetizar_roteiro_async(roteiro: str, destino: str, voz: str,
+                                   rate: str = '+0%', pitch: str = '+0Hz',
+                                   max_concorrencia: int = TTS_CONCORRENCIA) -> dict:
+    """
+    Sintetiza o roteiro frase a frase em paralelo e grava o MP3 final em destino.
+    Retorna {'duracao': total,
+             'frases': [{'texto', 'inicio', 'duracao', 'inicio_fala'}, ...],
+             'palavras': LinhaDoTempoPalavras no tempo do áudio final}
+    com uma entrada por frase de dividir_frases (frases sem fala têm duração 0).
+    Levanta exceção se alguma frase falhar.
+    """
+    frases = dividir_frases(roteiro)
+    semaforo = asyncio.Semaphore(max(1, max_concorrencia))
+    partes = [f'{destino}.frase{i:03d}.mp3' for i in range(len(frases))]
+    falantes = [i for i, f in enumerate(frases) if re.search(r'\w', f)]
+
+    async def _frase(i):
+        async with semaforo:
+            resultado = await sintetizar_async(frases[i].strip(), partes[i], voz, rate, pitch)
+        if resultado is None:
+            raise Exception(f"duração da frase {i + 1} não pôde ser medida")
+        return resultado
+
+    inicio = time.time()
+    try:
+        resultados = await asyncio.gather(*(_frase(i) for i in falantes))
+        concatenar_mp3([partes[i] for i in falantes], destino)
+    finally:
+        for parte in partes:
+            if os.path.exists(parte):
+                os.remove(parte)
+
+    por_frase = dict(zip(falantes, resultados))
+    tempos = []
+    palavras = LinhaDoTempoPalavras()
+    tempo_atual = 0.0
+    for i, frase in enumerate(frases):
+        resultado = por_frase.get(i)
+        duracao = resultado['duracao'] if resultado else 0.0
+        inicio_fala = tempo_atual
+        if resultado and len(resultado['palavras']):
+            inicio_fala += resultado['palavras'].inicios[0]
+            palavras.estender(resultado['palavras'], tempo_atual)
+        tempos.append({'texto': frase.strip(), 'inicio': tempo_atual,
+                       'duracao': duracao, 'inicio_fala': inicio_fala})
+        tempo_atual += duracao
+
+    print(f"✅ Edge TTS: {len(falantes)} frases, {len(palavras)} palavras em "
+          f"{time.time() - inicio:.1f}s (até {max_concorrencia} em paralelo)")
+    return {'duracao': tempo_atual, 'frases': tempos, 'palavras': palavras}
+
+
+def sintetizar_roteiro(roteiro: str, destino: str, voz: str,
+                       rate: str = '+0%', pitch: str = '+0Hz') -> dict:
+    """Versão síncrona de sintetizar_roteiro_async."""
+    return asyncio.run(sintetizar_roteiro_async(roteiro, destino, voz, rate, pitch))
@@ -0,0 +1,172 @@
+"""
+noticias_vistas.py
+------------------
+Registro persistente das notícias já publicadas, para que o job de shorts
+(a cada 3h) não volte a cobrir uma história de horas atrás.
+
+Cada notícia publicada gera até três chaves numa tabela SQLite
+(.cache/noticias_vistas.sqlite3):
+  t:<sha1>  → título normalizado (minúsculas, sem acentos/pontuação)
+  l:<sha1>  → link sem query string/fragmento
+  a:<sha1>  → assinatura: conjunto ordenado das palavras significativas
+              do título (pega a mesma manchete com palavras reordenadas)
+
+A consulta em buscar_noticias é um lookup pela chave primária por entrada.
+Registros mais antigos que o TTL são apagados ao abrir o banco, então o
+arquivo fica pequeno mesmo com o histórico do canal crescendo. Se o banco
+não existir (cache do Actions expirado), ele é semeado a partir do
+videos_gerados.json.
+
+Variáveis de ambiente:
+  CACHE_DIR                 → raiz dos caches (padrão: .cache)
+  NOTICIAS_VISTAS_TTL_DIAS  → por quantos dias uma notícia conta como vista (padrão: 30)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from indice_assets import normalizar
+
+CACHE_DIR = os.environ.get('CACHE_DIR', '.cache')
+NOTICIAS_VISTAS_DB = os.path.join(CACHE_DIR, 'noticias_vistas.sqlite3')
+NOTICIAS_VISTAS_TTL_DIAS = float(os.environ.get('NOTICIAS_VISTAS_TTL_DIAS', '30'))
+LOG_FILE = 'videos_gerados.json'
+
+STOPWORDS = {
+    'para', 'pela', 'pelo', 'pelas', 'pelos', 'como', 'mais', 'sobre', 'apos',
+    'entre', 'contra', 'sera', 'seus', 'suas', 'esta', 'este', 'isso', 'diz',
+    'afirma', 'shorts', 'ainda', 'onde', 'quando', 'qual', 'quem', 'novo', 'nova'
+}
+MIN_PALAVRAS_ASSINATURA = 3
+
+_store = None
+
+
+def _sha1(texto: str) -> str:
+    return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+
+
+def assinatura(titulo: str) -> str | None:
+    """Palavras significativas (4+ letras, fora da stoplist), únicas e ordenadas."""
+    palavras = sorted({
+        p for p in normalizar(titulo).split()
+        if len(p) > 3 and p not in STOPWORDS
+    })
+    if len(palavras) < MIN_PALAVRAS_ASSINATURA:
+        return None
+    return ' '.join(palavras)
+
+
+def _normalizar_link(link: str) -> str | None:
+    if not link:
+        return None
+    partes = urlsplit(link.strip())
+    return f"{partes.netloc.lower().removeprefix('www.')}{partes.path.rstrip('/')}"
+
+
+def chaves_noticia(noticia: dict) -> list[str]:
+    """Chaves de deduplicação de uma notícia {'titulo', 'link', ...}."""
+    chaves = []
+    titulo = normalizar(noticia.get('titulo', ''))
+    if titulo:
+        chaves.append('t:' + _sha1(' '.join(titulo.split())))
+    link = _normalizar_link(noticia.get('link', ''))
+    if link:
+        chaves.append('l:' + _sha1(link))
+    sig = assinatura(noticia.get('titulo', ''))
+    if sig:
+        chaves.append('a:' + _sha1(sig))
+    return chaves
+
+
+class NoticiasVistas:
+    def __init__(self, caminho: str = NOTICIAS_VISTAS_DB,
+                 ttl_dias: float = NOTICIAS_VISTAS_TTL_DIAS):
+        self.ttl = ttl_dias * 86400
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        novo = not os.path.exists(caminho)
+        self.conn = sqlite3.connect(caminho)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS vistas ('
+            ' chave TEXT PRIMARY KEY,'
+            ' titulo TEXT,'
+            ' visto_em REAL NOT NULL)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_visto_em ON vistas(visto_em)')
+        self.conn.commit()
+
+        if novo:
+            self.importar_log()
+        self.podar()
+
+    def ja_vista(self, noticia: dict) -> bool:
+        chaves = chaves_noticia(noticia)
+        if not chaves:
+            return False
+        marcadores = ','.join('?' * len(chaves))
+        cur = self.conn.execute(
+            f'SELECT 1 FROM vistas WHERE chave IN ({marcadores}) AND visto_em >= ? LIMIT 1',
+            (*chaves, time.time() - self.ttl)
+        )
+        return cur.fetchone() is not None
+
+    def registrar(self, noticia: dict, quando: float | None = None):
+        quando = quando or time.time()
+        titulo = noticia.get('titulo', '')
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO vistas (chave, titulo, visto_em) VALUES (?, ?, ?)',
+            [(c, titulo, quando) for c in chaves_noticia(noticia)]
+        )
+        self.conn.commit()
+
+    def podar(self) -> int:
+        """Apaga registros além do TTL. Retorna nº de chaves removidas."""
+        cur = self.conn.execute('DELETE FROM vistas WHERE visto_em < ?',
+                                (time.time() - self.ttl,))
+        self.conn.commit()
+        return cur.rowcount
+
+    def importar_log(self, log_file: str = LOG_FILE) -> int:
+        """Semeia o banco com os vídeos do videos_gerados.json ainda dentro do TTL."""
+        try:
+            with open(log_file, 'r', encoding='utf-8') as f:
+                logs = json.load(f)
+        except Exception:
+            return 0
+
+        limite = time.time() - self.ttl
+        importados = 0
+        for entrada in logs:
+            try:
+                quando = datetime.fromisoformat(entrada['data']).timestamp()
+            except Exception:
+                continue
+            if quando < limite or not entrada.get('tema'):
+                continue
+            self.registrar({'titulo': entrada['tema']}, quando)
+            importados += 1
+        if importados:
+            print(f"   🗂️ Notícias vistas: {importados} importadas de {log_file}")
+        return importados
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM vistas').fetchone()[0]
+
+
+def abrir() -> NoticiasVistas | None:
+    """Instância compartilhada do processo; None se o banco não puder ser aberto."""
+    global _store
+    if _store is None:
+        try:
+            _store = NoticiasVistas()
+        except Exception as e:
+            print(f"   ⚠️ Registro de notícias vistas indisponível: {e}")
+            return None
+    return _store
@@ -0,0 +1,220 @@
+"""
+perfis_encoder.py
+-----------------
+Perfis de codificação H.264 para os vídeos do canal.
+
+Os vídeos são quase só imagens paradas com zoom lento: um bitrate fixo de
+8000k (short) / 5000k (longo) gasta bits onde nada muda e faz o short passar
+dos 50 MB que o Telegram aceita. Cada perfil descreve como codificar:
+
+  • estatico  → CRF + tune=stillimage, com teto de bitrate (VBV) que torna o
+                tamanho máximo previsível
+  • tamanho   → bitrate calculado para caber em alvo_mb, a partir da duração;
+                com dois_passos, o render gera um intermediário quase sem
+                perdas (PERFIL_INTERMEDIARIO) que é recodificado em dois
+                passos (renderizador.codificar_tamanho_alvo) — se o orçamento
+                tempo_maximo_s não comportar os dois, vira um passo único
+  • rascunho  → ultrafast, CRF alto e 15 fps, para conferir a montagem
+  • legado    → o bitrate fixo de antes
+
+Com perfil "auto", os perfis de ordem_auto são testados em sequência e vence
+o primeiro cujo tamanho PREVISTO (pior caso, pela duração do áudio) fica
+abaixo de limite_mb; o perfil "tamanho" não é escolhido se o bitrate que
+sobra for menor que kbps_minimo (vídeos longos vão para o release do GitHub
+em vez de saírem borrados). Se nenhum couber, fica o primeiro da ordem.
+
+config.json (tudo opcional; perfis são mesclados sobre os padrões):
+  "encoder": {
+    "perfil": "auto",
+    "limite_mb": 50,
+    "ordem_auto": ["estatico", "tamanho"],
+    "perfis": {"estatico": {"crf": 20}}
+  }
+Valores podem ser um só para os dois formatos ou {"short": ..., "long": ...}.
+
+Variáveis de ambiente:
+  ENCODER_PERFIL  → força um perfil (sobrepõe encoder.perfil do config.json)
+"""
+
+import os
+
+ENCODER_PERFIL = os.environ.get('ENCODER_PERFIL', '').lower()
+
+AUDIO_KBPS = 192            # AAC da narração pré-mixada (mixer_audio / amix)
+MARGEM_CONTAINER = 0.98     # ~2% do arquivo vai para o MP4 (moov, cabeçalhos)
+
+PERFIS_PADRAO = {
+    'estatico': {
+        'preset': 'medium', 'crf': 21, 'tune': 'stillimage',
+        'maxrate': {'short': '5000k', 'long': '3500k'},
+    },
+    'tamanho': {
+        'preset': 'medium', 'tune': 'stillimage', 'alvo_mb': 48,
+        'kbps_minimo': {'short': 1500, 'long': 1200},
+        'dois_passos': True, 'tempo_maximo_s': 600,
+    },
+    'rascunho': {
+        'preset': 'ultrafast', 'crf': 30, 'fps': 15,
+    },
+    'legado': {
+        'preset': 'medium', 'bitrate': {'short': '8000k', 'long': '5000k'},
+    },
+}
+
+# Render que antecede os dois passos: rápido e com folga de qualidade,
+# já que será recodificado
+PERFIL_INTERMEDIARIO = {'nome': 'intermediario', 'preset': 'veryfast', 'crf': 14,
+                        'tune': 'stillimage'}
+
+
+def _por_formato(valor, formato: str):
+    """Aceita um valor único ou {'short': ..., 'long': ...}."""
+    if isinstance(valor, dict):
+        return valor.get(formato)
+    return valor
+
+
+def _kbps(valor) -> int:
+    """'5000k' / '5M' / 5000 → kbps."""
+    texto = str(valor).strip().lower()
+    if texto.endswith('m'):
+        return int(float(texto[:-1]) * 1000)
+    return int(float(texto.rstrip('k')))
+
+
+def carregar_perfis(config: dict | None = None) -> dict:
+    """Perfis padrão com as sobreposições de config['encoder']['perfis']."""
+    perfis = {nome: dict(p) for nome, p in PERFIS_PADRAO.items()}
+    for nome, p in ((config or {}).get('encoder', {}).get('perfis') or {}).items():
+        perfis.setdefault(nome, {}).update(p)
+    return perfis
+
+
+def resolver(nome: str, perfil: dict, duracao: float, formato: str) -> dict:
+    """
+    Perfil concreto para um vídeo: valores por formato já escolhidos e, no
+    perfil de tamanho alvo, o bitrate de vídeo calculado.
+    Chaves: nome, preset, crf?, tune?, bitrate?, maxrate?, bufsize?, fps?,
+    dois_passos?, tempo_maximo_s?
+    """
+    concreto = {'nome': nome, 'preset': _por_formato(perfil.get('preset'), formato) or 'medium'}
+    for chave in ('crf', 'tune', 'fps'):
+        valor = _por_formato(perfil.get(chave), formato)
+        if valor is not None:
+            concreto[chave] = valor
+
+    alvo_mb = _por_formato(perfil.get('alvo_mb'), formato)
+    if alvo_mb:
+        total_kbps = alvo_mb * 8 * 1024 * MARGEM_CONTAINER / max(duracao, 1.0)
+        kbps = int(total_kbps - AUDIO_KBPS)
+        concreto['bitrate'] = f'{kbps}k'
+        concreto['maxrate'] = f'{int(kbps * 1.5)}k'
+        concreto['bufsize'] = f'{kbps * 2}k'
+        concreto['kbps_minimo'] = _por_formato(perfil.get('kbps_minimo'), formato) or 0
+        concreto['alvo_mb'] = alvo_mb
+        if _por_formato(perfil.get('dois_passos'), formato):
+            concreto['dois_passos'] = True
+            concreto['tempo_maximo_s'] = _por_formato(perfil.get('tempo_maximo_s'), formato)
+        return concreto
+
+    bitrate = _por_formato(perfil.get('bitrate'), formato)
+    if bitrate:
+        concreto['bitrate'] = str(bitrate)
+    maxrate = _por_formato(perfil.get('maxrate'), formato)
+    if maxrate:
+        concreto['maxrate'] = str(maxrate)
+        concreto['bufsize'] = f'{_kbps(maxrate) * 2}k'
+    return concreto
+
+
+def prever_tamanho_mb(perfil: dict, duracao: float) -> float | None:
+    """
+    Pior caso do tamanho final (vídeo + áudio), em MB.
+    None quando o perfil não tem limite (CRF sem teto de bitrate).
+    """
+    if perfil.get('alvo_mb'):
+        return float(perfil['alvo_mb'])
+    if perfil.get('maxrate'):
+        # VBV: média <= maxrate, mais no máximo um buffer inteiro de folga
+        kbits = _kbps(perfil['maxrate']) * duracao + _kbps(perfil['bufsize'])
+    elif perfil.get('bitrate'):
+        kbits = _kbps(perfil['bitrate']) * duracao
+    else:
+        return None
+    return (kbits + AUDIO_KBPS * duracao) / 8 / 1024 / MARGEM_CONTAINER
+
+
+def escolher_perfil(duracao: float, formato: str, config: dict | None = None) -> dict:
+    """Perfil concreto para um vídeo de `duracao` segundos ('short' ou 'long')."""
+    opcoes = (config or {}).get('encoder', {})
+    perfis = carregar_perfis(config)
+    pedido = ENCODER_PERFIL or str(opcoes.get('perfil', 'auto')).lower()
+
+    if pedido != 'auto':
+        if pedido in perfis:
+            perfil = resolver(pedido, perfis[pedido], duracao, formato)
+            print(f"🎛️ Perfil de encoder: {pedido}")
+            return perfil
+        print(f"⚠️ Perfil de encoder desconhecido: {pedido} — usando auto")
+
+    limite_mb = float(opcoes.get('limite_mb', 50))
+    ordem = [n for n in opcoes.get('ordem_auto', ['estatico', 'tamanho']) if n in perfis]
+    if not ordem:
+        ordem = ['estatico']
+
+    for nome in ordem:
+        perfil = resolver(nome, perfis[nome], duracao, formato)
+        previsto = prever_tamanho_mb(perfil, duracao)
+        if previsto is None or previsto > limite_mb:
+            continue
+        if perfil.get('kbps_minimo') and _kbps(perfil['bitrate']) < perfil['kbps_minimo']:
+            print(f"   ⏭️ Perfil {nome}: {perfil['bitrate']} ficaria abaixo do mínimo")
+            continue
+        print(f"🎛️ Perfil de encoder: {nome} (previsto ≤ {previsto:.1f} MB)")
+        return perfil
+
+    perfil = resolver(ordem[0], perfis[ordem[0]], duracao, formato)
+    print(f"🎛️ Perfil de encoder: {ordem[0]} (nenhum perfil garante ≤ {limite_mb:.0f} MB)")
+    return perfil
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# ARGUMENTOS PARA OS ENCODERS
+# ════════════════════════════════════════════════════════════════════════════
+
+def perfil_de_render(perfil: dict) -> dict:
+    """Perfil usado pelo render em si: o intermediário, se o perfil for de dois passos."""
+    if not perfil.get('dois_passos'):
+        return perfil
+    intermediario = dict(PERFIL_INTERMEDIARIO)
+    if perfil.get('fps'):
+        intermediario['fps'] = perfil['fps']
+    return intermediario
+
+
+def _argumentos_taxa(perfil: dict) -> list[str]:
+    args = []
+    if perfil.get('crf') is not None:
+        args += ['-crf', str(perfil['crf'])]
+    if perfil.get('tune'):
+        args += ['-tune', perfil['tune']]
+    if perfil.get('maxrate'):
+        args += ['-maxrate', perfil['maxrate'], '-bufsize', perfil['bufsize']]
+    return args
+
+
+def argumentos_ffmpeg(perfil: dict) -> list[str]:
+    """Opções de vídeo do libx264 para um comando ffmpeg (renderizador.py)."""
+    args = ['-preset', perfil['preset']]
+    if perfil.get('bitrate'):
+        args += ['-b:v', perfil['bitrate']]
+    return args + _argumentos_taxa(perfil)
+
+
+def parametros_moviepy(perfil: dict) -> dict:
+    """kwargs de codificação para VideoClip.write_videofile."""
+    return {
+        'preset': perfil['preset'],
+        'bitrate': perfil.get('bitrate'),
+        'ffmpeg_params': _argumentos_taxa(perfil) or None,
+    }
@@ -0,0 +1,248 @@
+"""
+render_especulativo.py
+----------------------
+Renderização dos trechos do vídeo em segundo plano, enquanto a curadoria
+no Telegram ainda está em andamento.
+
+Antes, o pipeline esperava a curadoria inteira (até 1h) e só então
+renderizava tudo. Aqui, logo que as mídias automáticas são escolhidas:
+  1. a timeline é dividida em trechos — um por segmento visível
+     (renderizador._trechos_visiveis), cortes sempre numa troca de mídia
+  2. um pool de processos renderiza cada trecho sem áudio
+     (renderizador._renderizar_trecho) em .cache/trechos/<chave>.mp4
+  3. a cada mídia trocada pelo curador, atualizar() agenda só os trechos
+     cuja chave mudou
+  4. concluir() espera o que falta, junta tudo com o concat demuxer (stream
+     copy) e mixa o áudio uma vez (renderizador.concatenar_trechos)
+
+A chave de um trecho combina frames, conteúdo da mídia (SHA-1 de
+cache_imagens.hash_conteudo), tempos do segmento e parâmetros de encode —
+uma curadoria que aprova tudo reaproveita todos os trechos e o render final
+vira só o concat.
+
+Os trechos saem do disco em concluir()/cancelar(); o que sobrar de uma
+execução interrompida é apagado por podar_cache() no fim da próxima.
+
+Variáveis de ambiente:
+  CACHE_DIR                → raiz dos caches (padrão: .cache)
+  CACHE_TRECHOS_MAX_MB     → limite dos trechos; os mais antigos saem primeiro (padrão: 1024)
+  CACHE_TRECHOS_TTL_HORAS  → trechos mais velhos que isso são apagados (padrão: 24)
+"""
+
+import os
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cache_imagens import hash_conteudo
+from renderizador import (montar_timeline, _indices_por_frame, _trechos_visiveis,
+                          _renderizar_trecho, concatenar_trechos)
+
+CACHE_DIR = os.environ.get('CACHE_DIR', '.cache')
+CACHE_TRECHOS_DIR = os.path.join(CACHE_DIR, 'trechos')
+CACHE_TRECHOS_MAX_MB = int(os.environ.get('CACHE_TRECHOS_MAX_MB', '1024'))
+CACHE_TRECHOS_TTL_HORAS = float(os.environ.get('CACHE_TRECHOS_TTL_HORAS', '24'))
+
+
+def _renderizar_bloco(segmentos: list, k: int, frame_inicial: int, frame_final: int,
+                      total_frames: int, arquivo: str,
+                      largura: int, altura: int, fps: int, zoom: float, threads: int,
+                      parametros_video: list[str] | None, vfr: bool) -> str | None:
+    """Worker do pool: um trecho da timeline, com o vídeo do curador já normalizado."""
+    if os.path.exists(arquivo):
+        return arquivo
+
+    if k >= 0 and segmentos[k]['tipo'] == 'video':
+        from clips_video import normalizar_clip
+        seg = segmentos[k]
+        segmentos = list(segmentos)
+        segmentos[k] = dict(seg, caminho=normalizar_clip(seg['caminho'], seg['duracao'],
+                                                         largura, altura, fps) or seg['caminho'])
+
+    tmp = f'{arquivo}.{os.getpid()}.tmp.mp4'
+    resultado = _renderizar_trecho(segmentos, frame_inicial, frame_final, total_frames, tmp,
+                                   largura, altura, fps, zoom, '8000k', 'medium', threads,
+                                   parametros_video, vfr)
+    if not resultado:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return None
+    os.replace(tmp, arquivo)
+    return arquivo
+
+
+class RenderEspeculativo:
+    """Trechos da timeline renderizados em segundo plano, refeitos só quando mudam."""
+
+    def __init__(self, duracao_total: float, largura: int, altura: int, fps: int,
+                 zoom: float, parametros_video: list[str] | None = None,
+                 vfr: bool = False, processos: int | None = None):
+        self.duracao_total = duracao_total
+        self.largura = largura
+        self.altura = altura
+        self.fps = fps
+        self.zoom = zoom
+        self.parametros_video = parametros_video
+        self.vfr = vfr
+
+        self.processos = processos or os.cpu_count() or 1
+        self._threads = max(1, (os.cpu_count() or 1) // self.processos)
+        self._pool = ProcessPoolExecutor(max_workers=self.processos)
+        self._futuros = {}          # chave → Future
+        os.makedirs(CACHE_TRECHOS_DIR, exist_ok=True)
+
+    # ========================================
+    # PLANO DE TRECHOS
+    # ========================================
+
+    def _chave(self, seg: dict | None, frame_inicial: int, frame_final: int) -> str:
+        midia = None
+        if seg is not None:
+            midia = [hash_conteudo(seg['caminho']), seg['tipo'],
+                     round(seg['inicio'], 4), round(seg['duracao'], 4)]
+        conteudo = json.dumps([frame_inicial, frame_final, midia, self.largura, self.altura,
+                               self.fps, self.zoom, self.parametros_video, self.vfr])
+        return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+    def _arquivo(self, chave: str) -> str:
+        return os.path.join(CACHE_TRECHOS_DIR, f'{chave}.mp4')
+
+    @staticmethod
+    def _precisa_agendar(futuro) -> bool:
+        """Sem futuro, cancelado ou terminado sem trecho (None/exceção): agenda de novo."""
+        if futuro is None or futuro.cancelled():
+            return True
+        if not futuro.done():
+            return False
+        return futuro.exception() is not None or not futuro.result()
+
+    def atualizar(self, midias_sincronizadas: list) -> list[str]:
+        """
+        Agenda os trechos da timeline atual que ainda não existem nem estão
+        na fila (trechos que falharam entram de novo); trechos pendentes que
+        saíram da timeline são cancelados.
+        Retorna as chaves dos trechos, na ordem.
+        """
+        segmentos = montar_timeline(midias_sincronizadas, self.duracao_total)
+        if not segmentos:
+            return []
+        total_frames = int(np.ceil(self.duracao_total * self.fps - 1e-6))
+        indices = _indices_por_frame(segmentos, total_frames, self.fps)
+
+        chaves = []
+        novos = 0
+        for k, f0, f1 in _trechos_visiveis(indices):
+            chave = self._chave(segmentos[k] if k >= 0 else None, f0, f1)
+            chaves.append(chave)
+            if not self._precisa_agendar(self._futuros.get(chave)):
+                continue
+            self._futuros[chave] = self._pool.submit(
+                _renderizar_bloco, segmentos, k, f0, f1, total_frames, self._arquivo(chave),
+                self.largura, self.altura, self.fps, self.zoom, self._threads,
+                self.parametros_video, self.vfr
+            )
+            novos += 1
+
+        atuais = set(chaves)
+        for chave, futuro in self._futuros.items():
+            if chave not in atuais:
+                futuro.cancel()   # só tem efeito se ainda não começou
+
+        if novos:
+            print(f"  🧩 Render especulativo: {novos} trechos agendados "
+                  f"({len(chaves)} na timeline)")
+        return chaves
+
+    # ========================================
+    # CONCLUSÃO
+    # ========================================
+
+    def concluir(self, midias_sincronizadas: list, output_file: str,
+                 audio_path: str | None = None, musica_path: str | None = None,
+                 volume_musica: float = 0.06) -> str | None:
+        """
+        Renderiza o que mudou desde a última atualização, espera os trechos
+        e junta tudo com o áudio. Retorna output_file ou None em caso de erro.
+        """
+        chaves = self.atualizar(midias_sincronizadas)
+        if not chaves:
+            self.cancelar()
+            return None
+        # Só os trechos da timeline final: os substituídos na curadoria não contam
+        prontos = sum(1 for c in chaves
+                      if self._futuros[c].done() and not self._futuros[c].cancelled())
+
+        espera = time.time()
+        try:
+            resultados = [self._futuros[c].result() for c in chaves]
+        except Exception as e:
+            print(f"  ❌ Render especulativo falhou: {e}")
+            resultados = [None]
+        self._pool.shutdown(cancel_futures=True)
+
+        if not all(resultados):
+            print("  ❌ Falha em um ou mais trechos especulativos")
+            return None
+
+        print(f"  ♻️ {len(chaves)} trechos ({prontos} já prontos ao fim da curadoria); "
+              f"espera final de {time.time() - espera:.1f}s")
+        print("  🔗 Concatenando trechos + áudio...")
+        resultado = concatenar_trechos(resultados, output_file, self.duracao_total,
+                                       audio_path, musica_path, volume_musica)
+        if resultado:
+            self._limpar()
+        return resultado
+
+    def cancelar(self) -> None:
+        """Abandona o render em segundo plano e apaga os trechos."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._limpar()
+
+    def _limpar(self) -> None:
+        for chave in self._futuros:
+            try:
+                os.remove(self._arquivo(chave))
+            except OSError:
+                pass
+
+
+def podar_cache(max_mb: int = CACHE_TRECHOS_MAX_MB,
+                ttl_horas: float = CACHE_TRECHOS_TTL_HORAS) -> int:
+    """Apaga trechos órfãos antigos e, se preciso, os mais velhos. Retorna nº removido."""
+    if not os.path.isdir(CACHE_TRECHOS_DIR):
+        return 0
+    agora = time.time()
+    arquivos = []
+    removidos = 0
+    for nome in os.listdir(CACHE_TRECHOS_DIR):
+        if not nome.endswith('.mp4'):
+            continue
+        caminho = os.path.join(CACHE_TRECHOS_DIR, nome)
+        st = os.stat(caminho)
+        # inclui os .tmp.mp4 de um worker morto no meio do encode
+        if agora - st.st_mtime > ttl_horas * 3600:
+            try:
+                os.remove(caminho)
+                removidos += 1
+            except OSError:
+                pass
+            continue
+        arquivos.append((st.st_mtime, st.st_size, caminho))
+
+    total = sum(a[1] for a in arquivos)
+    limite = max_mb * 1024 * 1024
+    for _, tamanho, caminho in sorted(arquivos):
+        if total <= limite:
+            break
+        try:
+            os.remove(caminho)
+            total -= tamanho
+            removidos += 1
+        except OSError:
+            pass
+    if removidos:
+        print(f"  🧹 Cache de trechos: {removidos} trechos órfãos removidos")
+    return removidos
@@ -0,0 +1,759 @@
+"""
+renderizador.py
+---------------
+Motor de renderização em NumPy puro para os vídeos do Canal 55.
+
+Substitui o CompositeVideoClip do MoviePy no caminho de imagens estáticas:
+  1. Cada imagem do segmento é carregada UMA vez como array uint8 já no
+     tamanho final (crop "cover" para 1080x1920 ou 1920x1080)
+  2. O zoom Ken Burns vira um recorte afim calculado por frame
+     (índices inteiros sobre grades pré-computadas — sem PIL por frame)
+  3. Os frames brutos (rgb24) vão direto para o stdin de um processo ffmpeg,
+     que também mixa narração + música e codifica em H.264/AAC
+
+Seleção no generate_video.py:
+  RENDER_BACKEND=moviepy   → caminho original (padrão)
+  RENDER_BACKEND=numpy     → este módulo
+  RENDER_BACKEND=paralelo  → este módulo, trechos num pool de processos
+  RENDER_BACKEND=ffmpeg    → timeline compilada num filtergraph (zoompan +
+                             concat) e renderizada por um único ffmpeg; só
+                             para timelines sem vídeo
+
+Com RENDER_VFR=true, os três backends só calculam os frames em que o zoom
+já moveu a imagem em LIMIAR_VFR_PX; o encoder repete cada frame até o
+próximo e entrega CFR (30/24 fps) do mesmo jeito.
+"""
+
+import os
+import time
+import shutil
+import subprocess
+
+import numpy as np
+
+
+EXTENSOES_IMAGEM = ('.jpg', '.jpeg', '.png')
+
+# Modo VFR: um frame só é renderizado quando o zoom já moveu a borda da
+# imagem em LIMIAR_VFR_PX (reamostragem por vizinho mais próximo não mostra
+# menos que 1 px); no máximo PASSO_VFR_MAXIMO frames seguidos são repetidos
+LIMIAR_VFR_PX = 1.0
+PASSO_VFR_MAXIMO = 12
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# FFMPEG
+# ════════════════════════════════════════════════════════════════════════════
+
+def ffmpeg_exe() -> str:
+    """Binário do ffmpeg: o do imageio-ffmpeg (já dependência do MoviePy) ou o do PATH."""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return shutil.which('ffmpeg') or 'ffmpeg'
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# TIMELINE
+# ════════════════════════════════════════════════════════════════════════════
+
+def montar_timeline(midias_sincronizadas: list, duracao_total: float) -> list[dict]:
+    """
+    Converte midias_sincronizadas em uma lista plana de segmentos:
+      {'caminho', 'tipo': 'imagem'|'video', 'inicio', 'duracao'}
+
+    Mesmas regras do caminho MoviePy: mídias inexistentes são ignoradas e o
+    tempo descoberto no fim é preenchido reciclando as imagens já aprovadas.
+    """
+    segmentos = []
+    tempo_coberto = 0.0
+
+    for item in midias_sincronizadas:
+        midia = item.get('midia')
+        if not midia:
+            continue
+        caminho, tipo = midia
+        if not caminho or not os.path.exists(caminho):
+            continue
+        if tipo == 'video_local':
+            tipo_seg = 'video'
+        elif tipo in ('foto_local', 'imagem_local'):
+            tipo_seg = 'imagem'
+        else:
+            continue
+        segmentos.append({
+            'caminho': caminho,
+            'tipo': tipo_seg,
+            'inicio': item['inicio'],
+            'duracao': item['duracao']
+        })
+        tempo_coberto = max(tempo_coberto, item['inicio'] + item['duracao'])
+
+    # Preenchimento reutilizando imagens já aprovadas
+    pool = [s for s in segmentos if s['tipo'] == 'imagem']
+    i = 0
+    while pool and tempo_coberto < duracao_total - 1e-3:
+        base = pool[i % len(pool)]
+        duracao = min(base['duracao'] or 3.0, duracao_total - tempo_coberto)
+        segmentos.append({
+            'caminho': base['caminho'],
+            'tipo': 'imagem',
+            'inicio': tempo_coberto,
+            'duracao': duracao
+        })
+        tempo_coberto += duracao
+        i += 1
+
+    return segmentos
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# IMAGENS
+# ════════════════════════════════════════════════════════════════════════════
+
+def carregar_imagem_cover(caminho: str, largura: int, altura: int) -> np.ndarray:
+    """Array uint8 (altura, largura, 3) com crop centralizado, via cache de imagens prontas."""
+    from cache_imagens import obter_cover
+    return obter_cover(caminho, largura, altura)
+
+
+class _ZoomKenBurns:
+    """
+    Recorte afim do zoom Ken Burns sobre uma imagem já no tamanho final.
+
+    O MoviePy amplia o frame inteiro e o CompositeVideoClip o posiciona em
+    (0, 0), ou seja, o zoom é ancorado no canto superior esquerdo. Aqui o
+    mesmo resultado sai de um recorte (0, 0, W/s, H/s) reamostrado por
+    vizinho mais próximo: duas operações np.take sobre índices inteiros.
+    """
+
+    def __init__(self, imagem: np.ndarray, zoom: float):
+        self.imagem = imagem
+        self.zoom = zoom
+        altura, largura = imagem.shape[:2]
+        self._ys = np.arange(altura, dtype=np.float32)
+        self._xs = np.arange(largura, dtype=np.float32)
+
+    def frame(self, progresso: float) -> np.ndarray:
+        escala = 1.0 + self.zoom * progresso
+        if escala <= 1.0:
+            return self.imagem
+        ys = (self._ys / escala).astype(np.intp)
+        xs = (self._xs / escala).astype(np.intp)
+        return self.imagem.take(ys, axis=0).take(xs, axis=1)
+
+
+class _LeitorVideo:
+    """Decodifica um clip de vídeo via ffmpeg já escalado/cortado, frame a frame."""
+
+    def __init__(self, caminho: str, largura: int, altura: int, fps: int,
+                 duracao: float, deslocamento: float = 0.0):
+        self.tamanho_frame = largura * altura * 3
+        self.forma = (altura, largura, 3)
+        self.ultimo = None
+        filtro = (f'scale={largura}:{altura}:force_original_aspect_ratio=increase,'
+                  f'crop={largura}:{altura},fps={fps}')
+        self.proc = subprocess.Popen(
+            [ffmpeg_exe(), '-loglevel', 'error', '-ss', f'{deslocamento:.3f}',
+             '-t', f'{max(duracao - deslocamento, 0.0):.3f}', '-i', caminho,
+             '-an', '-vf', filtro, '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-'],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+
+    def frame(self) -> np.ndarray | None:
+        dados = self.proc.stdout.read(self.tamanho_frame)
+        if len(dados) == self.tamanho_frame:
+            self.ultimo = np.frombuffer(dados, dtype=np.uint8).reshape(self.forma)
+        else:
+            # Clip acabou antes do segmento: MoviePy deixaria o fundo preto
+            self.ultimo = None
+        return self.ultimo
+
+    def fechar(self):
+        try:
+            self.proc.stdout.close()
+            self.proc.kill()
+            self.proc.wait(timeout=5)
+        except Exception:
+            pass
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# RENDERIZAÇÃO
+# ════════════════════════════════════════════════════════════════════════════
+
+def _indices_por_frame(segmentos: list, total_frames: int, fps: int) -> np.ndarray:
+    """Para cada frame, índice do segmento visível (-1 = preto). O último segmento vence."""
+    indices = np.full(total_frames, -1, dtype=np.int32)
+    for k, seg in enumerate(segmentos):
+        f0 = int(np.ceil(seg['inicio'] * fps - 1e-6))
+        f1 = int(np.ceil((seg['inicio'] + seg['duracao']) * fps - 1e-6))
+        indices[max(0, f0):min(total_frames, f1)] = k
+    return indices
+
+
+def _passo_vfr(seg: dict | None, largura: int, altura: int, fps: int, zoom: float) -> int:
+    """
+    De quantos em quantos frames o segmento precisa ser renderizado no modo VFR.
+    O zoom desloca a borda da imagem em ~max(L, A) * zoom / (duração * fps)
+    pixels por frame; renderiza-se só quando o acumulado chega a LIMIAR_VFR_PX.
+    Preto e imagens sem zoom seguram até PASSO_VFR_MAXIMO; vídeo, nunca.
+    """
+    if seg is not None and seg['tipo'] == 'video':
+        return 1
+    if seg is None or zoom <= 0 or not seg['duracao']:
+        return PASSO_VFR_MAXIMO
+    pixels_por_frame = max(largura, altura) * zoom / (seg['duracao'] * fps)
+    return int(min(max(LIMIAR_VFR_PX // pixels_por_frame, 1), PASSO_VFR_MAXIMO))
+
+
+def _quadros_vfr(segmentos: list, indices: np.ndarray, frame_inicial: int, frame_final: int,
+                 largura: int, altura: int, fps: int, zoom: float) -> np.ndarray:
+    """
+    Frames de [frame_inicial, frame_final) que realmente mudam a imagem; os
+    demais repetem o anterior. O último frame entra sempre, para o filtro fps
+    do encoder saber até onde segurar.
+    """
+    quadros = []
+    for k, f0, f1 in _trechos_visiveis(indices[frame_inicial:frame_final]):
+        passo = _passo_vfr(segmentos[k] if k >= 0 else None, largura, altura, fps, zoom)
+        quadros.append(np.arange(f0, f1, passo) + frame_inicial)
+    quadros.append([frame_final - 1])
+    return np.unique(np.concatenate(quadros))
+
+
+def _expressao_pts(quadros: np.ndarray, origem: int) -> str:
+    """
+    Expressão do setpts que devolve a cada frame enviado (N) o seu número na
+    timeline CFR: um termo between(N, ...) por progressão aritmética de quadros.
+    """
+    termos = []
+    i, n = 0, len(quadros)
+    while i < n:
+        passo = int(quadros[i + 1] - quadros[i]) if i + 1 < n else 1
+        j = i + 1
+        while j < n and quadros[j] - quadros[j - 1] == passo:
+            j += 1
+        termos.append(f'between(N,{i},{j - 1})*({int(quadros[i]) - origem}+(N-{i})*{passo})')
+        i = j
+    return '+'.join(termos)
+
+
+def _carregar_imagens(segmentos: list, largura: int, altura: int) -> dict:
+    """Pré-carrega cada imagem distinta uma única vez: {caminho: array | None}."""
+    arrays = {}
+    for seg in segmentos:
+        if seg['tipo'] == 'imagem' and seg['caminho'] not in arrays:
+            try:
+                arrays[seg['caminho']] = carregar_imagem_cover(seg['caminho'], largura, altura)
+            except Exception as e:
+                print(f"  ⚠️ Erro imagem {os.path.basename(seg['caminho'])}: {e}")
+                arrays[seg['caminho']] = None
+    return arrays
+
+
+def _gerar_frames(segmentos: list, arrays: dict, indices: np.ndarray,
+                  frame_inicial: int, frame_final: int,
+                  largura: int, altura: int, fps: int, zoom: float,
+                  quadros: np.ndarray | None = None):
+    """
+    Gera os frames [frame_inicial, frame_final) da timeline como arrays uint8.
+    Com quadros (modo VFR), só esses números de frame são gerados.
+    """
+    preto = np.zeros((altura, largura, 3), dtype=np.uint8)
+    seg_atual = None
+    zoom_atual = None
+    leitor = None
+    if quadros is None:
+        quadros = range(frame_inicial, frame_final)
+
+    try:
+        for n in quadros:
+            n = int(n)
+            k = int(indices[n])
+
+            if k != seg_atual:
+                if leitor:
+                    leitor.fechar()
+                    leitor = None
+                zoom_atual = None
+                seg_atual = k
+                if k >= 0:
+                    seg = segmentos[k]
+                    if seg['tipo'] == 'video':
+                        leitor = _LeitorVideo(seg['caminho'], largura, altura, fps,
+                                              seg['duracao'],
+                                              deslocamento=max(0.0, n / fps - seg['inicio']))
+                    elif arrays.get(seg['caminho']) is not None:
+                        zoom_atual = _ZoomKenBurns(arrays[seg['caminho']], zoom)
+
+            if k < 0:
+                frame = preto
+            elif leitor:
+                frame = leitor.frame()
+                if frame is None:
+                    frame = preto
+            elif zoom_atual:
+                seg = segmentos[k]
+                progresso = (n / fps - seg['inicio']) / seg['duracao'] if seg['duracao'] else 0.0
+                frame = zoom_atual.frame(min(max(progresso, 0.0), 1.0))
+            else:
+                frame = preto
+
+            yield frame
+    finally:
+        if leitor:
+            leitor.fechar()
+
+
+def _argumentos_audio(audio_path: str | None, musica_path: str | None,
+                      volume_musica: float) -> tuple[list[str], list[str]]:
+    """
+    Entradas e mapeamento de áudio para um comando ffmpeg cuja entrada 0 é o vídeo.
+    Retorna (entradas, saida).
+    """
+    if not audio_path:
+        return [], ['-map', '0:v']
+
+    entradas = ['-i', audio_path]
+    if musica_path:
+        entradas += ['-stream_loop', '-1', '-i', musica_path]
+        # amix divide pelo nº de entradas ativas (2): volume=2 restaura o nível da narração
+        saida = ['-filter_complex',
+                 f'[2:a]volume={volume_musica}[m];'
+                 f'[1:a][m]amix=inputs=2:duration=first:dropout_transition=0,volume=2[a]',
+                 '-map', '0:v', '-map', '[a]']
+    else:
+        saida = ['-map', '0:v', '-map', '1:a']
+        if audio_path.endswith('.m4a'):
+            # trilha já pré-mixada em AAC (mixer_audio): só multiplexa
+            return entradas, saida + ['-c:a', 'copy']
+    return entradas, saida + ['-c:a', 'aac', '-b:a', '192k']
+
+
+def _comando_encoder(output_file: str, largura: int, altura: int, fps: int,
+                     duracao_total: float, audio_path: str | None,
+                     musica_path: str | None, volume_musica: float,
+                     bitrate: str, preset: str, threads: int,
+                     parametros_video: list[str] | None = None,
+                     pts_vfr: str | None = None) -> list[str]:
+    """
+    Comando do encoder que lê frames rgb24 do stdin. parametros_video
+    (perfis_encoder.argumentos_ffmpeg) substitui o par -preset/-b:v.
+    Com pts_vfr (_expressao_pts), os frames recebidos são reposicionados na
+    timeline e o filtro fps repete cada um até o próximo (CFR na saída); o fps
+    não segura o último frame além do próprio pts, então o tpad o repete e o
+    -t corta no tamanho certo.
+    """
+    entradas_audio, saida_audio = _argumentos_audio(audio_path, musica_path, volume_musica)
+    filtro_vfr = (['-vf', f"setpts='{pts_vfr}',fps={fps},tpad=stop_mode=clone:stop=1"]
+                  if pts_vfr else [])
+    return [
+        ffmpeg_exe(), '-y', '-loglevel', 'error',
+        '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+        '-s', f'{largura}x{altura}', '-r', str(fps), '-i', '-',
+        *entradas_audio, *saida_audio, *filtro_vfr,
+        '-c:v', 'libx264', *(parametros_video or ['-preset', preset, '-b:v', bitrate]),
+        '-pix_fmt', 'yuv420p', '-threads', str(threads),
+        '-t', f'{duracao_total:.3f}', '-movflags', '+faststart',
+        output_file
+    ]
+
+
+def _codificar_frames(frames, cmd: list[str]) -> bool:
+    """Escreve os frames no stdin do ffmpeg. True se o ffmpeg terminou sem erro."""
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    try:
+        for frame in frames:
+            proc.stdin.write(np.ascontiguousarray(frame).data)
+        proc.stdin.close()
+        codigo = proc.wait()
+    except Exception as e:
+        print(f"  ❌ Erro no render NumPy: {e}")
+        proc.kill()
+        proc.wait()
+        return False
+
+    if codigo != 0:
+        print(f"  ❌ ffmpeg terminou com código {codigo}")
+        return False
+    return True
+
+
+def renderizar_timeline(segmentos: list, output_file: str, duracao_total: float,
+                        largura: int, altura: int, fps: int = 30,
+                        zoom: float = 0.04,
+                        audio_path: str | None = None,
+                        musica_path: str | None = None,
+                        volume_musica: float = 0.06,
+                        bitrate: str = '8000k', preset: str = 'medium',
+                        threads: int = 4,
+                        parametros_video: list[str] | None = None,
+                        vfr: bool = False) -> str | None:
+    """
+    Renderiza a timeline frame a frame em NumPy e envia ao ffmpeg via pipe.
+    Com vfr, frames que não mudariam a imagem não são gerados nem enviados.
+    Retorna output_file ou None em caso de erro.
+    """
+    total_frames = int(np.ceil(duracao_total * fps - 1e-6))
+    indices = _indices_por_frame(segmentos, total_frames, fps)
+    quadros = (_quadros_vfr(segmentos, indices, 0, total_frames, largura, altura, fps, zoom)
+               if vfr else None)
+
+    print(f"  🖼️ Pré-carregando imagens ({largura}x{altura})...")
+    arrays = _carregar_imagens(segmentos, largura, altura)
+    print(f"  ✅ {len(arrays)} imagens em memória")
+
+    cmd = _comando_encoder(output_file, largura, altura, fps, duracao_total,
+                           audio_path, musica_path, volume_musica,
+                           bitrate, preset, threads, parametros_video,
+                           _expressao_pts(quadros, 0) if vfr else None)
+
+    inicio_render = time.time()
+    frames = _gerar_frames(segmentos, arrays, indices, 0, total_frames,
+                           largura, altura, fps, zoom, quadros)
+    if not _codificar_frames(frames, cmd):
+        return None
+
+    decorrido = time.time() - inicio_render
+    gerados = f" ({len(quadros)} gerados, VFR)" if vfr else ""
+    print(f"  ⚡ {total_frames} frames{gerados} em {decorrido:.1f}s "
+          f"({total_frames / max(decorrido, 1e-6):.1f} fps)")
+    return output_file
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# RENDERIZAÇÃO PARALELA (trechos + concat demuxer)
+# ════════════════════════════════════════════════════════════════════════════
+
+def _dividir_em_trechos(indices: np.ndarray, quantidade: int) -> list[tuple[int, int]]:
+    """
+    Divide [0, total_frames) em ~quantidade trechos de tamanho parecido,
+    cortando sempre numa troca de segmento (nunca no meio de um zoom).
+    """
+    total_frames = len(indices)
+    trocas = [0] + [int(n) for n in np.flatnonzero(np.diff(indices)) + 1]
+    alvo = total_frames / max(quantidade, 1)
+
+    cortes = [0]
+    for n in trocas[1:]:
+        if n - cortes[-1] >= alvo:
+            cortes.append(n)
+    if total_frames - cortes[-1] < alvo / 2 and len(cortes) > 1:
+        cortes.pop()
+    cortes.append(total_frames)
+    return list(zip(cortes[:-1], cortes[1:]))
+
+
+def _renderizar_trecho(segmentos: list, frame_inicial: int, frame_final: int,
+                       total_frames: int, output_file: str,
+                       largura: int, altura: int, fps: int, zoom: float,
+                       bitrate: str, preset: str, threads: int,
+                       parametros_video: list[str] | None = None,
+                       vfr: bool = False) -> str | None:
+    """Worker do pool: renderiza só o vídeo (sem áudio) dos frames [inicial, final)."""
+    indices = _indices_por_frame(segmentos, total_frames, fps)
+    usados = {int(k) for k in np.unique(indices[frame_inicial:frame_final]) if k >= 0}
+    arrays = _carregar_imagens([segmentos[k] for k in usados], largura, altura)
+    quadros = (_quadros_vfr(segmentos, indices, frame_inicial, frame_final,
+                            largura, altura, fps, zoom) if vfr else None)
+
+    duracao = (frame_final - frame_inicial) / fps
+    cmd = _comando_encoder(output_file, largura, altura, fps, duracao,
+                           None, None, 0.0, bitrate, preset, threads, parametros_video,
+                           _expressao_pts(quadros, frame_inicial) if vfr else None)
+    frames = _gerar_frames(segmentos, arrays, indices, frame_inicial, frame_final,
+                           largura, altura, fps, zoom, quadros)
+    return output_file if _codificar_frames(frames, cmd) else None
+
+
+def concatenar_trechos(trechos: list[str], output_file: str, duracao_total: float,
+                       audio_path: str | None = None,
+                       musica_path: str | None = None,
+                       volume_musica: float = 0.06) -> str | None:
+    """
+    Junta trechos H.264 já codificados com o concat demuxer (stream copy)
+    e mixa narração + música uma única vez no final.
+    """
+    lista_path = f'{output_file}.concat.txt'
+    with open(lista_path, 'w', encoding='utf-8') as f:
+        for trecho in trechos:
+            caminho = os.path.abspath(trecho).replace("'", "'\\''")
+            f.write(f"file '{caminho}'\n")
+
+    entradas_audio, saida_audio = _argumentos_audio(audio_path, musica_path, volume_musica)
+    cmd = [
+        ffmpeg_exe(), '-y', '-loglevel', 'error',
+        '-f', 'concat', '-safe', '0', '-i', lista_path,
+        *entradas_audio, *saida_audio,
+        '-c:v', 'copy', '-t', f'{duracao_total:.3f}', '-movflags', '+faststart',
+        output_file
+    ]
+    try:
+        resultado = subprocess.run(cmd, capture_output=True, text=True)
+    finally:
+        try:
+            os.remove(lista_path)
+        except OSError:
+            pass
+
+    if resultado.returncode != 0:
+        print(f"  ❌ Erro no concat: {resultado.stderr[-500:]}")
+        return None
+    return output_file
+
+
+def renderizar_timeline_paralelo(segmentos: list, output_file: str, duracao_total: float,
+                                 largura: int, altura: int, fps: int = 24,
+                                 zoom: float = 0.03,
+                                 audio_path: str | None = None,
+                                 musica_path: str | None = None,
+                                 volume_musica: float = 0.06,
+                                 bitrate: str = '5000k', preset: str = 'medium',
+                                 processos: int | None = None,
+                                 parametros_video: list[str] | None = None,
+                                 vfr: bool = False) -> str | None:
+    """
+    Renderiza grupos de segmentos em paralelo (um processo por trecho),
+    junta com o concat demuxer e só então mixa o áudio.
+    Retorna output_file ou None em caso de erro.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    processos = processos or os.cpu_count() or 1
+    total_frames = int(np.ceil(duracao_total * fps - 1e-6))
+    indices = _indices_por_frame(segmentos, total_frames, fps)
+
+    # 2 trechos por processo equilibram trechos longos com imagens caras
+    trechos = _dividir_em_trechos(indices, processos * 2)
+    threads_por_trecho = max(1, (os.cpu_count() or 1) // processos)
+    print(f"  🧩 {len(trechos)} trechos em {processos} processos")
+
+    base, _ = os.path.splitext(output_file)
+    arquivos = [f'{base}.trecho{i:03d}.mp4' for i in range(len(trechos))]
+
+    inicio_render = time.time()
+    try:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            futuros = [
+                pool.submit(_renderizar_trecho, segmentos, f0, f1, total_frames, arquivo,
+                            largura, altura, fps, zoom, bitrate, preset, threads_por_trecho,
+                            parametros_video, vfr)
+                for (f0, f1), arquivo in zip(trechos, arquivos)
+            ]
+            resultados = [f.result() for f in futuros]
+
+        if not all(resultados):
+            print("  ❌ Falha em um ou mais trechos")
+            return None
+
+        print(f"  ⚡ {total_frames} frames em {time.time() - inicio_render:.1f}s")
+        print("  🔗 Concatenando trechos + áudio...")
+        return concatenar_trechos(arquivos, output_file, duracao_total,
+                                  audio_path, musica_path, volume_musica)
+    finally:
+        for arquivo in arquivos:
+            try:
+                os.remove(arquivo)
+            except OSError:
+                pass
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# FILTERGRAPH (um único processo ffmpeg, zero trabalho por frame em Python)
+# ════════════════════════════════════════════════════════════════════════════
+
+def _trechos_visiveis(indices: np.ndarray) -> list[tuple[int, int, int]]:
+    """Sequências de frames com o mesmo segmento visível: [(k, f0, f1), ...]."""
+    if len(indices) == 0:
+        return []
+    cortes = np.flatnonzero(np.diff(indices)) + 1
+    inicios = np.concatenate([[0], cortes])
+    fins = np.concatenate([cortes, [len(indices)]])
+    return [(int(indices[f0]), int(f0), int(f1)) for f0, f1 in zip(inicios, fins)]
+
+
+def montar_filtergraph(segmentos: list, duracao_total: float,
+                       largura: int, altura: int, fps: int,
+                       zoom: float, vfr: bool = False) -> tuple[list[str], str] | None:
+    """
+    Compila a timeline num filtergraph: cada trecho visível vira
+      [i:v] scale (cover) → crop central → zoompan ancorado em (0, 0)
+    e tudo é unido por concat. Com vfr, o zoompan calcula só 1 a cada
+    _passo_vfr frames e fps + trim devolvem o trecho ao CFR com a duração exata.
+    Retorna (entradas, grafo) com a saída em [v], ou None se a timeline tiver
+    vídeo (não expressável aqui).
+    """
+    if any(seg['tipo'] == 'video' for seg in segmentos):
+        return None
+
+    total_frames = int(np.ceil(duracao_total * fps - 1e-6))
+    indices = _indices_por_frame(segmentos, total_frames, fps)
+
+    entradas = []
+    filtros = []
+    rotulos = []
+    for n, (k, f0, f1) in enumerate(_trechos_visiveis(indices)):
+        frames = f1 - f0
+        rotulo = f'[t{n}]'
+        if k < 0:
+            filtros.append(f'color=c=black:s={largura}x{altura}:r={fps},'
+                           f'trim=end_frame={frames},setsar=1,format=yuv420p{rotulo}')
+        else:
+            seg = segmentos[k]
+            entrada = len(entradas) // 2
+            entradas += ['-i', seg['caminho']]
+            passo = _passo_vfr(seg, largura, altura, fps, zoom) if vfr else 1
+            # +1 frame calculado: o fps precisa do seguinte para segurar o último
+            calculados = -(-frames // passo) + (1 if passo > 1 else 0)
+            # Mesmo progresso do _ZoomKenBurns: relativo ao segmento, não ao trecho
+            duracao = seg['duracao'] or 1.0
+            z = (f"min(max(1+{zoom}*(({f0}+on*{passo})/{fps}-{seg['inicio']:.4f})/{duracao:.4f},1),"
+                 f"{1 + zoom})")
+            cfr = f'fps={fps},trim=end_frame={frames},' if passo > 1 else ''
+            filtros.append(
+                f'[{entrada}:v]scale={largura}:{altura}:force_original_aspect_ratio=increase,'
+                f'crop={largura}:{altura},setsar=1,'
+                f"zoompan=z='{z}':x=0:y=0:d={calculados}:s={largura}x{altura}:fps={fps}/{passo},"
+                f'{cfr}format=yuv420p{rotulo}'
+            )
+        rotulos.append(rotulo)
+
+    filtros.append(f"{''.join(rotulos)}concat=n={len(rotulos)}:v=1:a=0[v]")
+    return entradas, ';\n'.join(filtros)
+
+
+def renderizar_filtergraph(segmentos: list, output_file: str, duracao_total: float,
+                           largura: int, altura: int, fps: int = 30,
+                           zoom: float = 0.04,
+                           audio_path: str | None = None,
+                           musica_path: str | None = None,
+                           volume_musica: float = 0.06,
+                           bitrate: str = '8000k', preset: str = 'medium',
+                           threads: int = 4,
+                           parametros_video: list[str] | None = None,
+                           vfr: bool = False) -> str | None:
+    """
+    Renderiza a timeline inteira num único ffmpeg (scale/crop/zoompan/concat
+    + áudio), sem gerar frames em Python.
+    Retorna output_file, ou None se houver vídeo na timeline ou o ffmpeg falhar.
+    """
+    compilado = montar_filtergraph(segmentos, duracao_total, largura, altura, fps, zoom, vfr)
+    if compilado is None:
+        print("  ↩️ Timeline com vídeo — filtergraph não se aplica")
+        return None
+    entradas, grafo = compilado
+    n_entradas = len(entradas) // 2
+
+    saida_audio = []
+    if audio_path:
+        entradas += ['-i', audio_path]
+        if musica_path:
+            entradas += ['-stream_loop', '-1', '-i', musica_path]
+            # amix divide pelo nº de entradas ativas (2): volume=2 restaura o nível da narração
+            grafo += (f';\n[{n_entradas + 1}:a]volume={volume_musica}[m];'
+                      f'[{n_entradas}:a][m]amix=inputs=2:duration=first:dropout_transition=0,'
+                      f'volume=2[a]')
+            saida_audio = ['-map', '[a]', '-c:a', 'aac', '-b:a', '192k']
+        elif audio_path.endswith('.m4a'):
+            saida_audio = ['-map', f'{n_entradas}:a', '-c:a', 'copy']
+        else:
+            saida_audio = ['-map', f'{n_entradas}:a', '-c:a', 'aac', '-b:a', '192k']
+
+    script = f'{os.path.splitext(output_file)[0]}.filtergraph.txt'
+    with open(script, 'w', encoding='utf-8') as f:
+        f.write(grafo)
+
+    cmd = [
+        ffmpeg_exe(), '-y', '-loglevel', 'error',
+        *entradas,
+        '-filter_complex_script', script,
+        '-map', '[v]', *saida_audio,
+        '-c:v', 'libx264', *(parametros_video or ['-preset', preset, '-b:v', bitrate]),
+        '-pix_fmt', 'yuv420p', '-r', str(fps), '-threads', str(threads),
+        '-t', f'{duracao_total:.3f}', '-movflags', '+faststart',
+        output_file
+    ]
+
+    inicio_render = time.time()
+    try:
+        proc = subprocess.run(cmd, capture_output=True)
+    finally:
+        os.remove(script)
+    if proc.returncode != 0:
+        print(f"  ❌ ffmpeg (filtergraph): {proc.stderr.decode(errors='ignore')[-500:]}")
+        return None
+
+    print(f"  ⚡ {n_entradas} trechos em um único ffmpeg: {time.time() - inicio_render:.1f}s")
+    return output_file
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# TAMANHO ALVO (dois passos a partir de um intermediário)
+# ════════════════════════════════════════════════════════════════════════════
+
+FATOR_SEGUNDO_PASSO = 2.5   # o 2º passo do x264 custa ~2-3x o 1º (que usa análise rápida)
+
+
+def codificar_tamanho_alvo(origem: str, destino: str, duracao_total: float,
+                           bitrate: str, preset: str = 'medium',
+                           tune: str | None = None,
+                           tempo_maximo: float | None = None,
+                           threads: int = 4) -> str | None:
+    """
+    Recodifica o vídeo de `origem` (intermediário de alta qualidade) em dois
+    passos no bitrate calculado para o tamanho alvo; o áudio é copiado.
+
+    Se o 1º passo não terminar em tempo_maximo / (1 + FATOR_SEGUNDO_PASSO)
+    segundos, os dois passos não caberiam no orçamento: cai para um passo só
+    (ABR com teto VBV, preset veryfast).
+    Retorna destino ou None em caso de erro.
+    """
+    kbps = int(str(bitrate).rstrip('k'))
+    video = ['-c:v', 'libx264', '-b:v', f'{kbps}k'] + (['-tune', tune] if tune else [])
+    comum = ['-pix_fmt', 'yuv420p', '-threads', str(threads), '-t', f'{duracao_total:.3f}']
+    log_passos = f'{os.path.splitext(destino)[0]}.2pass'
+    entrada = [ffmpeg_exe(), '-y', '-loglevel', 'error', '-i', origem]
+
+    inicio = time.time()
+    limite_passo1 = tempo_maximo / (1 + FATOR_SEGUNDO_PASSO) if tempo_maximo else None
+    try:
+        try:
+            passo1 = subprocess.run(
+                entrada + video + ['-preset', preset, '-pass', '1', '-passlogfile', log_passos,
+                                   *comum, '-an', '-f', 'null', os.devnull],
+                capture_output=True, timeout=limite_passo1
+            )
+            dois_passos = passo1.returncode == 0
+            if not dois_passos:
+                print(f"  ⚠️ 1º passo falhou: {passo1.stderr.decode(errors='ignore')[-300:]}")
+        except subprocess.TimeoutExpired:
+            print(f"  ⏱️ 1º passo passou de {limite_passo1:.0f}s — codificando em passo único")
+            dois_passos = False
+
+        if dois_passos:
+            cmd = entrada + video + ['-preset', preset, '-pass', '2', '-passlogfile', log_passos]
+        else:
+            cmd = entrada + video + ['-preset', 'veryfast',
+                                     '-maxrate', f'{int(kbps * 1.5)}k', '-bufsize', f'{kbps * 2}k']
+        proc = subprocess.run(
+            cmd + [*comum, '-map', '0:v', '-map', '0:a?', '-c:a', 'copy',
+                   '-movflags', '+faststart', destino],
+            capture_output=True
+        )
+    finally:
+        for sufixo in ('-0.log', '-0.log.mbtree', '-0.log.temp', '-0.log.mbtree.temp'):
+            try:
+                os.remove(log_passos + sufixo)
+            except OSError:
+                pass
+
+    if proc.returncode != 0:
+        print(f"  ❌ ffmpeg (tamanho alvo): {proc.stderr.decode(errors='ignore')[-500:]}")
+        return None
+
+    tamanho_mb = os.path.getsize(destino) / (1024 * 1024)
+    print(f"  🎯 {'Dois passos' if dois_passos else 'Passo único'} a {kbps}k: "
+          f"{tamanho_mb:.1f} MB em {time.time() - inicio:.1f}s")
+    return destino
@@ -0,0 +1,226 @@
+"""
+sessao_curacao.py
+-----------------
+Estado da curadoria de mídias em memória, com journal de eventos em disco.
+
+Antes, cada clique no Telegram (aprovar, buscar outra, enviar mídia) relia e
+regravava o curacao_pendente.json inteiro — com o texto completo de todos os
+segmentos. Aqui o estado fica num objeto em memória e cada clique só acrescenta
+uma linha compacta ao journal (custo O(1), independente do nº de segmentos):
+
+  {"e": "aprovar", "n": 3}
+  {"e": "substituir", "n": 4, "midia": ["assets/x/2.jpg", "foto_local"]}
+  {"e": "enviada", "n": 5, "midia": ["assets/custom_6.mp4", "video_local"], "file_id": "..."}
+  {"e": "baixada", "n": 5}
+
+Arquivos:
+  curacao_pendente.json     → snapshot (gravado no início e na compactação)
+  curacao_pendente.journal  → eventos desde o último snapshot, um JSON por linha
+
+carregar() lê o snapshot e reaplica o journal — é assim que a sessão volta
+depois de um crash ou no /retomar. Ao fim da curadoria (aprovada, cancelada
+ou timeout) o journal é compactado: o snapshot é regravado e o journal some.
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+
+COMPACTAR_APOS = 500        # eventos no journal antes de uma compactação extra
+STATUS_FINAIS = ('aprovado', 'cancelado', 'timeout')
+
+
+def _arquivo_journal(arquivo: str) -> str:
+    return os.path.splitext(arquivo)[0] + '.journal'
+
+
+def assinatura_segmentos(segmentos: list) -> str:
+    """Identifica um roteiro pelos textos dos segmentos (para retomar após crash)."""
+    textos = [seg.get('texto_completo', seg.get('texto', '')) for seg in segmentos]
+    return hashlib.sha1(json.dumps(textos, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def aplicar_evento(dados: dict, evento: dict) -> None:
+    """Aplica um evento do journal ao estado (usado ao vivo e no replay)."""
+    tipo = evento['e']
+    total = len(dados['segmentos'])
+
+    if tipo == 'aprovar':
+        n = evento['n']
+        dados['aprovacoes'][str(n)] = 'aprovado'
+        dados['segmento_atual'] = min(n + 1, total)
+
+    elif tipo == 'substituir':
+        # Outra mídia do banco local: volta a pedir aprovação deste segmento
+        n = evento['n']
+        dados['segmentos'][n]['midia'] = list(evento['midia'])
+        dados['aprovacoes'].pop(str(n), None)
+        dados['segmento_atual'] = n
+
+    elif tipo == 'enviada':
+        # Foto/vídeo do curador: já vale como aprovado. Com file_id, o arquivo
+        # ainda está sendo baixado em segundo plano (baixando=True)
+        n = evento['n']
+        seg = dados['segmentos'][n]
+        if evento.get('file_id'):
+            seg.setdefault('midia_anterior', seg['midia'])
+            seg['file_id'] = evento['file_id']
+            seg['baixando'] = True
+        seg['midia'] = list(evento['midia'])
+        seg['customizado'] = True
+        dados['aprovacoes'][str(n)] = 'aprovado'
+        dados['segmento_atual'] = min(n + 1, total)
+        dados['aguardando_midia'] = False
+
+    elif tipo == 'baixada':
+        seg = dados['segmentos'][evento['n']]
+        seg['baixando'] = False
+        seg.pop('midia_anterior', None)
+
+    elif tipo == 'falha_download':
+        # Volta para a mídia automática; o curador pode reenviar com 📤
+        n = evento['n']
+        seg = dados['segmentos'][n]
+        seg['midia'] = seg.pop('midia_anterior', seg['midia'])
+        seg['baixando'] = False
+        seg['customizado'] = False
+        dados['aprovacoes'].pop(str(n), None)
+
+    elif tipo == 'aguardar_midia':
+        n = evento['n']
+        dados['aguardando_midia'] = True
+        dados['midia_segmento'] = n
+        # Compatibilidade com código antigo que verifica aguardando_foto
+        dados['aguardando_foto'] = True
+        dados['foto_segmento'] = n
+
+    elif tipo == 'envio':
+        dados['ultimo_envio'] = evento['t']
+
+    elif tipo == 'status':
+        dados['status'] = evento['s']
+
+
+class SessaoCuracao:
+    """Curadoria de mídias em andamento: estado em memória + journal."""
+
+    def __init__(self, arquivo: str, dados: dict, eventos: int = 0):
+        self.arquivo = arquivo
+        self.journal = _arquivo_journal(arquivo)
+        self.dados = dados
+        self._eventos = eventos
+        self.ouvintes = []          # funções (evento, dados) chamadas a cada evento registrado
+
+    # ========================================
+    # CRIAÇÃO / REPLAY
+    # ========================================
+
+    @classmethod
+    def iniciar(cls, arquivo: str, segmentos: list) -> 'SessaoCuracao':
+        """Nova sessão: grava o snapshot inicial e começa um journal vazio."""
+        dados = {
+            'timestamp': datetime.now().isoformat(),
+            'segmentos': json.loads(json.dumps(segmentos)),   # cópia: os eventos não mexem na lista original
+            'assinatura': assinatura_segmentos(segmentos),
+            'status': 'aguardando',
+            'segmento_atual': 0,
+            'aprovacoes': {},
+            'aguardando_midia': False,   # Aguardando foto OU vídeo do usuário
+            'ultimo_envio': None
+        }
+        sessao = cls(arquivo, dados)
+        sessao.compactar()
+        return sessao
+
+    @classmethod
+    def carregar(cls, arquivo: str) -> 'SessaoCuracao | None':
+        """Snapshot + replay do journal. None se não há sessão em disco."""
+        try:
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        eventos = 0
+        journal = _arquivo_journal(arquivo)
+        if os.path.exists(journal):
+            with open(journal, 'r', encoding='utf-8') as f:
+                for linha in f:
+                    try:
+                        evento = json.loads(linha)
+                    except ValueError:
+                        break  # última linha truncada por um crash no meio da escrita
+                    aplicar_evento(dados, evento)
+                    eventos += 1
+            if eventos:
+                print(f"📜 Curadoria retomada: {eventos} eventos do journal reaplicados")
+        return cls(arquivo, dados, eventos)
+
+    def pendentes(self) -> list[int]:
+        """Índices dos segmentos ainda sem aprovação."""
+        aprovacoes = self.dados['aprovacoes']
+        return [n for n in range(len(self.dados['segmentos'])) if str(n) not in aprovacoes]
+
+    # ========================================
+    # EVENTOS
+    # ========================================
+
+    def _registrar(self, evento: dict) -> None:
+        aplicar_evento(self.dados, evento)
+        with open(self.journal, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(evento, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._eventos += 1
+        for ouvinte in self.ouvintes:
+            ouvinte(evento, self.dados)
+
+        if self.dados['status'] in STATUS_FINAIS or self._eventos >= COMPACTAR_APOS:
+            self.compactar()
+
+    def aprovar(self, n: int) -> None:
+        self._registrar({'e': 'aprovar', 'n': n})
+
+    def substituir(self, n: int, caminho: str, tipo: str) -> None:
+        self._registrar({'e': 'substituir', 'n': n, 'midia': [caminho, tipo]})
+
+    def midia_enviada(self, n: int, caminho: str, tipo: str, file_id: str | None = None) -> None:
+        evento = {'e': 'enviada', 'n': n, 'midia': [caminho, tipo]}
+        if file_id:
+            evento['file_id'] = file_id
+        self._registrar(evento)
+
+    def midia_baixada(self, n: int) -> None:
+        self._registrar({'e': 'baixada', 'n': n})
+
+    def falha_download(self, n: int) -> None:
+        self._registrar({'e': 'falha_download', 'n': n})
+
+    def aguardar_midia(self, n: int) -> None:
+        self._registrar({'e': 'aguardar_midia', 'n': n})
+
+    def registrar_envio(self) -> None:
+        self._registrar({'e': 'envio', 't': datetime.now().isoformat()})
+
+    def definir_status(self, status: str) -> None:
+        self._registrar({'e': 'status', 's': status})
+
+    # ========================================
+    # SNAPSHOT
+    # ========================================
+
+    def compactar(self) -> None:
+        """Regrava o snapshot com o estado atual e descarta o journal."""
+        tmp = f'{self.arquivo}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.dados, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.arquivo)
+        # Um crash aqui deixa o journal junto de um snapshot que já o contém:
+        # sem problema, todo evento atribui valores absolutos e o replay é idempotente
+        if os.path.exists(self.journal):
+            os.remove(self.journal)
+        self._eventos = 0
+
+    def remover(self) -> None:
+        for caminho in (self.arquivo, self.journal):
+            if os.path.exists(caminho):
+                os.remove(caminho)
@@ -1,28 +1,162 @@
 import os
 import json
+import atexit
+import hashlib
 import requests
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from sessao_curacao import SessaoCuracao, assinatura_segmentos
+
 TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN')
 TELEGRAM_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID')
 CURACAO_FILE = 'curacao_pendente.json'
 CURACAO_TEMAS_FILE = 'curacao_temas_pendente.json'
 ASSETS_DIR = 'assets'
 
+# Long polling: o getUpdates fica aberto no servidor até chegar um clique/mensagem
+LONG_POLLING_TIMEOUT = int(os.environ.get('TELEGRAM_LONG_POLLING', '25'))
+# Estado da curadoria fica em memória; vai ao disco a cada CHECKPOINT_INTERVALO
+# segundos, quando o status muda e na saída do processo
+CHECKPOINT_INTERVALO = 30
+
+# Curadoria de mídias: 'sequencial' (um segmento por vez) ou 'lote' (álbuns com
+# todos os segmentos + uma grade de botões; decisões em qualquer ordem)
+CURACAO_MODO = os.environ.get('CURACAO_MODO', 'sequencial').lower()
+ALBUM_MAX = 10              # limite de mídias por sendMediaGroup
+SEGMENTOS_POR_GRADE = 32    # 3 botões por segmento + "aprovar todos" ≤ 100 botões
+LEGENDA_LOTE = 700          # caracteres do roteiro na legenda de cada item do álbum
+
+# Mídias enviadas pelo curador: baixadas em threads, em blocos direto para o
+# disco; uma tentativa que cai continua de onde parou (Range)
+DOWNLOADS_PARALELOS = 3
+DOWNLOAD_TENTATIVAS = 4
+DOWNLOAD_BLOCO = 1 << 16     # 64 KiB: o máximo perdido quando a conexão cai
+
 class TelegramCuratorNoticias:
     def __init__(self):
         self.bot_token = TELEGRAM_BOT_TOKEN
         self.chat_id = TELEGRAM_CHAT_ID
         self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
+        self.sessao = requests.Session()   # conexão HTTPS reaproveitada entre chamadas
+        self._estados = {}                 # arquivo → dict em memória
+        self._status_em_disco = {}         # arquivo → último status gravado
+        self._sujos = set()
+        self._ultimo_checkpoint = time.time()
+        atexit.register(self._checkpoint, True)
+        self.curacao = None                # SessaoCuracao da curadoria de mídias
+        self._grades = []                  # (message_id, índices) das grades do modo lote
+        self._downloads = {}               # índice do segmento → Future do download
+        self._pool_downloads = None
+        # Chamada na thread de download depois que a mídia chega: (caminho, segmento);
+        # precisa ser segura entre threads (DOWNLOADS_PARALELOS ao mesmo tempo).
+        # O generate_video usa para já deixar o vídeo normalizado para o render
+        self.preparar_midia = None
         self.update_id_offset = self._obter_ultimo_update_id()
     
+    # ========================================
+    # ESTADO EM MEMÓRIA (checkpoints em disco)
+    # ========================================
+    
+    def _ler_estado(self, arquivo):
+        """Estado em memória; o disco só é lido na primeira vez. None se não existe."""
+        if arquivo not in self._estados:
+            try:
+                with open(arquivo, 'r', encoding='utf-8') as f:
+                    self._estados[arquivo] = json.load(f)
+                self._status_em_disco[arquivo] = self._estados[arquivo].get('status')
+            except (OSError, ValueError):
+                return None
+        return self._estados[arquivo]
+    
+    def _tem_estado(self, arquivo):
+        return self._ler_estado(arquivo) is not None
+    
+    def _gravar_estado(self, arquivo, data, imediato=False):
+        """
+        Atualiza o estado em memória. Criação e mudança de status vão ao disco
+        na hora; os demais cliques esperam o próximo checkpoint.
+        """
+        self._estados[arquivo] = data
+        self._sujos.add(arquivo)
+        if imediato or self._status_em_disco.get(arquivo, '<novo>') != data.get('status'):
+            self._checkpoint(forcar=True)
+    
+    def _remover_estado(self, arquivo):
+        self._estados.pop(arquivo, None)
+        self._status_em_disco.pop(arquivo, None)
+        self._sujos.discard(arquivo)
+        if os.path.exists(arquivo):
+            os.remove(arquivo)
+    
+    def _curacao(self):
+        """Curadoria de mídias ativa; se não está em memória, snapshot + replay do journal."""
+        if self.curacao is None:
+            self.curacao = SessaoCuracao.carregar(CURACAO_FILE)
+        return self.curacao
+    
+    def _checkpoint(self, forcar=False):
+        """Grava em disco os estados alterados (no máximo a cada CHECKPOINT_INTERVALO)."""
+        if not self._sujos or (not forcar and time.time() - self._ultimo_checkpoint < CHECKPOINT_INTERVALO):
+            return
+        for arquivo in list(self._sujos):
+            data = self._estados.get(arquivo)
+            if data is None:
+                continue
+            try:
+                tmp = f'{arquivo}.tmp'
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                os.replace(tmp, arquivo)
+                self._status_em_disco[arquivo] = data.get('status')
+            except Exception as e:
+                print(f"⚠️ Checkpoint de {arquivo} falhou: {e}")
+        self._sujos.clear()
+        self._ultimo_checkpoint = time.time()
+    
+    # ========================================
+    # API DO TELEGRAM
+    # ========================================
+    
+    def _receber_atualizacoes(self, espera=0):
+        """
+        getUpdates com long polling: o Telegram segura a requisição até chegar
+        um update ou passarem `espera` segundos, então cada clique é tratado no
+        instante em que chega, sem laço de sondagem.
+        """
+        url = f"{self.base_url}/getUpdates"
+        params = {
+            'offset': self.update_id_offset,
+            'timeout': int(espera),
+            'allowed_updates': json.dumps(['message', 'callback_query'])
+        }
+        
+        try:
+            response = self.sessao.get(url, params=params, timeout=espera + 10)
+            result = response.json()
+        except Exception as e:
+            print(f"⚠️ getUpdates falhou: {e}")
+            time.sleep(1)  # rede fora: não transformar o long polling em laço quente
+            return []
+        
+        if not result.get('ok'):
+            time.sleep(1)
+            return []
+        return result.get('result', [])
+    
+    def _espera_long_polling(self, inicio, timeout):
+        """Segundos do próximo long polling, sem passar do timeout da espera."""
+        espera = max(1, min(LONG_POLLING_TIMEOUT, int(timeout - (time.time() - inicio))))
+        # Com downloads em andamento, volta logo para registrar os que terminarem
+        return min(espera, 2) if self._downloads else espera
+    
     def _obter_ultimo_update_id(self):
         """Obtém o último update_id"""
         try:
             url = f"{self.base_url}/getUpdates"
-            response = requests.get(url, params={'offset': -1}, timeout=5)
+            response = self.sessao.get(url, params={'offset': -1}, timeout=5)
             result = response.json()
             
             if result.get('ok') and result.get('result'):
@@ -44,7 +178,7 @@ class TelegramCuratorNoticias:
             data['reply_markup'] = json.dumps(reply_markup)
         
         try:
-            response = requests.post(url, json=data, timeout=10)
+            response = self.sessao.post(url, json=data, timeout=10)
             result = response.json()
             
             if result.get('ok'):
@@ -72,7 +206,7 @@ class TelegramCuratorNoticias:
                 if reply_markup:
                     data['reply_markup'] = json.dumps(reply_markup)
                 
-                response = requests.post(url, files=files, data=data, timeout=15)
+                response = self.sessao.post(url, files=files, data=data, timeout=15)
                 result = response.json()
                 
                 if result.get('ok'):
@@ -114,8 +248,7 @@ class TelegramCuratorNoticias:
             'substituicoes': {}
         }
         
-        with open(CURACAO_TEMAS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(curacao_data, f, indent=2, ensure_ascii=False)
+        self._gravar_estado(CURACAO_TEMAS_FILE, curacao_data)
         
         mensagem_inicial = (
             f"🎬 CURADORIA DE TEMAS - VÍDEO LONGO\n\n"
@@ -136,7 +269,7 @@ class TelegramCuratorNoticias:
         }
         
         try:
-            response = requests.post(url, json=data, timeout=10)
+            response = self.sessao.post(url, json=data, timeout=10)
             result = response.json()
             
             if result.get('ok'):
@@ -193,8 +326,7 @@ class TelegramCuratorNoticias:
                     'aguardando_confirmacao': True
                 }
                 
-                with open('release_pendente.json', 'w', encoding='utf-8') as f:
-                    json.dump(release_info, f, indent=2)
+                self._gravar_estado('release_pendente.json', release_info)
                 
                 if len(descricao) > 200:
                     self.enviar_mensagem(
@@ -217,7 +349,7 @@ class TelegramCuratorNoticias:
         print(f"\n⏳ Aguardando confirmação de download...")
         print(f"   Timeout: {timeout}s ({timeout//3600}h)")
         
-        if not os.path.exists('release_pendente.json'):
+        if not self._tem_estado('release_pendente.json'):
             print("   ⚠️ Nenhuma release pendente")
             return False
         
@@ -225,8 +357,7 @@ class TelegramCuratorNoticias:
         
         while time.time() - inicio < timeout:
             try:
-                with open('release_pendente.json', 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = self._ler_estado('release_pendente.json')
                 
                 if not data.get('aguardando_confirmacao'):
                     print("   ✅ Download confirmado!")
@@ -235,9 +366,8 @@ class TelegramCuratorNoticias:
             except:
                 pass
             
-            self._processar_atualizacoes()
-            
-            time.sleep(3)
+            self._processar_atualizacoes(espera=self._espera_long_polling(inicio, timeout))
+            self._checkpoint()
         
         print("   ⏰ Timeout - download não confirmado")
         self.enviar_mensagem(
@@ -251,11 +381,10 @@ class TelegramCuratorNoticias:
     
     def _enviar_proximo_tema(self):
         """Envia próximo tema para aprovação"""
-        if not os.path.exists(CURACAO_TEMAS_FILE):
+        if not self._tem_estado(CURACAO_TEMAS_FILE):
             return False
         
-        with open(CURACAO_TEMAS_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = self._ler_estado(CURACAO_TEMAS_FILE)
         
         noticias = data['noticias']
         aprovacoes = data['aprovacoes']
@@ -299,16 +428,14 @@ class TelegramCuratorNoticias:
     
     def _finalizar_curacao_temas(self):
         """Finaliza curadoria de temas"""
-        if not os.path.exists(CURACAO_TEMAS_FILE):
+        if not self._tem_estado(CURACAO_TEMAS_FILE):
             return
         
-        with open(CURACAO_TEMAS_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = self._ler_estado(CURACAO_TEMAS_FILE)
         
         data['status'] = 'aprovado'
         
-        with open(CURACAO_TEMAS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self._gravar_estado(CURACAO_TEMAS_FILE, data)
         
         aprovados = len(data['aprovacoes'])
         substituidos = len(data['substituicoes'])
@@ -337,14 +464,12 @@ class TelegramCuratorNoticias:
             if tempo_decorrido >= timeout:
                 print(f"⏰ Timeout após {tempo_decorrido/60:.1f}min")
                 
-                if os.path.exists(CURACAO_TEMAS_FILE):
-                    with open(CURACAO_TEMAS_FILE, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                if self._tem_estado(CURACAO_TEMAS_FILE):
+                    data = self._ler_estado(CURACAO_TEMAS_FILE)
                     
                     data['status'] = 'timeout'
                     
-                    with open(CURACAO_TEMAS_FILE, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
+                    self._gravar_estado(CURACAO_TEMAS_FILE, data)
                     
                     self.enviar_mensagem(
                         f"⏰ <b>TIMEOUT NA CURADORIA DE TEMAS</b>\n\n"
@@ -354,15 +479,14 @@ class TelegramCuratorNoticias:
                 
                 return None
             
-            if int(tempo_decorrido) % 60 == 0 and tempo_decorrido != ultima_verificacao:
+            if int(tempo_decorrido / 60) > ultima_verificacao:
                 minutos = int(tempo_decorrido / 60)
                 restantes = int((timeout - tempo_decorrido) / 60)
                 print(f"⏱️ {minutos}min | {restantes}min restantes")
-                ultima_verificacao = tempo_decorrido
+                ultima_verificacao = minutos
             
-            if os.path.exists(CURACAO_TEMAS_FILE):
-                with open(CURACAO_TEMAS_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+            if self._tem_estado(CURACAO_TEMAS_FILE):
+                data = self._ler_estado(CURACAO_TEMAS_FILE)
                 
                 if data['status'] == 'aprovado':
                     print("✅ Temas aprovados!")
@@ -379,7 +503,7 @@ class TelegramCuratorNoticias:
                     print(f"✅ {len(noticias_aprovadas)} temas finais")
                     
                     try:
-                        os.remove(CURACAO_TEMAS_FILE)
+                        self._remover_estado(CURACAO_TEMAS_FILE)
                     except:
                         pass
                     
@@ -390,25 +514,13 @@ class TelegramCuratorNoticias:
                     self.enviar_mensagem("🛑 <b>CURADORIA CANCELADA</b>")
                     sys.exit(1)
             
-            self._processar_atualizacoes_temas()
-            time.sleep(3)
+            self._processar_atualizacoes_temas(espera=self._espera_long_polling(inicio, timeout))
+            self._checkpoint()
     
-    def _processar_atualizacoes_temas(self):
-        """Processa updates do Telegram para curadoria de temas"""
-        url = f"{self.base_url}/getUpdates"
-        params = {
-            'offset': self.update_id_offset,
-            'timeout': 1
-        }
-        
+    def _processar_atualizacoes_temas(self, espera=0):
+        """Processa updates do Telegram para curadoria de temas (aguarda até `espera` s)"""
         try:
-            response = requests.get(url, params=params, timeout=5)
-            result = response.json()
-            
-            if not result.get('ok'):
-                return
-            
-            updates = result.get('result', [])
+            updates = self._receber_atualizacoes(espera)
             
             if updates:
                 print(f"📨 {len(updates)} updates recebidos para temas")
@@ -430,11 +542,10 @@ class TelegramCuratorNoticias:
         """Processa mensagens na curadoria de temas"""
         text = message.get('text', '')
         
-        if not os.path.exists(CURACAO_TEMAS_FILE):
+        if not self._tem_estado(CURACAO_TEMAS_FILE):
             return
         
-        with open(CURACAO_TEMAS_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = self._ler_estado(CURACAO_TEMAS_FILE)
         
         print(f"📩 Comando: {text}")
         
@@ -442,8 +553,7 @@ class TelegramCuratorNoticias:
             print("🛑 CANCELAR CURADORIA")
             data['status'] = 'cancelado'
             
-            with open(CURACAO_TEMAS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self._gravar_estado(CURACAO_TEMAS_FILE, data)
             
             self.enviar_mensagem(
                 "🛑 <b>CANCELAMENTO TOTAL</b>\n\n"
@@ -474,8 +584,7 @@ class TelegramCuratorNoticias:
             
             data['status'] = 'aprovado'
             
-            with open(CURACAO_TEMAS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self._gravar_estado(CURACAO_TEMAS_FILE, data)
             
             self.enviar_mensagem("✅ <b>Todos os temas restantes aprovados!</b>")
         
@@ -497,15 +606,13 @@ class TelegramCuratorNoticias:
                         data['substituicoes'][str(indice)] = nova_noticia
                         data['aprovacoes'][str(indice)] = 'substituido'
                         
-                        with open(CURACAO_TEMAS_FILE, 'w', encoding='utf-8') as f:
-                            json.dump(data, f, indent=2, ensure_ascii=False)
+                        self._gravar_estado(CURACAO_TEMAS_FILE, data)
                         
                         self.enviar_mensagem(
                             f"✅ <b>Tema {indice+1} substituído!</b>\n\n"
                             f"🆕 {novo_titulo}"
                         )
                         
-                        time.sleep(1)
                         self._enviar_proximo_tema()
                     else:
                         self.enviar_mensagem(f"❌ Índice {indice+1} inválido")
@@ -528,12 +635,11 @@ class TelegramCuratorNoticias:
         callback_data = callback['data']
         callback_id = callback['id']
         
-        if not os.path.exists(CURACAO_TEMAS_FILE):
+        if not self._tem_estado(CURACAO_TEMAS_FILE):
             self._responder_callback(callback_id, "⚠️ Expirado")
             return
         
-        with open(CURACAO_TEMAS_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = self._ler_estado(CURACAO_TEMAS_FILE)
         
         print(f"🖱️ Botão TEMAS: {callback_data}")
         
@@ -565,12 +671,10 @@ class TelegramCuratorNoticias:
         
         data['aprovacoes'][str(idx)] = 'aprovado'
         
-        with open(CURACAO_TEMAS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self._gravar_estado(CURACAO_TEMAS_FILE, data)
         
         self.enviar_mensagem(f"✅ <b>Tema {num} aprovado!</b>")
         
-        time.sleep(1)
         self._enviar_proximo_tema()
     
     def _solicitar_substituicao_tema(self, data, num):
@@ -596,18 +700,27 @@ class TelegramCuratorNoticias:
         """Inicia curadoria interativa DE MÍDIAS"""
         print("📱 Iniciando curadoria de MÍDIAS...")
         
-        curacao_data = {
-            'timestamp': datetime.now().isoformat(),
-            'segmentos': segmentos_com_midias,
-            'status': 'aguardando',
-            'segmento_atual': 0,
-            'aprovacoes': {},
-            'aguardando_midia': False,   # Aguardando foto OU vídeo do usuário
-            'ultimo_envio': None
-        }
+        # Mesmo roteiro de uma curadoria interrompida (crash): continua de onde parou
+        anterior = SessaoCuracao.carregar(CURACAO_FILE)
+        if (anterior and anterior.dados.get('status') == 'aguardando' and
+                anterior.dados.get('assinatura') == assinatura_segmentos(segmentos_com_midias)):
+            self.curacao = anterior
+            aprovados = len(anterior.dados['aprovacoes'])
+            for idx, seg in enumerate(anterior.dados['segmentos']):
+                if seg.get('baixando') and seg.get('file_id'):
+                    self._agendar_download(idx, seg['file_id'], seg['midia'][0])
+            print(f"🔄 Retomando curadoria interrompida ({aprovados} já aprovados)")
+            self.enviar_mensagem(
+                f"🔄 <b>CURADORIA RETOMADA</b>\n\n"
+                f"✅ {aprovados}/{len(segmentos_com_midias)} segmentos já aprovados"
+            )
+            if CURACAO_MODO == 'lote':
+                self._enviar_lote()
+            else:
+                self._enviar_proximo_segmento()
+            return
         
-        with open(CURACAO_FILE, 'w', encoding='utf-8') as f:
-            json.dump(curacao_data, f, indent=2, ensure_ascii=False)
+        self.curacao = SessaoCuracao.iniciar(CURACAO_FILE, segmentos_com_midias)
         
         self.enviar_mensagem(
             f"🎬 <b>CURADORIA DE MÍDIAS</b>\n\n"
@@ -624,16 +737,20 @@ class TelegramCuratorNoticias:
         )
         
         time.sleep(2)
-        self._enviar_proximo_segmento()
-        print("✅ Primeira mídia enviada para curadoria")
+        if CURACAO_MODO == 'lote':
+            self._enviar_lote()
+            print("✅ Lote de mídias enviado para curadoria")
+        else:
+            self._enviar_proximo_segmento()
+            print("✅ Primeira mídia enviada para curadoria")
     
     def _enviar_proximo_segmento(self):
         """Envia próximo segmento com TEXTO COMPLETO"""
-        if not os.path.exists(CURACAO_FILE):
+        curacao = self._curacao()
+        if curacao is None:
             return False
         
-        with open(CURACAO_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = curacao.dados
         
         segmento_atual = data['segmento_atual']
         segmentos = data['segmentos']
@@ -693,9 +810,7 @@ class TelegramCuratorNoticias:
         resultado = self.enviar_foto(midia_info, caption, keyboard)
         
         if resultado:
-            data['ultimo_envio'] = datetime.now().isoformat()
-            with open(CURACAO_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            curacao.registrar_envio()
             
             # Enviar texto completo como mensagem adicional se foi truncado
             if texto_extra:
@@ -721,18 +836,189 @@ class TelegramCuratorNoticias:
         except:
             return "local"
     
+    # ========================================
+    # CURADORIA EM LOTE (ÁLBUNS + GRADE DE BOTÕES)
+    # ========================================
+    
+    def enviar_album(self, itens):
+        """
+        Envia até ALBUM_MAX mídias LOCAIS num só sendMediaGroup.
+        itens: [(caminho, tipo, legenda)] — tipo com 'video' vai como vídeo.
+        sendMediaGroup exige de 2 a 10 mídias: um item sozinho vai por
+        sendPhoto/sendVideo.
+        """
+        if len(itens) == 1:
+            return self._enviar_midia_avulsa(*itens[0])
+        
+        url = f"{self.base_url}/sendMediaGroup"
+        arquivos = {}
+        media = []
+        
+        try:
+            for i, (caminho, tipo, legenda) in enumerate(itens):
+                nome = f'midia{i}'
+                arquivos[nome] = open(caminho, 'rb')
+                media.append({
+                    'type': 'video' if 'video' in tipo else 'photo',
+                    'media': f'attach://{nome}',
+                    'caption': legenda,
+                    'parse_mode': 'HTML'
+                })
+            
+            data = {'chat_id': self.chat_id, 'media': json.dumps(media)}
+            response = self.sessao.post(url, files=arquivos, data=data, timeout=120)
+            result = response.json()
+            
+            if result.get('ok'):
+                return result
+            else:
+                print(f"⚠️ Erro: {result}")
+                return None
+        except Exception as e:
+            print(f"❌ Erro: {e}")
+            return None
+        finally:
+            for arquivo in arquivos.values():
+                arquivo.close()
+    
+    def _enviar_midia_avulsa(self, caminho, tipo, legenda):
+        """Uma mídia LOCAL com legenda, foto ou vídeo conforme o tipo"""
+        metodo, campo = ('sendVideo', 'video') if 'video' in tipo else ('sendPhoto', 'photo')
+        
+        try:
+            with open(caminho, 'rb') as arquivo:
+                data = {'chat_id': self.chat_id, 'caption': legenda, 'parse_mode': 'HTML'}
+                response = self.sessao.post(f"{self.base_url}/{metodo}",
+                                            files={campo: arquivo}, data=data, timeout=120)
+                result = response.json()
+            
+            if result.get('ok'):
+                return result
+            else:
+                print(f"⚠️ Erro: {result}")
+                return None
+        except Exception as e:
+            print(f"❌ Erro: {e}")
+            return None
+    
+    def _teclado_lote(self, curacao, bloco):
+        """Grade com uma linha por segmento: aprovar / outra do banco / enviar mídia"""
+        aprovacoes = curacao.dados['aprovacoes']
+        linhas = []
+        
+        for idx in bloco:
+            num = idx + 1
+            marca = '☑️' if str(idx) in aprovacoes else '✅'
+            linhas.append([
+                {'text': f'{marca} {num}', 'callback_data': f'aprovar_{num}'},
+                {'text': f'🔄 {num}', 'callback_data': f'buscar_{num}'},
+                {'text': f'📤 {num}', 'callback_data': f'midia_{num}'}
+            ])
+        
+        linhas.append([{'text': '✅ Aprovar todos os restantes', 'callback_data': 'lote_todos'}])
+        return {'inline_keyboard': linhas}
+    
+    def _enviar_lote(self):
+        """Envia os segmentos pendentes em álbuns e uma grade de decisões"""
+        curacao = self._curacao()
+        if curacao is None:
+            return False
+        
+        pendentes = curacao.pendentes()
+        if not pendentes:
+            self._finalizar_curacao()
+            return False
+        
+        segmentos = curacao.dados['segmentos']
+        total = len(segmentos)
+        
+        print(f"📤 Enviando {len(pendentes)} segmentos em álbuns de até {ALBUM_MAX}...")
+        
+        falhas = 0
+        for i in range(0, len(pendentes), ALBUM_MAX):
+            itens = []
+            for idx in pendentes[i:i + ALBUM_MAX]:
+                seg = segmentos[idx]
+                midia_info, midia_tipo = seg['midia']
+                texto_seg = seg.get('texto_completo', seg.get('texto', ''))
+                if len(texto_seg) > LEGENDA_LOTE:
+                    texto_seg = texto_seg[:LEGENDA_LOTE] + "..."
+                legenda = (
+                    f"📌 <b>Segmento {idx + 1}/{total}</b> • {seg.get('duracao', 0):.1f}s\n\n"
+                    f"<i>{texto_seg}</i>"
+                )
+                itens.append((midia_info, midia_tipo, legenda))
+            
+            if not self.enviar_album(itens):
+                # A grade sai mesmo assim: as decisões não dependem das prévias
+                print(f"❌ Falha ao enviar álbum {i // ALBUM_MAX + 1}")
+                falhas += 1
+        
+        if falhas:
+            self.enviar_mensagem(
+                f"⚠️ <b>{falhas} álbum(ns) de prévias não foram enviados</b>\n"
+                f"Use 🔄 para ver outra mídia do segmento ou 📤 para enviar a sua."
+            )
+        
+        self._grades = []
+        for i in range(0, len(pendentes), SEGMENTOS_POR_GRADE):
+            bloco = pendentes[i:i + SEGMENTOS_POR_GRADE]
+            result = self.enviar_mensagem(
+                f"🗳️ <b>Segmentos {bloco[0] + 1}–{bloco[-1] + 1}</b>\n\n"
+                f"✅ aprovar • 🔄 outra do banco • 📤 enviar foto/vídeo\n"
+                f"<i>Decida em qualquer ordem</i>",
+                self._teclado_lote(curacao, bloco)
+            )
+            if result:
+                self._grades.append((result['result']['message_id'], bloco))
+        
+        curacao.registrar_envio()
+        print(f"✅ {len(pendentes)} segmentos enviados em lote")
+        return True
+    
+    def _atualizar_lote(self, curacao, idx):
+        """Depois de uma decisão: finaliza se não sobrou nada, senão atualiza a grade"""
+        if not curacao.pendentes():
+            self._finalizar_curacao()
+            return
+        
+        for message_id, bloco in self._grades:
+            if idx in bloco:
+                try:
+                    self.sessao.post(f"{self.base_url}/editMessageReplyMarkup", json={
+                        'chat_id': self.chat_id,
+                        'message_id': message_id,
+                        'reply_markup': self._teclado_lote(curacao, bloco)
+                    }, timeout=10)
+                except:
+                    pass
+                return
+    
+    def _enviar_candidato_lote(self, curacao, idx):
+        """Mostra a nova mídia de um segmento, com os botões só dele"""
+        num = idx + 1
+        midia_info, _ = curacao.dados['segmentos'][idx]['midia']
+        
+        keyboard = {
+            'inline_keyboard': [[
+                {'text': '✅ Aprovar', 'callback_data': f'aprovar_{num}'},
+                {'text': '🔄 Outra', 'callback_data': f'buscar_{num}'},
+                {'text': '📤 Enviar', 'callback_data': f'midia_{num}'}
+            ]]
+        }
+        
+        self.enviar_foto(midia_info, f"🔄 <b>Segmento {num}</b> — nova opção", keyboard)
+        self._atualizar_lote(curacao, idx)
+    
     def _finalizar_curacao(self):
         """Finaliza curadoria"""
-        if not os.path.exists(CURACAO_FILE):
+        curacao = self._curacao()
+        if curacao is None:
             return
         
-        with open(CURACAO_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        data['status'] = 'aprovado'
+        data = curacao.dados
         
-        with open(CURACAO_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        curacao.definir_status('aprovado')
         
         self.enviar_mensagem(
             f"🎉 <b>CURADORIA DE MÍDIAS CONCLUÍDA!</b>\n\n"
@@ -758,14 +1044,8 @@ class TelegramCuratorNoticias:
             if tempo_decorrido >= timeout:
                 print(f"⏰ Timeout após {tempo_decorrido/60:.1f}min")
                 
-                if os.path.exists(CURACAO_FILE):
-                    with open(CURACAO_FILE, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    data['status'] = 'timeout'
-                    
-                    with open(CURACAO_FILE, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
+                if self._curacao() is not None:
+                    self.curacao.definir_status('timeout')
                     
                     self.enviar_mensagem(
                         f"⏰ <b>TIMEOUT</b>\n\n"
@@ -775,17 +1055,17 @@ class TelegramCuratorNoticias:
                 
                 return None
             
-            if int(tempo_decorrido) % 60 == 0 and tempo_decorrido != ultima_verificacao:
+            if int(tempo_decorrido / 60) > ultima_verificacao:
                 minutos = int(tempo_decorrido / 60)
                 restantes = int((timeout - tempo_decorrido) / 60)
                 print(f"⏱️ {minutos}min | {restantes}min restantes")
-                ultima_verificacao = tempo_decorrido
+                ultima_verificacao = minutos
             
-            if os.path.exists(CURACAO_FILE):
-                with open(CURACAO_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+            if self._curacao() is not None:
+                data = self.curacao.dados
                 
-                if data.get('ultimo_envio'):
+                # No modo lote a grade fica disponível o tempo todo: não há "travado"
+                if CURACAO_MODO != 'lote' and data.get('ultimo_envio'):
                     ultimo_envio = datetime.fromisoformat(data['ultimo_envio'])
                     tempo_sem_resposta = (datetime.now() - ultimo_envio).total_seconds()
                     
@@ -804,6 +1084,9 @@ class TelegramCuratorNoticias:
                         print(f"⚠️ Travamento? {minutos_travado}min")
                 
                 if data['status'] == 'aprovado':
+                    if self._downloads:
+                        print(f"⏳ Aguardando {len(self._downloads)} downloads do curador...")
+                        self._coletar_downloads(esperar=True)
                     print("✅ Mídias aprovadas!")
                     return data['segmentos']
                 
@@ -812,25 +1095,13 @@ class TelegramCuratorNoticias:
                     self.enviar_mensagem("🛑 <b>WORKFLOW CANCELADO</b>")
                     sys.exit(1)
             
-            self._processar_atualizacoes()
-            time.sleep(3)
+            self._processar_atualizacoes(espera=self._espera_long_polling(inicio, timeout))
+            self._checkpoint()
     
-    def _processar_atualizacoes(self):
-        """Processa updates do Telegram"""
-        url = f"{self.base_url}/getUpdates"
-        params = {
-            'offset': self.update_id_offset,
-            'timeout': 1
-        }
-        
+    def _processar_atualizacoes(self, espera=0):
+        """Processa updates do Telegram (aguarda até `espera` s por um update)"""
         try:
-            response = requests.get(url, params=params, timeout=5)
-            result = response.json()
-            
-            if not result.get('ok'):
-                return
-            
-            updates = result.get('result', [])
+            updates = self._receber_atualizacoes(espera)
             
             for update in updates:
                 self.update_id_offset = update['update_id'] + 1
@@ -839,6 +1110,8 @@ class TelegramCuratorNoticias:
                     self._processar_mensagem(update['message'])
                 elif 'callback_query' in update:
                     self._processar_callback(update['callback_query'])
+            
+            self._coletar_downloads()
         except:
             pass
     
@@ -856,14 +1129,12 @@ class TelegramCuratorNoticias:
             self._responder_callback(callback_id, "✅ Download confirmado!")
             
             try:
-                with open('release_pendente.json', 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = self._ler_estado('release_pendente.json')
                 
                 data['aguardando_confirmacao'] = False
                 data['confirmado_em'] = datetime.now().isoformat()
                 
-                with open('release_pendente.json', 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2)
+                self._gravar_estado('release_pendente.json', data, imediato=True)
                 
                 self.enviar_mensagem("✅ <b>Download confirmado!</b>\n\n🗑️ Deletando release do GitHub...")
                 
@@ -873,7 +1144,7 @@ class TelegramCuratorNoticias:
                     self.enviar_mensagem("✅ Release deletada com sucesso!\n\n💾 Espaço liberado no repositório.\n\n🎉 Workflow finalizado!")
                     
                     try:
-                        os.remove('release_pendente.json')
+                        self._remover_estado('release_pendente.json')
                     except:
                         pass
                     
@@ -895,44 +1166,46 @@ class TelegramCuratorNoticias:
             return
         
         if callback_data.startswith('tema_'):
-            if os.path.exists(CURACAO_TEMAS_FILE):
+            if self._tem_estado(CURACAO_TEMAS_FILE):
                 self._processar_callback_temas(callback)
             else:
                 self._responder_callback(callback_id, "⚠️ Curadoria de temas expirada")
             return
         
-        if not os.path.exists(CURACAO_FILE):
+        curacao = self._curacao()
+        if curacao is None:
             self._responder_callback(callback_id, "⚠️ Expirado")
             return
         
-        with open(CURACAO_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
         print(f"🖱️ Botão MÍDIAS: {callback_data}")
         self._responder_callback(callback_id, "✅ Processando...")
         
         if callback_data.startswith('aprovar_'):
             num = int(callback_data.split('_')[1])
-            self._aprovar_segmento(data, num)
+            self._aprovar_segmento(curacao, num)
         
         elif callback_data.startswith('buscar_'):
             num = int(callback_data.split('_')[1])
-            self._buscar_nova_midia(data, num)
+            self._buscar_nova_midia(curacao, num)
         
         elif callback_data.startswith('midia_'):
             # ALTERAÇÃO: botão unificado para foto ou vídeo
             num = int(callback_data.split('_')[1])
-            self._solicitar_midia(data, num)
+            self._solicitar_midia(curacao, num)
+        
+        elif callback_data == 'lote_todos':
+            self._finalizar_curacao()
     
     def _processar_mensagem(self, message):
         """Processa mensagens"""
         text = message.get('text', '')
         
-        if os.path.exists(CURACAO_TEMAS_FILE):
+        if self._tem_estado(CURACAO_TEMAS_FILE):
             self._processar_mensagem_temas(message)
             return
         
-        if not os.path.exists(CURACAO_FILE):
+        curacao = self._curacao()
+        if curacao is None:
             if text == '/start':
                 self.enviar_mensagem(
                     "👋 <b>Curador de Notícias</b>\n\n"
@@ -942,17 +1215,13 @@ class TelegramCuratorNoticias:
                 )
             return
         
-        with open(CURACAO_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = curacao.dados
         
         print(f"📩 Comando/mensagem recebido: {text[:50] if text else '(mídia)'}")
         
         if text == '/cancelar':
             print("🛑 CANCELAR TUDO")
-            data['status'] = 'cancelado'
-            
-            with open(CURACAO_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            curacao.definir_status('cancelado')
             
             self.enviar_mensagem(
                 "🛑 <b>CANCELAMENTO TOTAL</b>\n\n"
@@ -984,29 +1253,28 @@ class TelegramCuratorNoticias:
         elif text == '/pular':
             thumbnail_file = 'thumbnail_pendente.json'
             
-            if os.path.exists(thumbnail_file):
+            if self._tem_estado(thumbnail_file):
                 print("⏭️ Pular thumbnail")
-                with open(thumbnail_file, 'r', encoding='utf-8') as f:
-                    thumb_data = json.load(f)
+                thumb_data = self._ler_estado(thumbnail_file)
                 
                 thumb_data['status'] = 'pulada'
                 
-                with open(thumbnail_file, 'w', encoding='utf-8') as f:
-                    json.dump(thumb_data, f, indent=2, ensure_ascii=False)
+                self._gravar_estado(thumbnail_file, thumb_data)
                 
                 self.enviar_mensagem("⏭️ <b>Usando thumbnail automática</b>")
             
-            elif os.path.exists(CURACAO_FILE):
+            else:
                 print("⏭️ Pular curadoria de mídias")
-                data['status'] = 'aprovado'
-                
-                with open(CURACAO_FILE, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
+                curacao.definir_status('aprovado')
                 
                 self.enviar_mensagem("⏭️ <b>Restantes aprovados!</b>")
         
         elif text == '/retomar':
             print("🔄 Retomar")
+            # Reconstrói a sessão do disco (snapshot + journal), descartando
+            # qualquer estado em memória deixado pela metade por um erro
+            self.curacao = SessaoCuracao.carregar(CURACAO_FILE) or curacao
+            data = self.curacao.dados
             atual = data['segmento_atual']
             total = len(data['segmentos'])
             
@@ -1015,9 +1283,10 @@ class TelegramCuratorNoticias:
                 f"Forçando segmento {atual + 1}/{total}..."
             )
             
-            time.sleep(1)
             
-            if self._enviar_proximo_segmento():
+            reenviado = (self._enviar_lote() if CURACAO_MODO == 'lote'
+                         else self._enviar_proximo_segmento())
+            if reenviado:
                 self.enviar_mensagem("✅ Reenviado!")
             else:
                 self.enviar_mensagem("❌ Todos enviados")
@@ -1026,35 +1295,38 @@ class TelegramCuratorNoticias:
         elif 'photo' in message:
             thumbnail_file = 'thumbnail_pendente.json'
             
-            if os.path.exists(thumbnail_file):
+            if self._tem_estado(thumbnail_file):
                 self._processar_thumbnail(message)
-            elif os.path.exists(CURACAO_FILE) and data.get('aguardando_midia'):
+            elif data.get('aguardando_midia'):
                 self._processar_midia_enviada(message, tipo='foto')
         
         elif 'video' in message or 'document' in message:
             # Vídeo enviado como arquivo ou como document (para não comprimir)
-            if os.path.exists(CURACAO_FILE) and data.get('aguardando_midia'):
+            if data.get('aguardando_midia'):
                 self._processar_midia_enviada(message, tipo='video')
     
     def _processar_midia_enviada(self, message, tipo='foto'):
         """Processa foto ou vídeo enviado pelo usuário"""
-        if not os.path.exists(CURACAO_FILE):
+        curacao = self._curacao()
+        if curacao is None:
             return
         
-        with open(CURACAO_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = curacao.dados
         
         if not data.get('aguardando_midia'):
             self.enviar_mensagem("⚠️ Não estou aguardando mídia. Use o botão 📤")
             return
         
         idx = data['midia_segmento']
-        total = len(data['segmentos'])
         num = idx + 1
         
+        if idx in self._downloads:
+            self.enviar_mensagem(f"⏳ Ainda baixando a mídia anterior do segmento {num}. Aguarde um instante.")
+            return
+        
         print(f"📸 {'Foto' if tipo == 'foto' else 'Vídeo'} recebido para segmento {num}")
         
-        self.enviar_mensagem(f"📥 Baixando sua {'foto' if tipo == 'foto' else 'vídeo'}...")
+        self.enviar_mensagem(f"📥 Baixando sua {'foto' if tipo == 'foto' else 'vídeo'} em segundo plano...")
         
         try:
             if tipo == 'foto':
@@ -1077,46 +1349,12 @@ class TelegramCuratorNoticias:
                 extensao = '.mp4'
                 midia_tipo_final = 'video_local'
             
-            # Obter info do arquivo
-            file_info_url = f"{self.base_url}/getFile?file_id={file_id}"
-            file_response = requests.get(file_info_url, timeout=10)
-            file_data = file_response.json()
-            
-            if not file_data.get('ok'):
-                raise Exception("Erro ao obter info do arquivo")
-            
-            file_path = file_data['result']['file_path']
-            download_url = f"https://api.telegram.org/file/bot{self.bot_token}/{file_path}"
-            
-            # Download do arquivo (timeout maior para vídeos)
-            timeout_download = 60 if tipo == 'foto' else 300
-            midia_response = requests.get(download_url, timeout=timeout_download)
-            
             midia_filename = f'{ASSETS_DIR}/custom_{num}{extensao}'
             
-            with open(midia_filename, 'wb') as f:
-                f.write(midia_response.content)
-            
-            tamanho_mb = os.path.getsize(midia_filename) / (1024 * 1024)
-            print(f"✅ {'Foto' if tipo == 'foto' else 'Vídeo'} salvo: {midia_filename} ({tamanho_mb:.1f} MB)")
-            
-            # Atualizar segmento
+            # Atualizar segmento já; o arquivo chega pelo download em segundo plano
+            curacao.midia_enviada(idx, midia_filename, midia_tipo_final, file_id=file_id)
+            self._agendar_download(idx, file_id, midia_filename)
             seg = data['segmentos'][idx]
-            seg['midia'] = (midia_filename, midia_tipo_final)
-            seg['customizado'] = True
-            
-            data['segmentos'][idx] = seg
-            data['aprovacoes'][str(idx)] = 'aprovado'
-            
-            if idx + 1 < total:
-                data['segmento_atual'] = idx + 1
-            else:
-                data['segmento_atual'] = total
-            
-            data['aguardando_midia'] = False
-            
-            with open(CURACAO_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
             
             if tipo == 'video':
                 duracao_seg = seg.get('duracao', 0)
@@ -1128,44 +1366,158 @@ class TelegramCuratorNoticias:
             else:
                 self.enviar_mensagem(f"✅ <b>Foto aplicada ao segmento {num}!</b>")
             
-            time.sleep(2)
-            self._enviar_proximo_segmento()
+            if CURACAO_MODO == 'lote':
+                self._atualizar_lote(curacao, idx)
+            else:
+                self._enviar_proximo_segmento()
             
         except Exception as e:
             print(f"❌ Erro ao processar mídia: {e}")
             self.enviar_mensagem(f"❌ Erro ao processar: {e}\n\nTente novamente ou use /retomar")
     
+    # ========================================
+    # DOWNLOADS EM SEGUNDO PLANO
+    # ========================================
+    
+    def _baixar_arquivo(self, file_id, destino):
+        """
+        getFile + download em blocos para um .part, sem manter o arquivo
+        em memória; cada nova tentativa continua de onde a anterior parou
+        (Range). True se o arquivo ficou completo em destino.
+        
+        O .part leva o file_id no nome: uma mídia reenviada para o mesmo
+        segmento (mesmo destino) nunca continua os bytes de outro arquivo.
+        """
+        id_arquivo = hashlib.sha1(file_id.encode('utf-8')).hexdigest()[:12]
+        parcial = f'{destino}.{id_arquivo}.part'
+        sessao = requests.Session()   # Session não é thread-safe: uma por download
+        
+        try:
+            for tentativa in range(1, DOWNLOAD_TENTATIVAS + 1):
+                try:
+                    # O link do arquivo expira: um getFile por tentativa
+                    file_data = sessao.get(f"{self.base_url}/getFile",
+                                           params={'file_id': file_id}, timeout=10).json()
+                    if not file_data.get('ok'):
+                        raise Exception(file_data.get('description', 'Erro ao obter info do arquivo'))
+                    
+                    info = file_data['result']
+                    download_url = f"https://api.telegram.org/file/bot{self.bot_token}/{info['file_path']}"
+                    tamanho = info.get('file_size')
+                    
+                    ja_baixado = os.path.getsize(parcial) if os.path.exists(parcial) else 0
+                    if tamanho and ja_baixado > tamanho:
+                        ja_baixado = 0   # .part maior que o arquivo: não é dele, recomeça
+                    if not (tamanho and ja_baixado >= tamanho):
+                        headers = {'Range': f'bytes={ja_baixado}-'} if ja_baixado else {}
+                        with sessao.get(download_url, headers=headers, stream=True,
+                                        timeout=(10, 60)) as resposta:
+                            if ja_baixado and resposta.status_code != 206:
+                                ja_baixado = 0   # servidor ignorou o Range: recomeça do zero
+                            resposta.raise_for_status()
+                            with open(parcial, 'ab' if ja_baixado else 'wb') as f:
+                                for bloco in resposta.iter_content(DOWNLOAD_BLOCO):
+                                    f.write(bloco)
+                    
+                    baixado = os.path.getsize(parcial)
+                    if tamanho and baixado < tamanho:
+                        raise Exception(f"download incompleto ({baixado}/{tamanho} bytes)")
+                    
+                    os.replace(parcial, destino)
+                    return True
+                
+                except Exception as e:
+                    print(f"⚠️ Download de {os.path.basename(destino)} "
+                          f"(tentativa {tentativa}/{DOWNLOAD_TENTATIVAS}): {e}")
+                    if tentativa < DOWNLOAD_TENTATIVAS:
+                        time.sleep(2 ** tentativa)
+            
+            # Sem sucesso: o curador reenvia outra mídia, não retoma esta
+            if os.path.exists(parcial):
+                os.remove(parcial)
+            return False
+        finally:
+            sessao.close()
+    
+    def _download_em_segundo_plano(self, file_id, destino, segmento):
+        """Thread de download: baixa e já prepara a mídia para o render"""
+        inicio = time.time()
+        if not self._baixar_arquivo(file_id, destino):
+            return False
+        
+        tamanho_mb = os.path.getsize(destino) / (1024 * 1024)
+        print(f"✅ Mídia salva: {destino} ({tamanho_mb:.1f} MB em {time.time() - inicio:.1f}s)")
+        
+        if self.preparar_midia:
+            try:
+                self.preparar_midia(destino, segmento)
+            except Exception as e:
+                print(f"⚠️ Preparação de {destino} falhou: {e}")
+        return True
+    
+    def _agendar_download(self, idx, file_id, destino):
+        """Baixa a mídia do segmento idx numa thread; o laço de updates segue livre"""
+        if self._pool_downloads is None:
+            self._pool_downloads = ThreadPoolExecutor(max_workers=DOWNLOADS_PARALELOS)
+        segmento = dict(self.curacao.dados['segmentos'][idx])
+        self._downloads[idx] = self._pool_downloads.submit(
+            self._download_em_segundo_plano, file_id, destino, segmento)
+    
+    def _coletar_downloads(self, esperar=False):
+        """Registra na sessão os downloads que terminaram (sempre na thread principal)"""
+        for idx, futuro in list(self._downloads.items()):
+            if not (esperar or futuro.done()):
+                continue
+            try:
+                ok = futuro.result()
+            except Exception as e:
+                print(f"❌ Erro no download do segmento {idx + 1}: {e}")
+                ok = False
+            del self._downloads[idx]
+            
+            curacao = self._curacao()
+            if curacao is None:
+                continue
+            
+            if ok:
+                curacao.midia_baixada(idx)
+                continue
+            
+            curacao.falha_download(idx)
+            self.enviar_mensagem(
+                f"❌ <b>Falha ao baixar a mídia do segmento {idx + 1}</b>\n\n"
+                f"Voltei para a mídia automática. Reenvie com 📤 se quiser."
+            )
+            if CURACAO_MODO == 'lote' and curacao.dados['status'] == 'aguardando':
+                self._atualizar_lote(curacao, idx)
+    
     # Mantido para compatibilidade retroativa
     def _processar_foto_enviada(self, message):
         """Compatibilidade - chama o novo método unificado"""
         self._processar_midia_enviada(message, tipo='foto')
     
-    def _aprovar_segmento(self, data, num):
+    def _aprovar_segmento(self, curacao, num):
         """Aprova segmento"""
         idx = num - 1
-        total = len(data['segmentos'])
+        total = len(curacao.dados['segmentos'])
         
         print(f"✅ Aprovar {num}/{total}")
         
-        data['aprovacoes'][str(idx)] = 'aprovado'
-        
-        if idx + 1 < total:
-            data['segmento_atual'] = idx + 1
-        else:
-            data['segmento_atual'] = total
+        curacao.aprovar(idx)
         
-        with open(CURACAO_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if CURACAO_MODO == 'lote':
+            # A grade marca o segmento; sem mensagem por clique
+            self._atualizar_lote(curacao, idx)
+            return
         
         self.enviar_mensagem(f"✅ <b>Segmento {num} aprovado!</b>")
         
-        time.sleep(2)
         self._enviar_proximo_segmento()
     
-    def _buscar_nova_midia(self, data, num):
+    def _buscar_nova_midia(self, curacao, num):
         """Busca outra imagem da mesma pasta"""
         idx = num - 1
-        seg = data['segmentos'][idx]
+        seg = curacao.dados['segmentos'][idx]
         
         print(f"🔄 Buscar nova para {num}")
         
@@ -1187,17 +1539,14 @@ class TelegramCuratorNoticias:
                 nova_foto = random.choice(arquivos)
                 novo_caminho = os.path.join(pasta, nova_foto)
                 
-                seg['midia'] = (novo_caminho, 'foto_local')
-                data['segmentos'][idx] = seg
-                data['segmento_atual'] = idx
-                
-                with open(CURACAO_FILE, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
+                curacao.substituir(idx, novo_caminho, 'foto_local')
                 
                 print(f"✅ Nova imagem encontrada")
                 
-                time.sleep(2)
-                self._enviar_proximo_segmento()
+                if CURACAO_MODO == 'lote':
+                    self._enviar_candidato_lote(curacao, idx)
+                else:
+                    self._enviar_proximo_segmento()
             else:
                 self.enviar_mensagem("⚠️ Sem mais imagens nesta pasta. Use 📤 para enviar foto ou vídeo!")
         
@@ -1205,23 +1554,16 @@ class TelegramCuratorNoticias:
             print(f"❌ Erro: {e}")
             self.enviar_mensagem(f"❌ Erro. Use 📤 Enviar foto/vídeo!")
     
-    def _solicitar_midia(self, data, num):
+    def _solicitar_midia(self, curacao, num):
         """Solicita foto ou vídeo do usuário"""
         idx = num - 1
         
         print(f"📤 Solicitar mídia para segmento {num}")
         
-        duracao_seg = data['segmentos'][idx].get('duracao', 0)
+        duracao_seg = curacao.dados['segmentos'][idx].get('duracao', 0)
         
         # ALTERAÇÃO: flag renomeada de aguardando_foto para aguardando_midia
-        data['aguardando_midia'] = True
-        data['midia_segmento'] = idx
-        # Manter compatibilidade com código antigo que verifica aguardando_foto
-        data['aguardando_foto'] = True
-        data['foto_segmento'] = idx
-        
-        with open(CURACAO_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        curacao.aguardar_midia(idx)
         
         self.enviar_mensagem(
             f"📤 <b>Envie sua mídia agora</b>\n\n"
@@ -1233,16 +1575,16 @@ class TelegramCuratorNoticias:
         )
     
     # Mantido para compatibilidade retroativa
-    def _solicitar_foto(self, data, num):
+    def _solicitar_foto(self, curacao, num):
         """Compatibilidade - chama o novo método unificado"""
-        self._solicitar_midia(data, num)
+        self._solicitar_midia(curacao, num)
     
     def _responder_callback(self, callback_id, texto):
         """Responde callback"""
         url = f"{self.base_url}/answerCallbackQuery"
         
         try:
-            requests.post(url, json={
+            self.sessao.post(url, json={
                 'callback_query_id': callback_id,
                 'text': texto,
                 'show_alert': False
@@ -1267,8 +1609,7 @@ class TelegramCuratorNoticias:
             'timestamp': datetime.now().isoformat()
         }
         
-        with open(thumbnail_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self._gravar_estado(thumbnail_file, data)
         
         self.enviar_mensagem(
             f"🖼️ <b>THUMBNAIL CUSTOMIZADA</b>\n\n"
@@ -1299,16 +1640,15 @@ class TelegramCuratorNoticias:
                 )
                 ultimo_aviso = int(tempo_decorrido) // 300
             
-            if os.path.exists(thumbnail_file):
-                with open(thumbnail_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+            if self._tem_estado(thumbnail_file):
+                data = self._ler_estado(thumbnail_file)
                 
                 if data['status'] == 'recebida':
                     print("✅ Thumbnail recebida!")
                     thumbnail_path = data['thumbnail_path']
                     
                     try:
-                        os.remove(thumbnail_file)
+                        self._remover_estado(thumbnail_file)
                     except:
                         pass
                     
@@ -1318,20 +1658,20 @@ class TelegramCuratorNoticias:
                     print("⏭️ Thumbnail pulada pelo usuário")
                     
                     try:
-                        os.remove(thumbnail_file)
+                        self._remover_estado(thumbnail_file)
                     except:
                         pass
                     
                     return None
             
-            self._processar_atualizacoes()
-            time.sleep(3)
+            self._processar_atualizacoes(espera=self._espera_long_polling(inicio, timeout))
+            self._checkpoint()
         
         print("⏰ Timeout ao aguardar thumbnail")
         self.enviar_mensagem("⏰ <b>Tempo esgotado</b>\n\nUsando thumbnail automática do YouTube")
         
         try:
-            os.remove(thumbnail_file)
+            self._remover_estado(thumbnail_file)
         except:
             pass
         
@@ -1341,7 +1681,7 @@ class TelegramCuratorNoticias:
         """Processa thumbnail enviada"""
         thumbnail_file = 'thumbnail_pendente.json'
         
-        if not os.path.exists(thumbnail_file):
+        if not self._tem_estado(thumbnail_file):
             return
         
         print("📸 Thumbnail recebida")
@@ -1353,7 +1693,7 @@ class TelegramCuratorNoticias:
             file_id = photo['file_id']
             
             file_info_url = f"{self.base_url}/getFile?file_id={file_id}"
-            file_response = requests.get(file_info_url, timeout=10)
+            file_response = self.sessao.get(file_info_url, timeout=10)
             file_data = file_response.json()
             
             if not file_data.get('ok'):
@@ -1362,7 +1702,7 @@ class TelegramCuratorNoticias:
             file_path = file_data['result']['file_path']
             download_url = f"https://api.telegram.org/file/bot{self.bot_token}/{file_path}"
             
-            foto_response = requests.get(download_url, timeout=15)
+            foto_response = self.sessao.get(download_url, timeout=15)
             thumbnail_path = f'{ASSETS_DIR}/thumbnail_custom.jpg'
             
             with open(thumbnail_path, 'wb') as f:
@@ -1370,14 +1710,12 @@ class TelegramCuratorNoticias:
             
             print(f"✅ Thumbnail salva: {thumbnail_path}")
             
-            with open(thumbnail_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = self._ler_estado(thumbnail_file)
             
             data['status'] = 'recebida'
             data['thumbnail_path'] = thumbnail_path
             
-            with open(thumbnail_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self._gravar_estado(thumbnail_file, data)
             
             self.enviar_mensagem("✅ <b>Thumbnail recebida!</b>\n\nContinuando...")
             
@@ -1419,7 +1757,7 @@ class TelegramCuratorNoticias:
                 print(f"  📹 Enviando vídeo: {os.path.basename(video_path)}")
                 print(f"  📦 Tamanho: {os.path.getsize(video_path) / (1024*1024):.1f} MB")
                 
-                response = requests.post(url, files=files, data=data, timeout=300)
+                response = self.sessao.post(url, files=files, data=data, timeout=300)
                 result = response.json()
                 
                 if result.get('ok'):
@@ -1466,7 +1804,7 @@ class TelegramCuratorNoticias:
                 }
                 
                 print("  📎 Enviando como documento...")
-                response = requests.post(url, files=files, data=data, timeout=300)
+                response = self.sessao.post(url, files=files, data=data, timeout=300)
                 result = response.json()
                 
                 if result.get('ok'):